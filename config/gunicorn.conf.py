@@ -0,0 +1,51 @@
+"""
+Gunicorn settings shared by the production images
+
+Command-line flags (bind, workers, timeout) still take precedence.
+GUNICORN_PRELOAD=True (opt-in) imports and warms the app once in the master
+and forks workers from it, sharing memory copy-on-write (see core/prefork.py);
+``python manage.py bench_worker_memory`` compares per-worker RSS/PSS.
+"""
+import os
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "False").lower() in ("1", "true", "yes")
+
+
+def on_starting(server):
+    # Samples left over from a previous master would be aggregated again
+    directory = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name.endswith(".db"):
+                os.remove(os.path.join(directory, name))
+
+
+def when_ready(server):
+    # Runs in the master after the app is loaded and before the first fork
+    if server.cfg.preload_app:
+        from core import prefork
+
+        prefork.warm()
+        prefork.freeze()
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        from core import prefork
+
+        prefork.after_fork()
+    # The warm-up thread must not exist in the master at fork time, so the
+    # first worker loads the model; later workers and respawns find it resident
+    if worker.age == 1:
+        from interviews.services.ollama_residency import warm_on_start
+
+        warm_on_start()
+
+
+def child_exit(server, worker):
+    # Drop a dead worker's live gauges (in-flight counts) from /metrics
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -38,6 +38,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.timing.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -45,6 +46,7 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django_otp.middleware.OTPMiddleware',
+    'core.profiling.ProfilerMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -53,7 +55,7 @@ ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.timing.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'core' / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -73,10 +75,24 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Prefer DATABASE_URL (12-factor) otherwise fall back to local sqlite
 import dj_database_url
 DATABASE_URL = os.getenv('DATABASE_URL')
+# Optional psycopg 3 connection pool (Django 5.1+). Pooling and persistent
+# connections are mutually exclusive, so CONN_MAX_AGE drops to 0 when enabled.
+DB_POOL = os.getenv('DB_POOL', 'False').lower() in ('1', 'true', 'yes')
 if DATABASE_URL:
     DATABASES = {
-        'default': dj_database_url.parse(DATABASE_URL, conn_max_age=600)
+        'default': dj_database_url.parse(
+            DATABASE_URL,
+            conn_max_age=0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', '600')),
+            conn_health_checks=True,
+        )
     }
+    if DB_POOL and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+            'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+        }
 else:
     DATABASES = {
         'default': {
@@ -85,6 +101,28 @@ else:
         }
     }
 
+# Opt-in SQLite profile for several gunicorn workers sharing db.sqlite3.
+# WAL lets readers run alongside a writer, IMMEDIATE transactions take the
+# write lock up front (no failing read->write upgrade) and busy_timeout makes
+# writers queue for the lock instead of raising "database is locked".
+SQLITE_TUNED = os.getenv('SQLITE_TUNED', 'False').lower() in ('1', 'true', 'yes')
+SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', '20'))  # seconds
+SQLITE_TUNED_OPTIONS = {
+    'timeout': SQLITE_BUSY_TIMEOUT,
+    'transaction_mode': 'IMMEDIATE',
+    'init_command': ';'.join([
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT * 1000}',
+        f"PRAGMA mmap_size={int(os.getenv('SQLITE_MMAP_SIZE', str(128 * 1024 * 1024)))}",
+        # Negative cache_size is in KiB (-20000 ~= 20 MB per connection)
+        f"PRAGMA cache_size={int(os.getenv('SQLITE_CACHE_SIZE', '-20000'))}",
+        'PRAGMA temp_store=MEMORY',
+    ]),
+}
+if SQLITE_TUNED and DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default']['OPTIONS'] = dict(SQLITE_TUNED_OPTIONS)
+
 # Password Validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -122,8 +160,14 @@ SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
 X_FRAME_OPTIONS = 'DENY'
 
+# Storage backends (STORAGES replaced DEFAULT_FILE_STORAGE/STATICFILES_STORAGE in Django 5.1)
 # Use WhiteNoise compressed manifest storage for static files in production
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage' if not DEBUG else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage' if not DEBUG else 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
 
 # Require a secure SECRET_KEY in production
 if not DEBUG and (not SECRET_KEY or SECRET_KEY.startswith('django-insecure')):
@@ -139,7 +183,7 @@ if USE_AZURE_STORAGE:
     AZURE_CONTAINER = os.getenv('AZURE_CONTAINER', 'media')
     AZURE_CUSTOM_DOMAIN = os.getenv('AZURE_CUSTOM_DOMAIN', f"{AZURE_ACCOUNT_NAME}.blob.core.windows.net") if os.getenv('AZURE_ACCOUNT_NAME') else ''
 
-    DEFAULT_FILE_STORAGE = 'storages.backends.azure_storage.AzureStorage'
+    STORAGES['default'] = {'BACKEND': 'storages.backends.azure_storage.AzureStorage'}
     MEDIA_URL = f"https://{AZURE_CUSTOM_DOMAIN}/{AZURE_CONTAINER}/" if AZURE_CUSTOM_DOMAIN else f"/{AZURE_CONTAINER}/"
     # MEDIA_ROOT not used with Azure backend
 else:
@@ -163,6 +207,54 @@ OLLAMA_MODEL = os.getenv('OLLAMA_MODEL', 'mistral')
 AI_PROVIDER = os.getenv('AI_PROVIDER', 'ollama')
 AI_MODEL = os.getenv('AI_MODEL', OLLAMA_MODEL)
 
+# Prometheus /metrics; multi-worker aggregation is enabled by PROMETHEUS_MULTIPROC_DIR
+# Without DEBUG, /metrics needs the bearer token or a staff session unless METRICS_PUBLIC is set
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_PUBLIC = os.getenv('METRICS_PUBLIC', 'False').lower() in ('1', 'true', 'yes')
+
+# Per-request timing breakdown (core.timing)
+# Server-Timing header for every client (staff always get it); internal detail, so off in production
+SERVER_TIMING_HEADER = os.getenv('SERVER_TIMING_HEADER', str(DEBUG)).lower() in ('1', 'true', 'yes')
+SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS', '2000'))
+
+# Early resume uploads (interviews.services.resume_uploads)
+RESUME_UPLOAD_BACKGROUND = os.getenv('RESUME_UPLOAD_BACKGROUND', 'True').lower() in ('1', 'true', 'yes')
+RESUME_UPLOAD_WORKERS = int(os.getenv('RESUME_UPLOAD_WORKERS', '2'))
+RESUME_UPLOAD_WAIT = float(os.getenv('RESUME_UPLOAD_WAIT', '20'))  # seconds setup waits for processing
+RESUME_UPLOAD_MAX_BYTES = int(os.getenv('RESUME_UPLOAD_MAX_BYTES', str(10 * 1024 * 1024)))
+# Uploads are hashed while Django receives them, so blob storage does not re-read them
+FILE_UPLOAD_HANDLERS = [
+    'interviews.services.resume_blobs.HashingMemoryFileUploadHandler',
+    'interviews.services.resume_blobs.HashingTemporaryFileUploadHandler',
+]
+
+# Preferred text extraction backends, e.g. "python-docx,pypdf2" (default: first registered per format)
+RESUME_EXTRACTORS = [name.strip() for name in os.getenv('RESUME_EXTRACTORS', '').split(',') if name.strip()]
+
+# Answer scoring: instant local score; the LLM refines it in the background (async),
+# is awaited (sync) or is not used (local)
+EVALUATION_MODE = os.getenv('EVALUATION_MODE', 'async').lower()
+EVALUATION_WORKERS = int(os.getenv('EVALUATION_WORKERS', '4'))  # 0 = refine inline
+EVALUATION_MAX_PENDING = int(os.getenv('EVALUATION_MAX_PENDING', '16'))  # beyond this, keep the local score
+# LLM evaluations reused for near-identical answers to the same question and role
+EVALUATION_CACHE_THRESHOLD = float(os.getenv('EVALUATION_CACHE_THRESHOLD', '0.9'))  # cosine similarity
+EVALUATION_CACHE_TTL = int(os.getenv('EVALUATION_CACHE_TTL', str(6 * 60 * 60)))  # seconds
+EVALUATION_CACHE_MAX_ENTRIES = int(os.getenv('EVALUATION_CACHE_MAX_ENTRIES', '4096'))  # 0 disables
+
+# Near-duplicate generated questions (within a set and against the user's recent
+# sessions) are replaced from the default pool; see interviews/services/question_dedup.py
+QUESTION_DEDUP_THRESHOLD = float(os.getenv('QUESTION_DEDUP_THRESHOLD', '0.5'))  # 0 disables
+QUESTION_DEDUP_HISTORY = int(os.getenv('QUESTION_DEDUP_HISTORY', '5'))  # recent sessions checked
+
+# Local read-through cache of resume files fetched from media storage, keyed by content hash
+RESUME_CACHE_DIR = os.getenv('RESUME_CACHE_DIR', str(BASE_DIR / 'cache' / 'resumes'))
+RESUME_CACHE_MAX_BYTES = int(os.getenv('RESUME_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))  # 0 disables
+
+# Staff-only on-demand profiler (?_profile=cprofile|sample, core.profiling); writes files, so off in production
+PROFILER_ENABLED = os.getenv('PROFILER_ENABLED', str(DEBUG)).lower() in ('1', 'true', 'yes')
+PROFILE_DIR = os.getenv('PROFILE_DIR', str(BASE_DIR / 'profiles'))
+PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.005'))  # seconds
+
 # Logging Configuration
 LOGGING = {
     'version': 1,
@@ -211,6 +303,11 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'core': {
+            'handlers': ['console', 'file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
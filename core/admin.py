@@ -1,3 +1,53 @@
+import os
+
 from django.contrib import admin
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from .models import RequestProfile
+from .profiling import collapsed_summary, pstats_summary
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'method', 'path', 'view_name', 'mode', 'duration_ms', 'status_code', 'user', 'download')
+    list_filter = ('mode', 'view_name', 'created_at')
+    search_fields = ('path', 'view_name', 'user__username')
+    readonly_fields = ('user', 'method', 'path', 'view_name', 'mode', 'status_code', 'duration_ms',
+                       'filename', 'created_at', 'download', 'summary')
+    date_hierarchy = 'created_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def delete_queryset(self, request, queryset):
+        # The bulk action deletes in SQL; go through RequestProfile.delete so the files go too
+        for profile in queryset:
+            profile.delete()
+
+    def get_urls(self):
+        return [
+            path('<int:pk>/download/', self.admin_site.admin_view(self.download_view),
+                 name='core_requestprofile_download'),
+        ] + super().get_urls()
+
+    def download_view(self, request, pk):
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        if not os.path.exists(profile.file_path):
+            raise Http404("Profile file no longer exists")
+        return FileResponse(open(profile.file_path, 'rb'), as_attachment=True, filename=profile.filename)
+
+    def download(self, obj):
+        return format_html('<a href="{}">{}</a>', reverse('admin:core_requestprofile_download', args=[obj.pk]), obj.filename)
+
+    download.short_description = 'File'
+
+    def summary(self, obj):
+        if not os.path.exists(obj.file_path):
+            return 'Profile file no longer exists'
+        text = pstats_summary(obj.file_path) if obj.mode == 'cprofile' else collapsed_summary(obj.file_path)
+        return format_html('<pre style="max-height:40em;overflow:auto">{}</pre>', text)
 
-# Register your models here.
+    summary.short_description = 'Hotspots'
@@ -0,0 +1,35 @@
+"""
+Database connection pool helpers
+"""
+from typing import Any, Dict
+
+from django.db import connections
+
+
+def pool_stats(alias: str = 'default') -> Dict[str, Any]:
+    """Return saturation figures for the psycopg pool behind ``alias``.
+
+    Only the PostgreSQL backend exposes a ``pool`` attribute, and it is None
+    unless ``OPTIONS['pool']`` is configured (see ``DB_POOL`` in settings).
+
+    Returns:
+        Dict with ``enabled`` plus, when pooling is active, the raw psycopg
+        counters and a derived ``saturation`` ratio (0.0 - 1.0).
+    """
+    pool = getattr(connections[alias], 'pool', None)
+    if pool is None:
+        return {'alias': alias, 'enabled': False}
+
+    stats = pool.get_stats()
+    size = stats.get('pool_size', 0)
+    available = stats.get('pool_available', 0)
+    max_size = stats.get('pool_max', 0) or 1
+    in_use = max(size - available, 0)
+    return {
+        'alias': alias,
+        'enabled': True,
+        'in_use': in_use,
+        'saturation': round(in_use / max_size, 3),
+        'requests_waiting': stats.get('requests_waiting', 0),
+        **stats,
+    }
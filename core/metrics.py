@@ -0,0 +1,226 @@
+"""
+Prometheus metrics for the LLM and request hot paths
+
+Counters and histograms for LLM calls (latency, tokens, errors, in-flight),
+fallbacks to default questions/scores, JSON parse outcomes, resume extraction
+and the interview views. Served at ``/metrics``.
+
+With several gunicorn workers set ``PROMETHEUS_MULTIPROC_DIR`` to a writable
+directory (cleared on boot by ``config/gunicorn.conf.py``); every worker then
+writes its samples there and ``/metrics`` aggregates all of them.
+"""
+import functools
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 90, 120)
+REQUEST_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+LLM_LATENCY = Histogram(
+    "careerflow_llm_request_seconds",
+    "LLM call latency by provider, task and outcome",
+    ["provider", "task", "outcome"],
+    buckets=LLM_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "careerflow_llm_tokens",
+    "LLM tokens consumed",
+    ["provider", "task", "direction"],
+)
+LLM_PROMPT_EVAL = Histogram(
+    "careerflow_llm_prompt_eval_seconds",
+    "Prompt processing time reported by the provider (Ollama)",
+    ["provider", "task"],
+    buckets=REQUEST_BUCKETS,
+)
+LLM_ERRORS = Counter(
+    "careerflow_llm_errors",
+    "LLM calls that raised, by exception type",
+    ["provider", "task", "error"],
+)
+LLM_IN_FLIGHT = Gauge(
+    "careerflow_llm_in_flight",
+    "LLM calls currently waiting on a provider (queue depth)",
+    ["provider"],
+    multiprocess_mode="livesum",
+)
+AI_FALLBACKS = Counter(
+    "careerflow_ai_fallbacks",
+    "Responses served from a fallback instead of the LLM",
+    ["kind"],
+)
+OLLAMA_WARMUPS = Counter(
+    "careerflow_ollama_warmups",
+    "Ollama model loads triggered by the residency manager",
+    ["reason"],
+)
+JSON_PARSE = Counter(
+    "careerflow_llm_json_parse",
+    "JSON parse outcomes of LLM responses",
+    ["task", "outcome"],
+)
+RESUME_EXTRACTION = Histogram(
+    "careerflow_resume_extraction_seconds",
+    "Resume text extraction time by file format",
+    ["format"],
+    buckets=REQUEST_BUCKETS,
+)
+RESUME_CACHE = Counter(
+    "careerflow_resume_cache",
+    "Local resume cache lookups (hit, miss, bypass)",
+    ["result"],
+)
+EVALUATION_CACHE = Counter(
+    "careerflow_evaluation_cache",
+    "Semantic answer-evaluation cache lookups (hit, miss)",
+    ["result"],
+)
+QUESTION_DEDUP = Counter(
+    "careerflow_question_dedup",
+    "Generated questions by near-duplicate check result (unique, replaced, kept)",
+    ["result"],
+)
+VIEW_LATENCY = Histogram(
+    "careerflow_view_seconds",
+    "Interview view latency",
+    ["view", "method", "status"],
+    buckets=REQUEST_BUCKETS,
+)
+VIEW_IN_FLIGHT = Gauge(
+    "careerflow_view_in_flight",
+    "Interview view requests in progress",
+    ["view"],
+    multiprocess_mode="livesum",
+)
+
+
+def record_fallback(kind: str) -> None:
+    AI_FALLBACKS.labels(kind=kind).inc()
+
+
+def record_tokens(provider: str, task: str, usage: Optional[Dict[str, Any]]) -> None:
+    for direction, key in (("input", "input_tokens"), ("output", "output_tokens")):
+        value = (usage or {}).get(key)
+        if value:
+            LLM_TOKENS.labels(provider=provider, task=task, direction=direction).inc(value)
+
+
+def record_prompt_eval(provider: str, task: str, usage: Optional[Dict[str, Any]]) -> None:
+    seconds = (usage or {}).get("prompt_eval_seconds")
+    if seconds is not None:
+        LLM_PROMPT_EVAL.labels(provider=provider, task=task).observe(seconds)
+
+
+@contextmanager
+def track_llm_call(provider: str, task: str) -> Iterator[None]:
+    """Time an LLM call and count errors; in-flight gauge doubles as queue depth."""
+    in_flight = LLM_IN_FLIGHT.labels(provider=provider)
+    in_flight.inc()
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except Exception as exc:
+        outcome = "error"
+        LLM_ERRORS.labels(provider=provider, task=task, error=type(exc).__name__).inc()
+        raise
+    finally:
+        in_flight.dec()
+        LLM_LATENCY.labels(provider=provider, task=task, outcome=outcome).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def track_resume_extraction(file_format: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        RESUME_EXTRACTION.labels(format=file_format or "unknown").observe(time.perf_counter() - started)
+
+
+def track_view(view_func):
+    """Decorator recording latency and in-flight count for a view."""
+    name = view_func.__name__
+
+    @functools.wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        in_flight = VIEW_IN_FLIGHT.labels(view=name)
+        in_flight.inc()
+        started = time.perf_counter()
+        status = "500"
+        try:
+            response = view_func(request, *args, **kwargs)
+            status = str(response.status_code)
+            return response
+        finally:
+            in_flight.dec()
+            VIEW_LATENCY.labels(view=name, method=request.method, status=status).observe(
+                time.perf_counter() - started
+            )
+
+    return wrapper
+
+
+class DBPoolCollector:
+    """Scrape-time gauges for the serving worker's database connection pool."""
+
+    def collect(self):
+        from django.conf import settings
+        from core.db import pool_stats
+
+        in_use = GaugeMetricFamily("careerflow_db_pool_in_use", "Pooled DB connections checked out", labels=["alias"])
+        saturation = GaugeMetricFamily("careerflow_db_pool_saturation", "In-use / max pool size", labels=["alias"])
+        waiting = GaugeMetricFamily("careerflow_db_pool_waiting", "Requests waiting for a connection", labels=["alias"])
+        for alias in settings.DATABASES:
+            stats = pool_stats(alias)
+            if not stats.get("enabled"):
+                continue
+            in_use.add_metric([alias], stats["in_use"])
+            saturation.add_metric([alias], stats["saturation"])
+            waiting.add_metric([alias], stats["requests_waiting"])
+        yield from (in_use, saturation, waiting)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+
+_db_pool_collector = DBPoolCollector()
+if not multiprocess_enabled():
+    REGISTRY.register(_db_pool_collector)
+
+
+def render_latest() -> bytes:
+    """Exposition text, aggregated across workers when running multi-process."""
+    if not multiprocess_enabled():
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(_db_pool_collector)
+    return generate_latest(registry)
+
+
+__all__ = [
+    "CONTENT_TYPE_LATEST",
+    "record_fallback",
+    "record_prompt_eval",
+    "record_tokens",
+    "render_latest",
+    "track_llm_call",
+    "track_resume_extraction",
+    "track_view",
+]
@@ -1,3 +1,38 @@
+import os
+
+from django.conf import settings
+from django.contrib.auth.models import User
 from django.db import models
 
-# Create your models here.
+
+class RequestProfile(models.Model):
+    """A profiled request captured by core.profiling.ProfilerMiddleware"""
+    MODE_CHOICES = [
+        ('cprofile', 'cProfile (pstats)'),
+        ('sample', 'Stack sampler (collapsed)'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=255)
+    view_name = models.CharField(max_length=255, blank=True)
+    mode = models.CharField(max_length=20, choices=MODE_CHOICES)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    filename = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.mode}, {self.duration_ms:.0f} ms)"
+
+    @property
+    def file_path(self) -> str:
+        return os.path.join(settings.PROFILE_DIR, self.filename)
+
+    def delete(self, *args, **kwargs):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+        return super().delete(*args, **kwargs)
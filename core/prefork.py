@@ -0,0 +1,78 @@
+"""
+Copy-on-write friendly gunicorn preloading
+
+With ``preload_app`` the master imports Django and the app once; ``warm()``
+then imports the heavy modules a worker would otherwise load on its first
+request (the configured LangChain backend, PyPDF2 and the NumPy-based
+scorer and question dedup; DOCX text is read with the stdlib) and compiles
+the main templates, and ``freeze()`` moves everything into the GC's
+permanent generation. Forked workers share those pages with the master
+instead of each holding a private copy; without the freeze, the cyclic GC
+touching object headers would dirty (and so copy) them.
+
+Nothing that owns a socket or thread may be created before the fork:
+``warm()`` builds no clients and closes any DB connection it opened, and
+``after_fork()`` drops whatever a worker might have inherited anyway.
+"""
+import gc
+import logging
+
+logger = logging.getLogger(__name__)
+
+WARM_TEMPLATES = (
+    'base.html',
+    'core/dashboard.html',
+    'core/summary.html',
+    'interviews/setup.html',
+    'interviews/room.html',
+    'interviews/feedback.html',
+    'accounts/login.html',
+)
+
+
+def warm() -> None:
+    """Import lazily loaded heavy modules in the master, without opening clients."""
+    from django.db import connections
+    from django.template import TemplateDoesNotExist
+    from django.template.loader import get_template
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+
+    import PyPDF2  # noqa: F401
+    import interviews.services.local_scorer  # noqa: F401  (NumPy)
+    import interviews.services.question_dedup  # noqa: F401
+    from interviews.services.ai_service import ai_service
+    ai_service.preload()
+
+    for name in WARM_TEMPLATES:
+        try:
+            get_template(name)
+        except TemplateDoesNotExist:
+            logger.warning(f"Pre-fork warm-up: template {name} not found")
+
+    connections.close_all()
+    for conn in connections.all(initialized_only=True):
+        # psycopg pool worker threads do not survive fork
+        if hasattr(conn, 'close_pool'):
+            conn.close_pool()
+
+
+def freeze() -> None:
+    """Collect once, then exempt every surviving object from future GC passes."""
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Pre-fork: {gc.get_freeze_count()} objects frozen")
+
+
+def after_fork() -> None:
+    """Worker side: drop any connection or client inherited from the master."""
+    from django.db import connections
+    from django.utils.functional import empty
+    from interviews.services.ai_service import ai_service
+
+    for conn in connections.all(initialized_only=True):
+        # Abandon, don't close: the socket is shared with the master
+        conn.connection = None
+    if ai_service._wrapped is not empty:
+        ai_service.reset_client()
@@ -0,0 +1,145 @@
+"""
+On-demand request profiler for staff users
+
+A staff user adds ``?_profile=cprofile`` (deterministic, pstats file) or
+``?_profile=sample`` (wall-clock stack sampler, collapsed-stack file for
+flamegraph.pl / speedscope) to a URL, or sends the same value in an
+``X-Profile`` header. The request runs normally under the profiler, the
+result is written to ``PROFILE_DIR`` and recorded as a ``RequestProfile``
+listed in the admin. The response carries ``X-Profile-Id``.
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, Optional
+
+from django.conf import settings
+
+PROFILE_MODES = ("cprofile", "sample")
+
+
+def requested_mode(request) -> Optional[str]:
+    mode = request.GET.get("_profile") or request.META.get("HTTP_X_PROFILE")
+    if not mode:
+        return None
+    mode = mode.lower()
+    if mode in ("1", "true", "yes"):
+        return "cprofile"
+    return mode if mode in PROFILE_MODES else None
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval.
+
+    Runs in a daemon thread using ``sys._current_frames()``, so the profiled
+    code is not instrumented and time spent in C extensions (PDF parsing,
+    socket reads) shows up under the Python frame that called it.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed-stack format: ``a;b;c <count>`` per line."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def pstats_summary(path: str, limit: int = 25) -> str:
+    """Top functions by cumulative time from a stored pstats file."""
+    out = io.StringIO()
+    stats = pstats.Stats(path, stream=out)
+    stats.sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+def collapsed_summary(path: str, limit: int = 25) -> str:
+    """Leaf frames with the most samples from a stored collapsed-stack file."""
+    leaves: Dict[str, int] = Counter()
+    total = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            leaves[stack.rsplit(";", 1)[-1]] += int(count)
+            total += int(count)
+    return "\n".join(
+        f"{count:6d}  {count * 100.0 / total:5.1f}%  {name}"
+        for name, count in leaves.most_common(limit)
+    )
+
+
+class ProfilerMiddleware:
+    """Must come after AuthenticationMiddleware (needs ``request.user``)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = requested_mode(request) if settings.PROFILER_ENABLED else None
+        user = getattr(request, "user", None)
+        if mode is None or user is None or not user.is_active or not user.is_staff:
+            return self.get_response(request)
+
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        started = time.perf_counter()
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            response = profiler.runcall(self.get_response, request)
+            filename = f"{name}.pstats"
+            profiler.dump_stats(os.path.join(settings.PROFILE_DIR, filename))
+        else:
+            sampler = StackSampler(settings.PROFILE_SAMPLE_INTERVAL)
+            sampler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                sampler.stop()
+            filename = f"{name}.collapsed"
+            with open(os.path.join(settings.PROFILE_DIR, filename), "w", encoding="utf-8") as f:
+                f.write(sampler.collapsed())
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        from core.models import RequestProfile
+
+        match = getattr(request, "resolver_match", None)
+        profile = RequestProfile.objects.create(
+            user=user,
+            method=request.method,
+            path=request.path[:255],
+            view_name=(match.view_name if match else "")[:255],
+            mode=mode,
+            status_code=response.status_code,
+            duration_ms=round(duration_ms, 1),
+            filename=filename,
+        )
+        response["X-Profile-Id"] = str(profile.pk)
+        return response
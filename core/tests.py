@@ -1,3 +1,194 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import time
+from unittest.mock import Mock, patch
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .db import pool_stats
+from .models import RequestProfile
+from .profiling import StackSampler
+
+
+class PoolStatsTests(TestCase):
+
+    def test_sqlite_reports_pool_disabled(self):
+        self.assertEqual(pool_stats(), {'alias': 'default', 'enabled': False})
+
+    def test_saturation_derived_from_psycopg_stats(self):
+        pool = Mock()
+        pool.get_stats.return_value = {'pool_min': 2, 'pool_max': 10, 'pool_size': 6, 'pool_available': 1, 'requests_waiting': 3}
+        with patch('core.db.connections', {'default': Mock(pool=pool)}):
+            stats = pool_stats()
+        self.assertTrue(stats['enabled'])
+        self.assertEqual(stats['in_use'], 5)
+        self.assertEqual(stats['saturation'], 0.5)
+        self.assertEqual(stats['requests_waiting'], 3)
+
+    def test_status_endpoint_is_staff_only(self):
+        url = reverse('db_pool_status')
+        User.objects.create_user('member', password='pw12345!')
+        self.client.login(username='member', password='pw12345!')
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        User.objects.create_user('staff', password='pw12345!', is_staff=True)
+        self.client.login(username='staff', password='pw12345!')
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse(resp.json()['databases'][0]['enabled'])
+
+
+class MetricsTests(TestCase):
+
+    def sample(self, name, **labels):
+        from prometheus_client import REGISTRY
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_llm_call_latency_and_errors(self):
+        from . import metrics
+        before = self.sample('careerflow_llm_request_seconds_count', provider='test', task='t', outcome='error')
+        with self.assertRaises(TimeoutError):
+            with metrics.track_llm_call('test', 't'):
+                raise TimeoutError()
+        self.assertEqual(self.sample('careerflow_llm_request_seconds_count', provider='test', task='t', outcome='error'), before + 1)
+        self.assertEqual(self.sample('careerflow_llm_errors_total', provider='test', task='t', error='TimeoutError'), 1)
+        self.assertEqual(self.sample('careerflow_llm_in_flight', provider='test'), 0)
+
+    def test_evaluation_fallback_is_counted(self):
+        from interviews.services.ai_service import AIService
+        before = self.sample('careerflow_ai_fallbacks_total', kind='local_score')
+        service = AIService.__new__(AIService)
+        service.provider = 'test'
+        service.cassette = None
+        with patch.object(AIService, '_call_llm', side_effect=RuntimeError('down')):
+            result = service.evaluate_answer('Q?', 'A.', 'Engineer')
+        self.assertEqual(result['source'], 'local')
+        self.assertEqual(self.sample('careerflow_ai_fallbacks_total', kind='local_score'), before + 1)
+
+    def test_streamed_call_records_usage(self):
+        from interviews.services.ai_service import AIService
+        from interviews.services.stub_llm_server import StubLLMServer
+        server = StubLLMServer().start()
+        self.addCleanup(server.stop)
+        labels = {'provider': 'ollama', 'task': 'evaluate_answer'}
+        before = (self.sample('careerflow_llm_tokens_total', direction='input', **labels),
+                  self.sample('careerflow_llm_prompt_eval_seconds_count', **labels))
+        with patch.dict(os.environ, {'AI_PROVIDER': 'ollama', 'OLLAMA_HOST': server.url}):
+            service = AIService()
+        self.assertTrue(service.stream_early_stop)
+        self.assertEqual(service.evaluate_answer('What is an index?', 'A B-tree.', 'Engineer')['source'], 'llm')
+        self.assertGreater(self.sample('careerflow_llm_tokens_total', direction='input', **labels), before[0])
+        self.assertEqual(self.sample('careerflow_llm_prompt_eval_seconds_count', **labels), before[1] + 1)
+
+    def test_metrics_endpoint(self):
+        with self.settings(METRICS_PUBLIC=True):
+            resp = self.client.get(reverse('prometheus_metrics'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn(b'careerflow_llm_request_seconds', resp.content)
+
+        with self.settings(METRICS_TOKEN='s3cret'):
+            self.assertEqual(self.client.get(reverse('prometheus_metrics')).status_code, 401)
+            resp = self.client.get(reverse('prometheus_metrics'), HTTP_AUTHORIZATION='Bearer s3cret')
+            self.assertEqual(resp.status_code, 200)
+
+    def test_metrics_fail_closed_without_token(self):
+        self.assertEqual(self.client.get(reverse('prometheus_metrics')).status_code, 401)
+        self.assertEqual(self.client.get(reverse('prometheus_metrics'), HTTP_AUTHORIZATION='Bearer ').status_code, 401)
+        User.objects.create_user('ops', password='pw12345!', is_staff=True)
+        self.client.login(username='ops', password='pw12345!')
+        self.assertEqual(self.client.get(reverse('prometheus_metrics')).status_code, 200)
+
+
+class ServerTimingTests(TestCase):
+
+    def test_spans_are_noops_outside_requests(self):
+        from .timing import current_timer, span
+        with span('llm'):
+            pass
+        self.assertIsNone(current_timer())
+
+    def test_header_breaks_down_db_and_template_time(self):
+        User.objects.create_user('member', password='pw12345!')
+        self.client.login(username='member', password='pw12345!')
+        with self.settings(SERVER_TIMING_HEADER=True):
+            resp = self.client.get(reverse('summary'))
+        self.assertEqual(resp.status_code, 200)
+        header = resp['Server-Timing']
+        self.assertIn('db;dur=', header)
+        self.assertIn('template;dur=', header)
+        self.assertIn('total;dur=', header)
+
+    @override_settings(SERVER_TIMING_HEADER=False)
+    def test_header_only_for_staff_by_default(self):
+        User.objects.create_user('member', password='pw12345!')
+        self.client.login(username='member', password='pw12345!')
+        self.assertNotIn('Server-Timing', self.client.get(reverse('summary')))
+        User.objects.create_user('ops', password='pw12345!', is_staff=True)
+        self.client.login(username='ops', password='pw12345!')
+        self.assertIn('total;dur=', self.client.get(reverse('summary'))['Server-Timing'])
+
+    def test_slow_request_logged_with_breakdown(self):
+        with self.settings(SLOW_REQUEST_MS=0), self.assertLogs('core.timing', level='WARNING') as logs:
+            self.client.get(reverse('login'))
+        record = logs.output[0].split('slow_request ', 1)[1]
+        data = json.loads(record)
+        self.assertEqual(data['view'], 'login')
+        self.assertIn('template', data['spans'])
+
+
+@override_settings(PROFILER_ENABLED=True, PROFILE_DIR=os.path.join(tempfile.gettempdir(), 'careerflow-test-profiles'))
+class ProfilerTests(TestCase):
+
+    def setUp(self):
+        User.objects.create_user('staff', password='pw12345!', is_staff=True, is_superuser=True)
+        User.objects.create_user('member', password='pw12345!')
+
+    def tearDown(self):
+        for profile in RequestProfile.objects.all():
+            profile.delete()
+
+    def test_non_staff_requests_are_not_profiled(self):
+        self.client.login(username='member', password='pw12345!')
+        resp = self.client.get(reverse('summary'), {'_profile': 'cprofile'})
+        self.assertNotIn('X-Profile-Id', resp)
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_cprofile_stored_and_listed_in_admin(self):
+        self.client.login(username='staff', password='pw12345!')
+        resp = self.client.get(reverse('summary'), {'_profile': 'cprofile'})
+        profile = RequestProfile.objects.get(pk=resp['X-Profile-Id'])
+        self.assertEqual(profile.view_name, 'summary')
+        self.assertTrue(os.path.exists(profile.file_path))
+
+        change = self.client.get(reverse('admin:core_requestprofile_change', args=[profile.pk]))
+        self.assertContains(change, 'cumulative')
+        download = self.client.get(reverse('admin:core_requestprofile_download', args=[profile.pk]))
+        self.assertEqual(download.status_code, 200)
+
+    def test_sampler_collects_collapsed_stacks(self):
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            sum(range(1000))
+        sampler.stop()
+        self.assertIn('test_sampler_collects_collapsed_stacks', sampler.collapsed())
+
+    def test_header_selects_sampling_mode(self):
+        self.client.login(username='staff', password='pw12345!')
+        resp = self.client.get(reverse('dashboard'), HTTP_X_PROFILE='sample')
+        profile = RequestProfile.objects.get(pk=resp['X-Profile-Id'])
+        self.assertEqual(profile.mode, 'sample')
+        self.assertTrue(profile.filename.endswith('.collapsed'))
+
+    def test_bulk_delete_in_admin_removes_files(self):
+        self.client.login(username='staff', password='pw12345!')
+        resp = self.client.get(reverse('summary'), {'_profile': 'cprofile'})
+        profile = RequestProfile.objects.get(pk=resp['X-Profile-Id'])
+        self.client.post(reverse('admin:core_requestprofile_changelist'), {
+            'action': 'delete_selected', '_selected_action': [profile.pk], 'post': 'yes'})
+        self.assertFalse(RequestProfile.objects.exists())
+        self.assertFalse(os.path.exists(profile.file_path))
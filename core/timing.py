@@ -0,0 +1,146 @@
+"""
+Per-request timing breakdown
+
+``ServerTimingMiddleware`` starts a timer for each request; ``span()`` /
+``timed()`` hooks in AIService, the model methods, the ORM (via an execute
+wrapper) and template rendering add their elapsed time to a category. The
+totals are sent as a ``Server-Timing`` header (visible in the browser's
+network panel) to staff users, or to everyone with ``SERVER_TIMING_HEADER``
+(the default under DEBUG), and requests slower than ``SLOW_REQUEST_MS`` are logged as one
+JSON record. Outside a request the hooks are no-ops.
+
+Categories overlap where calls nest: ``model`` includes the ``db`` and
+``llm`` time spent inside model methods.
+"""
+import functools
+import json
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimer:
+    """Accumulated duration and call count per category for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.totals: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, category: str, seconds: float) -> None:
+        self.totals[category] = self.totals.get(category, 0.0) + seconds
+        self.counts[category] = self.counts.get(category, 0) + 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def breakdown(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {"ms": round(total * 1000, 1), "count": self.counts[name]}
+            for name, total in sorted(self.totals.items(), key=lambda item: -item[1])
+        }
+
+    def header(self) -> str:
+        parts: List[str] = [
+            f'{name};dur={total * 1000:.1f};desc="{self.counts[name]}x"'
+            for name, total in self.totals.items()
+        ]
+        parts.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[RequestTimer]] = ContextVar("request_timer", default=None)
+
+
+def current_timer() -> Optional[RequestTimer]:
+    return _current.get()
+
+
+@contextmanager
+def span(category: str) -> Iterator[None]:
+    """Add the enclosed block's duration to ``category`` of the current request."""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(category, time.perf_counter() - started)
+
+
+def timed(category: str):
+    """Decorator form of :func:`span`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _db_span(execute, sql, params, many, context):
+    with span("db"):
+        return execute(sql, params, many, context)
+
+
+class ServerTimingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = RequestTimer()
+        token = _current.set(timer)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all(initialized_only=False):
+                    stack.enter_context(connection.execute_wrapper(_db_span))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        user = getattr(request, "user", None)
+        if settings.SERVER_TIMING_HEADER or (user is not None and user.is_staff):
+            response["Server-Timing"] = timer.header()
+        elapsed_ms = timer.elapsed() * 1000
+        if elapsed_ms >= settings.SLOW_REQUEST_MS:
+            match = getattr(request, "resolver_match", None)
+            logger.warning("slow_request " + json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "view": match.view_name if match else None,
+                "status": response.status_code,
+                "total_ms": round(elapsed_ms, 1),
+                "spans": timer.breakdown(),
+            }))
+        return response
+
+
+class _TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+        self.origin = getattr(template, "origin", None)
+
+    def render(self, context=None, request=None):
+        with span("template"):
+            return self.template.render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates backend whose renders count towards the ``template`` span."""
+
+    def from_string(self, template_code):
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name))
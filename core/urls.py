@@ -4,4 +4,6 @@ from . import views
 urlpatterns = [
     path('', views.dashboard, name='dashboard'),
     path('summary/', views.summary, name='summary'),
+    path('health/db-pool/', views.db_pool_status, name='db_pool_status'),
+    path('metrics', views.prometheus_metrics, name='prometheus_metrics'),
 ]
\ No newline at end of file
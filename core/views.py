@@ -1,11 +1,18 @@
 
 from django.shortcuts import render
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
 from interviews.models import InterviewSession
 from django.db.models import Avg, Count
 from django.utils import timezone
 from datetime import timedelta
 
+from . import metrics
+from .db import pool_stats
+
 @login_required
 def summary(request):
     sessions = InterviewSession.objects.filter(user=request.user).order_by('-created_at')
@@ -49,3 +56,24 @@ def dashboard(request):
     }
 
     return render(request, 'core/dashboard.html', context)
+
+
+@staff_member_required
+def db_pool_status(request):
+    """Connection pool saturation for every configured database (staff only)"""
+    return JsonResponse({'databases': [pool_stats(alias) for alias in settings.DATABASES]})
+
+
+def prometheus_metrics(request):
+    """Prometheus exposition, aggregated across gunicorn workers.
+
+    Requires ``Authorization: Bearer <METRICS_TOKEN>`` or a staff session,
+    unless DEBUG is on or METRICS_PUBLIC opts in (e.g. for in-cluster
+    scrapers on a private network).
+    """
+    if not (settings.DEBUG or settings.METRICS_PUBLIC or (request.user.is_authenticated and request.user.is_staff)):
+        token = settings.METRICS_TOKEN
+        supplied = request.META.get('HTTP_AUTHORIZATION', '').removeprefix('Bearer ').strip()
+        if not token or not constant_time_compare(supplied, token):
+            return HttpResponse(status=401)
+    return HttpResponse(metrics.render_latest(), content_type=metrics.CONTENT_TYPE_LATEST)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import InterviewSession, Question, Answer
+from .models import InterviewSession, Question, Answer, ResumeBlob, ResumeUpload
 from django.db.models import Avg
 
 
@@ -36,6 +36,7 @@ class InterviewSessionAdmin(admin.ModelAdmin):
 @admin.register(Question)
 class QuestionAdmin(admin.ModelAdmin):
     list_display = ('session', 'question_type', 'order', 'get_username')
+    readonly_fields = ('rubric',)
     list_filter = ('question_type', 'session__status')
     search_fields = ('question_text', 'session__user__username')
     inlines = [AnswerInline]
@@ -49,13 +50,36 @@ class QuestionAdmin(admin.ModelAdmin):
 
 @admin.register(Answer)
 class AnswerAdmin(admin.ModelAdmin):
-    list_display = ('question', 'ai_score', 'is_voice', 'answered_at')
-    list_filter = ('ai_score', 'is_voice', 'answered_at')
+    list_display = ('question', 'ai_score', 'score_source', 'provisional_score', 'is_voice', 'answered_at')
+    list_filter = ('ai_score', 'score_source', 'is_voice', 'answered_at')
     search_fields = ('user_response', 'ai_feedback')
-    readonly_fields = ('question', 'user_response', 'is_voice', 'answered_at')
-    fields = ('question', 'user_response', 'is_voice', 'ai_score', 'ai_feedback', 'topics_to_cover', 'answered_at')
+    readonly_fields = ('question', 'user_response', 'is_voice', 'score_source', 'provisional_score', 'answered_at')
+    fields = ('question', 'user_response', 'is_voice', 'ai_score', 'score_source', 'provisional_score', 'ai_feedback',
+              'topics_to_cover', 'answered_at')
+
+
+@admin.register(ResumeUpload)
+class ResumeUploadAdmin(admin.ModelAdmin):
+    list_display = ('user', 'original_name', 'size', 'status', 'created_at', 'processed_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('user__username', 'original_name', 'sha256')
+    readonly_fields = ('user', 'file', 'blob', 'original_name', 'size', 'sha256', 'status', 'text', 'skills', 'error',
+                       'created_at', 'processed_at')
+
+
+@admin.register(ResumeBlob)
+class ResumeBlobAdmin(admin.ModelAdmin):
+    list_display = ('sha256', 'size', 'ref_count', 'created_at', 'released_at')
+    list_filter = ('created_at', 'released_at')
+    search_fields = ('sha256',)
+    readonly_fields = ('sha256', 'file', 'size', 'ref_count', 'created_at', 'released_at')
+
+    def has_delete_permission(self, request, obj=None):
+        # Blobs are shared; unreferenced ones are removed by `manage.py gc_resumes`
+        return False
 
 
 admin.site.site_header = "CareerFlow AI Admin"
 admin.site.site_title = "CareerFlow AI | Admin Portal"
 admin.site.index_title = "Welcome to CareerFlow AI Administration"
+
@@ -1,7 +1,10 @@
 from django import forms
-from .models import InterviewSession
+from .models import InterviewSession, ResumeUpload
 
 class InterviewSetupForm(forms.ModelForm):
+    # Set by the setup page once the resume has been uploaded ahead of submit
+    resume_upload = forms.IntegerField(required=False, widget=forms.HiddenInput)
+
     class Meta:
         model = InterviewSession
         fields = ['job_description', 'role_title', 'resume']
@@ -19,4 +22,22 @@ class InterviewSetupForm(forms.ModelForm):
                 'class': 'form-control',
                 'accept': '.pdf,.docx'
             })
-        }
\ No newline at end of file
+        }
+
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user = user
+        self.fields['resume'].required = False
+
+    def clean(self):
+        cleaned_data = super().clean()
+        upload_id = cleaned_data.get('resume_upload')
+        cleaned_data['upload'] = None
+        if upload_id and not cleaned_data.get('resume'):
+            upload = ResumeUpload.objects.filter(pk=upload_id, user=self.user).first()
+            if upload is None:
+                raise forms.ValidationError('The uploaded resume could not be found. Please upload it again.')
+            cleaned_data['upload'] = upload
+        elif not cleaned_data.get('resume'):
+            self.add_error('resume', 'Please upload your resume.')
+        return cleaned_data
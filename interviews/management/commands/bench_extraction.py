@@ -0,0 +1,214 @@
+"""
+Resume extraction benchmark.
+
+Runs every registered extractor (see ``interviews.services.extractors``) that
+handles a file's sniffed type over a corpus of resumes and reports, per
+format and backend:
+
+- ``full_ms``/``budget_ms``: summed per-file median time to extract
+  everything, and to extract up to the resume character budget (the
+  production path)
+- ``recall``: mean share of the reference words the backend recovered; the
+  reference is ``<file>.txt`` next to a sample when present, otherwise the
+  union of what all backends found
+- ``recommended``: the fastest backend (by ``budget_ms``) meeting
+  ``--min-recall``, ready for ``RESUME_EXTRACTORS``
+
+Without ``--corpus`` a synthetic corpus is generated: the small benchmark
+resume, a large DOCX with a skills table and a multi-page PDF.
+
+    python manage.py bench_extraction --corpus samples/resumes --repeat 5
+    python manage.py bench_extraction --min-speedup 2   # fail unless docx-stream beats python-docx 2x
+"""
+import io
+import json
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interviews.services import extractors
+from interviews.services.resume_text import RESUME_TEXT_MAX_CHARS
+
+TABLE_MARKER = 'Kubernetes operators'
+WORD_RE = re.compile(r'\w+')
+
+
+def make_large_docx(paragraphs: int, table_rows: int) -> bytes:
+    from docx import Document
+
+    doc = Document()
+    doc.add_heading('Jordan Bench - Senior Backend Engineer', level=1)
+    table = doc.add_table(rows=table_rows, cols=3)
+    for i, row in enumerate(table.rows):
+        row.cells[0].text = f'Skill group {i}'
+        row.cells[1].text = f'Python, Django, PostgreSQL, {TABLE_MARKER}'
+        row.cells[2].text = f'{i % 10 + 1} years'
+    for i in range(paragraphs):
+        doc.add_paragraph(
+            f'{2000 + i % 24}: Built and scaled Django services handling {i}k requests per minute, '
+            f'owning on-call, capacity planning and the migration to managed PostgreSQL.'
+        )
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def make_resume_pdf(lines: List[str], lines_per_page: int = 50) -> bytes:
+    """A minimal text PDF (Helvetica, one line per text row), no extra dependencies."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects: List[bytes] = []
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects.append(b'<< /Type /Catalog /Pages 2 0 R >>')
+    kids = ' '.join(f'{p} 0 R' for p in page_ids)
+    objects.append(f'<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>'.encode())
+    objects.append(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+    for page_id, page_lines in zip(page_ids, pages):
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {page_id + 1} 0 R '
+                       f'/Resources << /Font << /F1 3 0 R >> >> >>'.encode())
+        escaped = [line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') for line in page_lines]
+        text = ' '.join(f'({line}) Tj T*' for line in escaped)
+        stream = f'BT /F1 10 Tf 14 TL 50 760 Td {text} ET'.encode('latin-1', 'replace')
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+    out = io.BytesIO()
+    out.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+    xref = out.tell()
+    out.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b'%010d 00000 n \n' % offset)
+    out.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def synthetic_corpus(paragraphs: int = 2000, table_rows: int = 100) -> List[Tuple[str, bytes, Optional[str]]]:
+    from interviews.management.commands.bench_interviews import make_resume_docx
+
+    pdf_lines = [f'{2000 + i % 24}: Built Django services handling {i}k requests per minute.' for i in range(400)]
+    return [
+        ('small.docx', make_resume_docx(), None),
+        ('large.docx', make_large_docx(paragraphs, table_rows), None),
+        ('resume.pdf', make_resume_pdf(pdf_lines), '\n'.join(pdf_lines)),
+    ]
+
+
+def load_corpus(directory: str) -> List[Tuple[str, bytes, Optional[str]]]:
+    corpus = []
+    for path in sorted(Path(directory).iterdir()):
+        if not path.is_file() or path.suffix == '.txt':
+            continue
+        reference = path.with_name(path.name + '.txt')
+        corpus.append((path.name, path.read_bytes(),
+                       reference.read_text(errors='replace') if reference.exists() else None))
+    return corpus
+
+
+def _words(text: str) -> set:
+    return set(WORD_RE.findall(text.lower()))
+
+
+def _time(extractor, data: bytes, max_chars: Optional[int], repeat: int) -> Tuple[float, str]:
+    timings, text = [], ''
+    for _ in range(repeat):
+        started = time.perf_counter()
+        text, _ = extractors.extract(io.BytesIO(data), max_chars, extractor=extractor)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, text
+
+
+def run_extraction_benchmark(corpus: List[Tuple[str, bytes, Optional[str]]], repeat: int = 3,
+                             max_chars: Optional[int] = RESUME_TEXT_MAX_CHARS,
+                             min_recall: float = 0.95) -> Dict[str, Any]:
+    formats: Dict[str, Dict[str, Any]] = {}
+    for name, data, reference in corpus:
+        mime = extractors.sniff_mime(io.BytesIO(data))
+        entry = formats.setdefault(mime, {'files': [], 'backends': {}})
+        entry['files'].append(name)
+        backends = extractors.extractors_for(mime)
+        if not backends:
+            continue
+        outputs: Dict[str, Optional[str]] = {}
+        for extractor in backends:
+            stats = entry['backends'].setdefault(
+                extractor.name, {'full_ms': 0.0, 'budget_ms': 0.0, 'recalls': [], 'errors': 0})
+            try:
+                full_ms, outputs[extractor.name] = _time(extractor, data, None, repeat)
+                budget_ms, _ = _time(extractor, data, max_chars, repeat)
+            except Exception:
+                stats['errors'] += 1
+                outputs[extractor.name] = None
+                continue
+            stats['full_ms'] += full_ms
+            stats['budget_ms'] += budget_ms
+        expected = _words(reference) if reference is not None else set().union(
+            *(_words(text) for text in outputs.values() if text))
+        for backend_name, text in outputs.items():
+            recall = len(_words(text) & expected) / len(expected) if text and expected else 0.0
+            entry['backends'][backend_name]['recalls'].append(recall)
+
+    for entry in formats.values():
+        for stats in entry['backends'].values():
+            recalls = stats.pop('recalls')
+            stats['recall'] = round(statistics.mean(recalls), 3) if recalls else 0.0
+            stats['full_ms'] = round(stats['full_ms'], 2)
+            stats['budget_ms'] = round(stats['budget_ms'], 2)
+        qualified = [(s['budget_ms'], n) for n, s in entry['backends'].items()
+                     if s['recall'] >= min_recall and not s['errors']]
+        entry['recommended'] = min(qualified)[1] if qualified else None
+    return {'files': len(corpus), 'repeat': repeat, 'max_chars': max_chars,
+            'min_recall': min_recall, 'formats': formats}
+
+
+class Command(BaseCommand):
+    help = 'Time and compare the registered resume text extractors on a corpus'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus', default=None,
+                            help='Directory of sample resumes (optional <name>.txt reference text each); '
+                                 'default: generated samples')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed runs per file and backend (median is used)')
+        parser.add_argument('--max-chars', type=int, default=RESUME_TEXT_MAX_CHARS,
+                            help='Character budget for budget_ms (0 = none)')
+        parser.add_argument('--min-recall', type=float, default=0.95,
+                            help='Quality bar for the recommended backend')
+        parser.add_argument('--min-speedup', type=float, default=None,
+                            help='Fail unless docx-stream is this many times faster than python-docx (full text)')
+        parser.add_argument('--json', action='store_true', help='Print the raw results as JSON')
+
+    def handle(self, *args, **options):
+        corpus = load_corpus(options['corpus']) if options['corpus'] else synthetic_corpus()
+        if not corpus:
+            raise CommandError(f"No files found in {options['corpus']}")
+        result = run_extraction_benchmark(corpus, options['repeat'], options['max_chars'] or None,
+                                          options['min_recall'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+        else:
+            self.stdout.write(f"{result['files']} files, budget {result['max_chars']} chars "
+                              f"(median of {result['repeat']})")
+            for mime, entry in result['formats'].items():
+                self.stdout.write(f"{mime} ({len(entry['files'])} files)")
+                if not entry['backends']:
+                    self.stdout.write('  no extractor registered')
+                for name, s in entry['backends'].items():
+                    self.stdout.write(
+                        f"  {name:<12} full {s['full_ms']:>9.2f} ms  budget {s['budget_ms']:>9.2f} ms  "
+                        f"recall {s['recall']:.3f}  errors {s['errors']}"
+                    )
+                if entry['backends']:
+                    self.stdout.write(f"  recommended: {entry['recommended'] or 'none meets the quality bar'}")
+
+        if options['min_speedup'] is not None:
+            docx = result['formats'].get(extractors.DOCX_MIME, {}).get('backends', {})
+            if 'docx-stream' not in docx or 'python-docx' not in docx:
+                raise CommandError('The corpus has no DOCX files to compare')
+            speedup = docx['python-docx']['full_ms'] / max(docx['docx-stream']['full_ms'], 1e-9)
+            if speedup < options['min_speedup']:
+                raise CommandError(f"docx-stream is only x{speedup:.1f} faster, expected x{options['min_speedup']}")
@@ -0,0 +1,360 @@
+"""
+End-to-end interview throughput benchmark.
+
+Scripts complete candidate sessions - signup, login, ``interview_setup`` with
+a DOCX resume upload, N ``submit_answer`` calls and ``interview_feedback`` -
+from concurrent workers, with the LLM replaced by the offline stub server,
+and reports sessions/min, p50/p95/p99 latency and DB query counts per
+endpoint, plus worker utilization. Results are written as JSON so runs with
+different worker classes, databases or cache settings can be compared.
+
+In-process (default) drives the full Django stack through the test client:
+
+    python manage.py bench_interviews --sessions 20 --concurrency 4 --output bench.json
+
+Against a running server (e.g. gunicorn pointed at ``run_llm_stub``):
+
+    python manage.py bench_interviews --base-url http://127.0.0.1:8000 --label gthread-pg
+"""
+import io
+import json
+import os
+import platform
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+_QUESTION_ID = re.compile(r'data-question="(\d+)"')
+_SESSION_URL = re.compile(r"/interview/(\d+)/")
+_CSRF_COOKIE = "csrftoken"
+
+ANSWER_TEXT = (
+    "In my last role I profiled the slowest endpoints, added covering indexes and "
+    "moved report generation to a background queue, which cut p95 latency by 60 percent. "
+    "I wrote regression tests first and rolled the change out behind a feature flag."
+)
+JOB_DESCRIPTION = (
+    "We are hiring a backend engineer to build Django and PostgreSQL services, "
+    "design REST APIs, own CI/CD and mentor junior developers."
+)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def make_resume_docx() -> bytes:
+    from docx import Document
+
+    doc = Document()
+    doc.add_paragraph("Jordan Bench - Senior Backend Engineer - jordan@example.com")
+    doc.add_paragraph("Skills: Python, Django, PostgreSQL, Redis, Docker, Kubernetes, AWS.")
+    for year in range(2016, 2024):
+        doc.add_paragraph(f"{year}: Built and scaled Django services handling {year - 2000}k requests per minute.")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+class Recorder:
+    """Thread-safe per-endpoint latency and query-count samples."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = {}
+        self.queries: Dict[str, List[int]] = {}
+        self.errors: Dict[str, int] = {}
+        self.busy = 0.0
+
+    def add(self, endpoint: str, seconds: float, queries: Optional[int], ok: bool):
+        with self.lock:
+            self.samples.setdefault(endpoint, []).append(seconds)
+            if queries is not None:
+                self.queries.setdefault(endpoint, []).append(queries)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+            self.busy += seconds
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        out = {}
+        for endpoint, values in self.samples.items():
+            queries = self.queries.get(endpoint)
+            out[endpoint] = {
+                "count": len(values),
+                "errors": self.errors.get(endpoint, 0),
+                "mean_ms": round(1000 * sum(values) / len(values), 2),
+                "p50_ms": round(1000 * percentile(values, 50), 2),
+                "p95_ms": round(1000 * percentile(values, 95), 2),
+                "p99_ms": round(1000 * percentile(values, 99), 2),
+                "max_ms": round(1000 * max(values), 2),
+                "db_queries_mean": round(sum(queries) / len(queries), 2) if queries else None,
+            }
+        return out
+
+
+class InProcessDriver:
+    """Runs requests through Django's test client in the calling thread."""
+
+    mode = "in-process"
+
+    def __init__(self):
+        from django.test import Client
+
+        host = next((h for h in settings.ALLOWED_HOSTS if h and not h.startswith(".") and h != "*"), "localhost")
+        self.client = Client(HTTP_HOST=host)
+        self.secure = bool(getattr(settings, "SECURE_SSL_REDIRECT", False))
+
+    def request(self, method: str, path: str, data=None):
+        """Returns ``(status, body, location, db_queries)``."""
+        count = [0]
+
+        def counter(execute, sql, params, many, context):
+            count[0] += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(counter):
+            if method == "GET":
+                resp = self.client.get(path, secure=self.secure)
+            else:
+                resp = self.client.post(path, data or {}, secure=self.secure)
+        body = resp.content.decode("utf-8", "replace") if not getattr(resp, "streaming", False) else ""
+        return resp.status_code, body, resp.get("Location", ""), count[0]
+
+    def close(self):
+        connection.close()
+
+
+class HttpDriver:
+    """Runs requests against a live server over HTTP (no DB query counts)."""
+
+    mode = "http"
+
+    def __init__(self, base_url: str):
+        import httpx
+
+        self.client = httpx.Client(base_url=base_url.rstrip("/"), follow_redirects=False, timeout=120)
+        self.base_url = base_url.rstrip("/")
+
+    def request(self, method: str, path: str, data=None):
+        if method == "GET":
+            resp = self.client.get(path)
+        else:
+            data = dict(data or {})
+            files = {k: (v.name, v.getvalue()) for k, v in data.items() if hasattr(v, "getvalue")}
+            fields = {k: v for k, v in data.items() if k not in files}
+            token = self.client.cookies.get(_CSRF_COOKIE)
+            if token:
+                fields.setdefault("csrfmiddlewaretoken", token)
+            resp = self.client.post(path, data=fields, files=files or None,
+                                    headers={"Referer": self.base_url + path, "X-CSRFToken": token or ""})
+        return resp.status_code, resp.text, resp.headers.get("location", ""), None
+
+    def close(self):
+        self.client.close()
+
+
+def run_session(driver, recorder: Recorder, run_id: str, index: int, answers: int, resume: bytes) -> bool:
+    """Play one candidate session end to end. Returns True if it reached feedback."""
+
+    def step(endpoint: str, method: str, path: str, data=None, expect=(200, 302)):
+        started = time.perf_counter()
+        status, body, location, queries = driver.request(method, path, data)
+        elapsed = time.perf_counter() - started
+        recorder.add(endpoint, elapsed, queries, status in expect)
+        if status not in expect:
+            raise RuntimeError(f"{endpoint} returned HTTP {status}")
+        return body, location
+
+    username = f"bench-{run_id}-{index}"
+    password = f"Zq#{uuid.uuid4().hex[:12]}!"
+
+    step("signup_get", "GET", "/accounts/signup/")
+    step("signup", "POST", "/accounts/signup/", {
+        "first_name": "Bench", "last_name": str(index), "username": username,
+        "email": f"{username}@example.com", "password1": password, "password2": password,
+    }, expect=(302,))
+    step("login", "POST", "/accounts/user-login/",
+         {"email_or_username": username, "password": password}, expect=(302,))
+
+    step("setup_get", "GET", "/interview/setup/")
+    upload = io.BytesIO(resume)
+    upload.name = "resume.docx"
+    _, location = step("interview_setup", "POST", "/interview/setup/", {
+        "job_description": JOB_DESCRIPTION, "role_title": "Backend Engineer", "resume": upload,
+    }, expect=(302,))
+    match = _SESSION_URL.search(location)
+    if not match:
+        raise RuntimeError(f"interview_setup redirected to unexpected URL {location!r}")
+    session_id = match.group(1)
+
+    body, _ = step("interview_room", "GET", f"/interview/{session_id}/", expect=(200,))
+    match = _QUESTION_ID.search(body)
+    question_id = match.group(1) if match else None
+
+    for _ in range(answers):
+        if not question_id:
+            break
+        body, _ = step("submit_answer", "POST", f"/interview/{session_id}/submit/{question_id}/",
+                       {"answer": ANSWER_TEXT}, expect=(200,))
+        data = json.loads(body)
+        question_id = data.get("next_question_id")
+
+    step("interview_feedback", "GET", f"/interview/{session_id}/feedback/", expect=(200,))
+    return True
+
+
+@contextmanager
+def stub_llm(latency: str, token_delay: float):
+    """Start the stub LLM and point a fresh AIService singleton at it."""
+    from interviews.services import ai_service as ai_module
+    from interviews.services.stub_llm_server import StubConfig, StubLLMServer
+
+    server = StubLLMServer(config=StubConfig(latency=latency, token_delay=token_delay)).start()
+    env = {"AI_PROVIDER": "ollama", "OLLAMA_HOST": server.url}
+    try:
+        with patch.dict(os.environ, env):
+            service = ai_module.AIService()
+        with patch.object(ai_module, "ai_service", service):
+            yield server
+    finally:
+        server.stop()
+
+
+def run_benchmark(sessions: int, concurrency: int, answers: int, stub_latency: str = "fixed:0",
+                  token_delay: float = 0.0, base_url: Optional[str] = None, label: str = "") -> Dict[str, Any]:
+    run_id = uuid.uuid4().hex[:8]
+    recorder = Recorder()
+    resume = make_resume_docx()
+    failures: List[str] = []
+    lock = threading.Lock()
+
+    def worker(index: int):
+        driver = HttpDriver(base_url) if base_url else InProcessDriver()
+        try:
+            run_session(driver, recorder, run_id, index, answers, resume)
+        except Exception as exc:
+            with lock:
+                failures.append(f"session {index}: {exc}")
+        finally:
+            driver.close()
+
+    def play():
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(worker, range(sessions)))
+        return time.perf_counter() - started
+
+    if base_url:
+        wall = play()
+    else:
+        with stub_llm(stub_latency, token_delay):
+            wall = play()
+
+    completed = sessions - len(failures)
+    db = settings.DATABASES["default"]
+    return {
+        "label": label,
+        "run_id": run_id,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": {
+            "mode": "http" if base_url else "in-process",
+            "base_url": base_url,
+            "sessions": sessions,
+            "concurrency": concurrency,
+            "answers_per_session": answers,
+            "stub_latency": None if base_url else stub_latency,
+            "db_engine": db["ENGINE"],
+            "db_options": {k: v for k, v in (db.get("OPTIONS") or {}).items() if k != "pool"},
+            "db_pool": bool((db.get("OPTIONS") or {}).get("pool")),
+            "cache_backend": settings.CACHES["default"]["BACKEND"],
+            "python": platform.python_version(),
+        },
+        "totals": {
+            "completed": completed,
+            "failed": len(failures),
+            "wall_seconds": round(wall, 3),
+            "sessions_per_min": round(completed / wall * 60, 2) if wall else 0.0,
+            # Share of worker-time spent inside requests (vs. idle/harness overhead)
+            "worker_utilization": round(recorder.busy / (wall * concurrency), 3) if wall else 0.0,
+        },
+        "endpoints": recorder.summary(),
+        "failures": failures[:20],
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark complete interview sessions end to end with a simulated LLM"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sessions', type=int, default=10)
+        parser.add_argument('--concurrency', type=int, default=2)
+        parser.add_argument('--answers', type=int, default=10, help='Answers submitted per session')
+        parser.add_argument('--stub-latency', default='fixed:0.05', help='LLM latency spec (see run_llm_stub)')
+        parser.add_argument('--token-delay', type=float, default=0.0)
+        parser.add_argument('--base-url', help='Benchmark a running server instead of in-process')
+        parser.add_argument('--label', default='', help='Free-form tag stored with the results')
+        parser.add_argument('--output', help='Write results JSON to this path')
+        parser.add_argument('--keep-data', action='store_true', help='Do not delete benchmark users/sessions')
+
+    def handle(self, *args, **options):
+        if options['sessions'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--sessions and --concurrency must be positive")
+
+        results = run_benchmark(
+            sessions=options['sessions'],
+            concurrency=options['concurrency'],
+            answers=options['answers'],
+            stub_latency=options['stub_latency'],
+            token_delay=options['token_delay'],
+            base_url=options['base_url'],
+            label=options['label'],
+        )
+        if not options['base_url'] and not options['keep_data']:
+            cleanup(results['run_id'])
+
+        payload = json.dumps(results, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(payload)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        totals = results['totals']
+        self.stdout.write(
+            f"{totals['completed']}/{options['sessions']} sessions, {totals['sessions_per_min']} sessions/min, "
+            f"utilization {totals['worker_utilization']:.0%}"
+        )
+        for endpoint, stats in results['endpoints'].items():
+            queries = stats['db_queries_mean']
+            self.stdout.write(
+                f"  {endpoint:20} n={stats['count']:<4} p50={stats['p50_ms']:>8}ms p95={stats['p95_ms']:>8}ms "
+                f"p99={stats['p99_ms']:>8}ms" + (f" queries={queries}" if queries is not None else "")
+            )
+        for failure in results['failures']:
+            self.stderr.write(failure)
+
+
+def cleanup(run_id: str) -> None:
+    """Delete benchmark users, their sessions and uploaded resumes."""
+    from datetime import timedelta
+    from django.contrib.auth.models import User
+    from interviews.models import InterviewSession
+    from interviews.services.resume_blobs import collect_garbage
+
+    # Resumes are shared blobs: release the references, then collect the ones left unused
+    sha256s = set(InterviewSession.objects.filter(user__username__startswith=f"bench-{run_id}-")
+                  .values_list('resume_sha256', flat=True))
+    User.objects.filter(username__startswith=f"bench-{run_id}-").delete()
+    collect_garbage(grace=timedelta(0), sha256s=sha256s)
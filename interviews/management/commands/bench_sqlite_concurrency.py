@@ -0,0 +1,166 @@
+"""
+Concurrency benchmark for the SQLite profiles.
+
+Plays interview sessions through the app's own write paths (user, processed
+early upload and session creation, ``generate_interview_questions`` with a
+canned LLM reply, ``Answer.objects.create`` per question as in ``submit_answer``, and
+``calculate_overall_score``) from N parallel workers against a throwaway,
+migrated database file - once with SQLite defaults and once with
+``SQLITE_TUNED_OPTIONS`` from settings - and reports "database is locked"
+errors and throughput for each.
+
+Each worker thread gets its own ``default`` connection to the throwaway
+file (Django connections are per thread), so the app code runs unchanged
+and the configured database is never touched.
+
+    python manage.py bench_sqlite_concurrency --sessions 24 --questions 10
+"""
+import copy
+import json
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+from django.db.utils import load_backend
+
+DEFAULT_OPTIONS: Dict[str, Any] = {'timeout': 5, 'transaction_mode': None, 'init_command': ''}
+
+RESUME_TEXT = 'Backend engineer: Python, Django, PostgreSQL, Redis, Docker.'
+ANSWER_TEXT = 'I would profile the slow queries first, then add indexes and cache hot reads. ' * 4
+
+
+def _database(path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Settings for an SQLite ``default`` database at ``path`` with ``options``."""
+    db = copy.deepcopy(connections.settings['default'])
+    db.update(ENGINE='django.db.backends.sqlite3', NAME=path, OPTIONS=dict(options),
+              USER='', PASSWORD='', HOST='', PORT='')
+    return db
+
+
+def _use_database(db: Dict[str, Any]) -> None:
+    """Point this thread's ``default`` connection at ``db``."""
+    connections['default'] = load_backend(db['ENGINE']).DatabaseWrapper(db, 'default')
+
+
+def _setup(db: Dict[str, Any]) -> None:
+    """Migrate the throwaway database."""
+    from django.contrib.contenttypes.models import ContentType
+
+    _use_database(db)
+    try:
+        call_command('migrate', verbosity=0, interactive=False)
+    finally:
+        connections['default'].close()
+        # Cached per alias: drop the throwaway database's ids for "default"
+        ContentType.objects.clear_cache()
+
+
+class CannedAI:
+    """Stands in for ``ai_service`` in ``generate_interview_questions``."""
+
+    def __init__(self, questions: int):
+        self.questions = [
+            {'question_text': f'Question {order}: how would you scale service {order}?',
+             'question_type': 'technical' if order % 2 else 'behavioral', 'order': order}
+            for order in range(1, questions + 1)
+        ]
+
+    def generate_questions_from_context(self, **kwargs) -> List[Dict[str, Any]]:
+        return [dict(q) for q in self.questions]
+
+
+def _run_session(db: Dict[str, Any], ai: CannedAI) -> Optional[str]:
+    """Play one interview session. Returns the error message, or None on success."""
+    from django.contrib.auth.models import User
+    from interviews.models import Answer, InterviewSession, ResumeUpload
+
+    _use_database(db)
+    try:
+        user = User.objects.create(username=f'bench-{uuid.uuid4().hex[:12]}')
+        # Processed early upload: the session takes its text and skills
+        upload = ResumeUpload.objects.create(
+            user=user, file='resumes/bench.docx', original_name='bench.docx', status='ready',
+            text=RESUME_TEXT, skills=['python', 'django'])
+        session = InterviewSession.objects.create(
+            user=user, role_title='Backend Engineer', job_description='Build Django APIs.',
+            resume='resumes/bench.docx', resume_upload=upload)
+        session.generate_interview_questions(ai=ai)
+        question = session.get_next_unanswered_question()
+        while question is not None:
+            Answer.objects.create(
+                question=question, user_response=ANSWER_TEXT, ai_score=7, ai_feedback='Solid',
+                topics_to_cover='', score_source='local', provisional_score=7)
+            question = session.get_next_unanswered_question()
+        session.calculate_overall_score()
+        return None
+    except OperationalError as exc:
+        return str(exc)
+    finally:
+        connections['default'].close()
+
+
+def run_profile(options: Dict[str, Any], sessions: int, questions: int, workers: int) -> Dict[str, Any]:
+    """Run ``sessions`` concurrent interviews against a fresh database file."""
+    ai = CannedAI(questions)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _database(os.path.join(tmp, 'bench.sqlite3'), options)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(_setup, db).result()
+
+        # Timed from here: migrations are setup, not part of the write pattern
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            errors = list(pool.map(lambda _: _run_session(db, ai), range(sessions)))
+        elapsed = time.perf_counter() - started
+
+    failures = [e for e in errors if e]
+    return {
+        'sessions': sessions,
+        'completed': sessions - len(failures),
+        'lock_errors': sum(1 for e in failures if 'locked' in e),
+        'errors': len(failures),
+        'seconds': round(elapsed, 3),
+        'sessions_per_sec': round((sessions - len(failures)) / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark concurrent interview writes under default vs tuned SQLite settings"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sessions', type=int, default=24, help='Interview sessions to play')
+        parser.add_argument('--questions', type=int, default=10, help='Questions per session')
+        parser.add_argument('--workers', type=int, default=8, help='Parallel workers')
+        parser.add_argument('--profile', choices=['both', 'default', 'tuned'], default='both')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+        parser.add_argument('--fail-on-lock', action='store_true',
+                            help='Exit non-zero if the tuned profile hit any lock error')
+
+    def handle(self, *args, **options):
+        profiles = {'default': DEFAULT_OPTIONS, 'tuned': settings.SQLITE_TUNED_OPTIONS}
+        if options['profile'] != 'both':
+            profiles = {options['profile']: profiles[options['profile']]}
+
+        results = {
+            name: run_profile(opts, options['sessions'], options['questions'], options['workers'])
+            for name, opts in profiles.items()
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            for name, r in results.items():
+                self.stdout.write(
+                    f"{name:8} completed {r['completed']}/{r['sessions']}  "
+                    f"lock errors {r['lock_errors']}  {r['seconds']}s  {r['sessions_per_sec']} sessions/s"
+                )
+
+        if options['fail_on_lock'] and results.get('tuned', {}).get('lock_errors'):
+            raise CommandError(f"Tuned profile hit {results['tuned']['lock_errors']} lock errors")
@@ -0,0 +1,98 @@
+"""
+Process startup benchmark.
+
+Times, in fresh interpreters, what every container boot and gunicorn worker
+pays before serving anything: ``django.setup()`` plus loading the URLconf
+(which imports every view and model), and ``manage.py check`` as a stand-in
+for ``migrate``/``collectstatic``. It also reports which heavy modules got
+imported along the way; the LLM client packages and document parsers must
+stay lazy, so their presence is a failure.
+
+    python manage.py bench_startup --repeat 5 --max-seconds 3
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Imported only when the AI provider, resume extraction or answer scoring is actually used
+LAZY_MODULES = ('langchain_groq', 'langchain_ollama', 'groq', 'ollama', 'PyPDF2', 'docx', 'numpy')
+
+SETUP_SCRIPT = """
+import json, os, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+from interviews.services.ai_service import ai_service
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "modules": sorted(m for m in json.loads(sys.argv[1]) if m in sys.modules)}))
+"""
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault('DJANGO_SETTINGS_MODULE', os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'))
+    return env
+
+
+def measure_setup() -> Dict[str, Any]:
+    out = subprocess.run(
+        [sys.executable, '-c', SETUP_SCRIPT, json.dumps(LAZY_MODULES)],
+        cwd=settings.BASE_DIR, env=_env(), capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure_command(command: List[str]) -> float:
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, 'manage.py', *command],
+        cwd=settings.BASE_DIR, env=_env(), capture_output=True, check=True,
+    )
+    return time.perf_counter() - started
+
+
+def run_startup_profile(repeat: int = 3) -> Dict[str, Any]:
+    setups = [measure_setup() for _ in range(repeat)]
+    checks = [measure_command(['check']) for _ in range(repeat)]
+    return {
+        'repeat': repeat,
+        'setup_seconds': round(statistics.median(s['seconds'] for s in setups), 3),
+        'check_seconds': round(statistics.median(checks), 3),
+        'eager_modules': sorted({m for s in setups for m in s['modules']}),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Measure django.setup()/URLconf import and manage.py command latency in fresh processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (median is reported)')
+        parser.add_argument('--max-seconds', type=float, default=None,
+                            help='Fail if the median setup time exceeds this budget')
+        parser.add_argument('--json', action='store_true', help='Print the raw results as JSON')
+
+    def handle(self, *args, **options):
+        result = run_startup_profile(options['repeat'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+        else:
+            self.stdout.write(
+                f"setup+urlconf {result['setup_seconds']}s  manage.py check {result['check_seconds']}s  "
+                f"(median of {result['repeat']})"
+            )
+            self.stdout.write(f"eagerly imported: {', '.join(result['eager_modules']) or 'none'}")
+
+        if result['eager_modules']:
+            raise CommandError(f"Modules that should load lazily were imported at startup: {result['eager_modules']}")
+        if options['max_seconds'] is not None and result['setup_seconds'] > options['max_seconds']:
+            raise CommandError(f"Startup took {result['setup_seconds']}s, budget {options['max_seconds']}s")
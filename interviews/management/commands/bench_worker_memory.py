@@ -0,0 +1,123 @@
+"""
+Per-worker memory report for gunicorn with and without preloading.
+
+Starts ``gunicorn -c config/gunicorn.conf.py`` with GUNICORN_PRELOAD off and
+on, sends a few requests so every worker has served traffic, then reads
+``/proc/<pid>/smaps_rollup`` of each worker. RSS counts shared pages in full
+for every process; PSS splits them between sharers, so the PSS total is the
+real memory cost of the worker pool, and private memory is what each extra
+worker adds. Linux only.
+
+    python manage.py bench_worker_memory --workers 3 --requests 30
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+import httpx
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+FIELDS = {'Rss': 'rss', 'Pss': 'pss', 'Private_Clean': 'private', 'Private_Dirty': 'private'}
+
+
+def read_memory(pid: int) -> Dict[str, int]:
+    """RSS/PSS/private memory of ``pid`` in KiB."""
+    usage = {'rss': 0, 'pss': 0, 'private': 0}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if key in FIELDS:
+                usage[FIELDS[key]] += int(rest.split()[0])
+    return usage
+
+
+def worker_pids(master_pid: int) -> List[int]:
+    with open(f'/proc/{master_pid}/task/{master_pid}/children') as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise CommandError(f'gunicorn did not answer on {url} within {timeout}s')
+
+
+def measure(preload: bool, workers: int, requests: int, path: str = '/accounts/login/') -> Dict[str, Any]:
+    port = _free_port()
+    env = dict(os.environ, GUNICORN_PRELOAD=str(preload))
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'config/gunicorn.conf.py',
+         '--workers', str(workers), '--bind', f'127.0.0.1:{port}', 'config.wsgi:application'],
+        cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        url = f'http://127.0.0.1:{port}{path}'
+        _wait_ready(url, timeout=60)
+        with httpx.Client() as client:
+            for _ in range(requests):
+                client.get(url, headers={'Connection': 'close'})
+        deadline = time.monotonic() + 30
+        pids = worker_pids(proc.pid)
+        while len(pids) < workers and time.monotonic() < deadline:
+            time.sleep(0.2)
+            pids = worker_pids(proc.pid)
+        per_worker = [read_memory(pid) for pid in pids]
+        master = read_memory(proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    count = len(per_worker) or 1
+    return {
+        'preload': preload,
+        'workers': len(per_worker),
+        'master_rss_kib': master['rss'],
+        'worker_rss_kib': sum(w['rss'] for w in per_worker) // count,
+        'worker_pss_kib': sum(w['pss'] for w in per_worker) // count,
+        'worker_private_kib': sum(w['private'] for w in per_worker) // count,
+        'total_pss_kib': master['pss'] + sum(w['pss'] for w in per_worker),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare gunicorn per-worker memory with GUNICORN_PRELOAD off and on'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=3)
+        parser.add_argument('--requests', type=int, default=30, help='Requests sent before measuring')
+        parser.add_argument('--json', action='store_true', help='Print the raw results as JSON')
+
+    def handle(self, *args, **options):
+        if not os.path.exists('/proc/self/smaps_rollup'):
+            raise CommandError('bench_worker_memory needs Linux /proc/<pid>/smaps_rollup')
+
+        results = [measure(preload, options['workers'], options['requests']) for preload in (False, True)]
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for r in results:
+            self.stdout.write(
+                f"preload={str(r['preload']):5}  workers {r['workers']}  "
+                f"per-worker RSS {r['worker_rss_kib'] / 1024:.1f} MiB  PSS {r['worker_pss_kib'] / 1024:.1f} MiB  "
+                f"private {r['worker_private_kib'] / 1024:.1f} MiB  total PSS {r['total_pss_kib'] / 1024:.1f} MiB"
+            )
+        # Private pages are what each extra worker adds; shared ones are paid once
+        saved = results[0]['worker_private_kib'] - results[1]['worker_private_kib']
+        self.stdout.write(f"preloading saves {saved / 1024:.1f} MiB of private memory per additional worker")
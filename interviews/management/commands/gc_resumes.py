@@ -0,0 +1,44 @@
+"""
+Garbage-collect content-addressed resume blobs.
+
+Deletes early uploads that never became a session, then removes blobs that
+have had no references for the grace period (their rows and stored files).
+Run it periodically, e.g. daily from cron:
+
+    python manage.py gc_resumes
+    python manage.py gc_resumes --dry-run
+    python manage.py gc_resumes --recount --adopt-legacy   # one-off after upgrading
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from interviews.services.resume_blobs import adopt_legacy_sessions, collect_garbage, prune_uploads, recount
+
+
+class Command(BaseCommand):
+    help = 'Delete unreferenced resume blobs and abandoned early uploads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=float, default=24,
+                            help='Keep unreferenced blobs this long (a re-upload revives them)')
+        parser.add_argument('--upload-days', type=float, default=7,
+                            help='Delete early uploads not used by any session after this many days')
+        parser.add_argument('--recount', action='store_true',
+                            help='Recompute reference counts from uploads and sessions first')
+        parser.add_argument('--adopt-legacy', action='store_true',
+                            help='Move sessions and uploads with a private resume copy onto shared blobs first')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted')
+
+    def handle(self, *args, **options):
+        if options['adopt_legacy']:
+            moved, removed = adopt_legacy_sessions()
+            self.stdout.write(f"Adopted {moved} legacy sessions and uploads ({removed} private copies deleted)")
+        if options['recount']:
+            self.stdout.write(f"Corrected {recount()} reference counts")
+        if not options['dry_run']:
+            pruned = prune_uploads(timedelta(days=options['upload_days']))
+            self.stdout.write(f"Deleted {pruned} abandoned uploads")
+        blobs, freed = collect_garbage(timedelta(hours=options['grace_hours']), dry_run=options['dry_run'])
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(f"{verb} {blobs} resume blobs ({freed / 1024:.1f} KiB)")
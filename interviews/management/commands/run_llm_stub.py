@@ -0,0 +1,60 @@
+"""
+Run the offline LLM stand-in server (Ollama + Groq/OpenAI compatible).
+
+    python manage.py run_llm_stub --port 11435 --latency uniform:0.2,1.5 --rate-limit-rate 0.05
+
+Then start the app with OLLAMA_HOST=http://127.0.0.1:11435 (AI_PROVIDER=ollama)
+or GROQ_API_BASE=http://127.0.0.1:11435 and any GROQ_API_KEY (AI_PROVIDER=groq).
+"""
+import json
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interviews.services.stub_llm_server import StubConfig, StubLLMServer, sample_latency
+
+
+class Command(BaseCommand):
+    help = "Run a local server emulating the Ollama and Groq chat APIs with canned JSON responses"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=11435)
+        parser.add_argument('--latency', default='fixed:0',
+                            help='fixed:S | uniform:LO,HI | normal:MU,SIGMA | lognormal:MU,SIGMA (seconds)')
+        parser.add_argument('--token-delay', type=float, default=0.0, help='Seconds between streamed chunks')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500')
+        parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction answered with 429')
+        parser.add_argument('--retry-after', type=int, default=1)
+        parser.add_argument('--model', default='stub-model')
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--responses', help='JSON file mapping task name to a canned response ({role} is substituted)')
+
+    def handle(self, *args, **options):
+        responses = {}
+        if options['responses']:
+            with open(options['responses'], encoding='utf-8') as f:
+                responses = {k: v if isinstance(v, str) else json.dumps(v) for k, v in json.load(f).items()}
+        try:
+            sample_latency(options['latency'], random.Random())
+        except (ValueError, IndexError):
+            raise CommandError(f"Invalid --latency spec: {options['latency']}")
+
+        config = StubConfig(
+            latency=options['latency'],
+            token_delay=options['token_delay'],
+            error_rate=options['error_rate'],
+            rate_limit_rate=options['rate_limit_rate'],
+            retry_after=options['retry_after'],
+            model=options['model'],
+            seed=options['seed'],
+            responses=responses,
+        )
+        server = StubLLMServer(options['host'], options['port'], config)
+        self.stdout.write(self.style.SUCCESS(f"Stub LLM listening on {server.url} (Ctrl+C to stop)"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,23 @@
+"""
+Load the configured Ollama model and pin it with keep_alive.
+
+gunicorn does this in the background on start (OLLAMA_WARM_ON_START); use
+this command with ``runserver`` or after restarting Ollama.
+
+    python manage.py warm_ollama
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from interviews.services.ollama_residency import residency_from_env
+
+
+class Command(BaseCommand):
+    help = 'Load OLLAMA_MODEL into memory with the configured keep_alive and num_ctx'
+
+    def handle(self, *args, **options):
+        residency = residency_from_env()
+        if not residency.warm(reason="manual"):
+            raise CommandError(f"Could not load {residency.model} from {residency.host}")
+        self.stdout.write(
+            f"{residency.model} loaded (keep_alive={residency.keep_alive}, num_ctx={residency.num_ctx})"
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0002_resumeupload_interviewsession_resume_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewsession',
+            name='resume_sha256',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
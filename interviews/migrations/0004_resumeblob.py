@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:54
+
+import django.db.models.deletion
+import interviews.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0003_interviewsession_resume_sha256'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('file', models.FileField(max_length=255, upload_to=interviews.models.resume_blob_path)),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('released_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='interviewsession',
+            name='resume',
+            field=models.FileField(max_length=255, upload_to='resumes/'),
+        ),
+        migrations.AlterField(
+            model_name='resumeupload',
+            name='file',
+            field=models.FileField(max_length=255, upload_to='resumes/'),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='resume_blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='sessions', to='interviews.resumeblob'),
+        ),
+        migrations.AddField(
+            model_name='resumeupload',
+            name='blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='uploads', to='interviews.resumeblob'),
+        ),
+    ]
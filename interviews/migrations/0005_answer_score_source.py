@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0004_resumeblob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='provisional_score',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='score_source',
+            field=models.CharField(choices=[('local', 'Local (provisional)'), ('llm', 'LLM')], default='llm', max_length=10),
+        ),
+    ]
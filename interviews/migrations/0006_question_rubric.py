@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0005_answer_score_source'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='rubric',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
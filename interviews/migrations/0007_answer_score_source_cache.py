@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0006_question_rubric'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='answer',
+            name='score_source',
+            field=models.CharField(choices=[('local', 'Local (provisional)'), ('llm', 'LLM'), ('cache', 'LLM (cached for a similar answer)')], default='llm', max_length=10),
+        ),
+    ]
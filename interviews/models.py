@@ -1,16 +1,77 @@
 from typing import Dict, List, Optional
 
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.utils import timezone
 
-import PyPDF2
-from docx import Document
 import logging
 
+from core.metrics import record_fallback, track_resume_extraction
+from core.timing import timed
+from interviews.services.resume_storage import open_resume
+from interviews.services.resume_text import detect_skills, extract_text, file_format
+from interviews.services.rubrics import normalize_rubric
+
 logger = logging.getLogger(__name__)
 
 
+def resume_blob_path(instance, filename) -> str:
+    """``resumes/sha256/ab/abcdef....pdf``: one object per distinct content."""
+    return f"resumes/sha256/{instance.sha256[:2]}/{instance.sha256}.{file_format(filename) or 'bin'}"
+
+
+class ResumeBlob(models.Model):
+    """A resume file stored once per distinct content (SHA-256).
+
+    Uploads and sessions reference the blob instead of holding their own
+    copy; ``ref_count`` tracks those references and ``gc_resumes`` deletes
+    blobs that have been unreferenced for a grace period.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to=resume_blob_path, max_length=255)
+    size = models.PositiveIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # When the last reference went away (None while referenced)
+    released_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.ref_count} refs)"
+
+
+class ResumeUpload(models.Model):
+    """A resume uploaded ahead of the setup form and processed in the background"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='resume_uploads')
+    file = models.FileField(upload_to='resumes/', max_length=255)
+    blob = models.ForeignKey(ResumeBlob, on_delete=models.PROTECT, null=True, blank=True, related_name='uploads')
+    original_name = models.CharField(max_length=255)
+    size = models.PositiveIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    text = models.TextField(blank=True)
+    skills = models.JSONField(default=list, blank=True)
+    error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.user.username} - {self.original_name} ({self.status})"
+
+    @property
+    def is_processed(self) -> bool:
+        return self.status in ('ready', 'failed')
+
+
 class InterviewSession(models.Model):
     STATUS_CHOICES = [
         ('setup', 'Setup'),
@@ -21,7 +82,13 @@ class InterviewSession(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     job_description = models.TextField()
     role_title = models.CharField(max_length=200)
-    resume = models.FileField(upload_to='resumes/')
+    resume = models.FileField(upload_to='resumes/', max_length=255)
+    resume_upload = models.ForeignKey(ResumeUpload, on_delete=models.SET_NULL, null=True, blank=True,
+                                      related_name='sessions')
+    resume_blob = models.ForeignKey(ResumeBlob, on_delete=models.PROTECT, null=True, blank=True,
+                                    related_name='sessions')
+    # Content hash of ``resume``, recorded on first read (keys the local resume cache)
+    resume_sha256 = models.CharField(max_length=64, blank=True, default='')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='setup')
     overall_score = models.FloatField(default=0.0)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -30,42 +97,52 @@ class InterviewSession(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.role_title}"
 
+    @timed("model")
     def extract_resume_text(self) -> str:
         """Extract and normalize text from uploaded resume (PDF or DOCX)"""
+        upload = self.processed_upload()
+        if upload is not None and upload.status == 'ready':
+            return upload.text
         if not self.resume:
             return ""
 
-        text = ""
-        file_path = self.resume.path
-
-        if file_path.lower().endswith('.pdf'):
+        with track_resume_extraction(file_format(self.resume.name)):
             try:
-                with open(file_path, 'rb') as f:
-                    reader = PyPDF2.PdfReader(f)
-                    for page in reader.pages:
-                        extracted = page.extract_text() or ''
-                        text += extracted + "\n"
-            except Exception:
-                # Graceful fallback
-                text = ""
-        elif file_path.lower().endswith('.docx'):
-            try:
-                doc = Document(file_path)
-                for para in doc.paragraphs:
-                    text += (para.text or '') + "\n"
-            except Exception:
-                text = ""
+                # Read through the storage API; ``resume.path`` only exists on local disk
+                with open_resume(self.resume, self.resume_sha256) as (f, digest):
+                    text = extract_text(f, self.resume.name)
+            except Exception as e:
+                logger.warning(f"Resume file unavailable for session {self.pk}: {e}")
+                return ""
+        if digest != self.resume_sha256:
+            self.resume_sha256 = digest
+            if self.pk:
+                InterviewSession.objects.filter(pk=self.pk).update(resume_sha256=digest)
+        return text
+
+    def processed_upload(self) -> Optional['ResumeUpload']:
+        """The early upload behind this session, once background processing finished.
+
+        Waits briefly (RESUME_UPLOAD_WAIT seconds) if it is still running. The
+        outcome, including a timed-out ``None``, is kept on the instance so
+        one request never waits more than once.
+        """
+        if self.resume_upload_id is None:
+            return None
+        if not hasattr(self, '_processed_upload'):
+            from interviews.services.resume_uploads import wait_for_processing
 
-        # Normalize whitespace and limit size for prompt efficiency
-        text = ' '.join(text.split())
-        return text[:3500]
+            self._processed_upload = wait_for_processing(self.resume_upload)
+        return self._processed_upload
 
-    def parse_and_save_resume(self) -> Dict:
+    @timed("model")
+    def parse_and_save_resume(self, resume_text: Optional[str] = None) -> Dict:
         """Parse resume and return extracted data"""
         # Import here to avoid circular imports at import time
         from interviews.services.ai_service import ai_service
 
-        resume_text = self.extract_resume_text()
+        if resume_text is None:
+            resume_text = self.extract_resume_text()
         parsed_data = ai_service.parse_resume(resume_text)
         return parsed_data
 
@@ -76,9 +153,6 @@ class InterviewSession(models.Model):
         """
         role = self.role_title or 'Software Engineer'
         
-        # Build a generic skill list from text if available
-        text = (self.extract_resume_text() + ' ' + self.job_description + ' ' + self.role_title).lower()
-        
         # Default technical questions tailored to role
         tech_questions = [
             f"Describe a challenging technical problem you've solved and your approach to it.",
@@ -119,46 +193,65 @@ class InterviewSession(models.Model):
         return questions_data
 
 
-    def generate_interview_questions(self) -> List['Question']:
+    def recent_question_texts(self) -> List[str]:
+        """Questions from the user's most recent other sessions (QUESTION_DEDUP_HISTORY of them)."""
+        session_ids = list(
+            InterviewSession.objects.filter(user_id=self.user_id).exclude(pk=self.pk)
+            .order_by('-created_at').values_list('pk', flat=True)[:settings.QUESTION_DEDUP_HISTORY]
+        )
+        return list(Question.objects.filter(session_id__in=session_ids).values_list('question_text', flat=True))
+
+    def deduplicate_questions(self, questions_data: List[Dict]) -> List[Dict]:
+        """Swap near-duplicates for unused default questions (the pool never reads the resume)."""
+        from interviews.services.ai_service import AIService
+        from interviews.services.question_dedup import deduplicate
+
+        role = self.role_title or 'Software Engineer'
+        questions_data, replaced = deduplicate(
+            questions_data,
+            history=self.recent_question_texts() if settings.QUESTION_DEDUP_HISTORY > 0 else (),
+            fallback=lambda: self._get_default_questions() + AIService._get_default_questions(role),
+        )
+        if replaced:
+            logger.info(f"Replaced {replaced} near-duplicate question(s) for session {self.pk}")
+        return questions_data
+
+    @timed("model")
+    def generate_interview_questions(self, ai=None) -> List['Question']:
         """Generate questions directly based on JD, Role, and Resume with full context.
         
         Sends all information (job description, role, resume text) to AI at once
-        for highly personalized and relevant questions.
+        for highly personalized and relevant questions. ``ai`` defaults to the
+        process-wide ``ai_service`` (benchmarks pass a canned stand-in).
         
         Handles graceful degradation if AI is unavailable, using default questions.
         """
-        from interviews.services.ai_service import ai_service
+        if ai is None:
+            from interviews.services.ai_service import ai_service as ai
 
         # Get resume text
         resume_text = self.extract_resume_text()
 
+        # Skills were already extracted in the background for early uploads
+        upload = self.processed_upload()
+        skills = list(upload.skills) if upload is not None and upload.status == 'ready' else []
+
         # Extract skills for context (optional, AI will focus on full context)
-        skills = []
-        try:
-            resume_data = self.parse_and_save_resume()
-            skills = resume_data.get('skills', []) if isinstance(resume_data, dict) else []
-        except Exception:
-            # If AI parsing fails, deterministic fallback
-            pass
+        if not skills:
+            try:
+                resume_data = self.parse_and_save_resume(resume_text)
+                skills = resume_data.get('skills', []) if isinstance(resume_data, dict) else []
+            except Exception:
+                # If AI parsing fails, deterministic fallback
+                pass
 
         # Deterministic fallback skill extraction if resume parsing failed
         if not skills:
-            text = (resume_text + ' ' + self.job_description + ' ' + self.role_title).lower()
-            common_skills = [
-                'python','django','flask','fastapi','javascript','typescript','react','vue','angular',
-                'node','express','postgres','mysql','sqlite','mongodb','redis','docker','kubernetes',
-                'aws','azure','gcp','git','linux','rest','graphql','pytest','unittest','pandas','numpy',
-                'ml','machine learning','nlp','data engineering','devops','terraform','ansible'
-            ]
-            detected = []
-            for s in common_skills:
-                if s in text:
-                    detected.append(s)
-            skills = list(dict.fromkeys(detected))[:10]
+            skills = detect_skills(resume_text + ' ' + self.job_description + ' ' + self.role_title)
 
         try:
             # Use new direct context-based generation
-            questions_data = ai_service.generate_questions_from_context(
+            questions_data = ai.generate_questions_from_context(
                 job_description=self.job_description,
                 role=self.role_title,
                 resume_text=resume_text,
@@ -167,21 +260,29 @@ class InterviewSession(models.Model):
         except Exception as e:
             logger.error(f"Error generating questions with context: {e}")
             # If question generation fails, use default questions
+            record_fallback("default_questions")
             questions_data = self._get_default_questions()
 
-        created_questions: List[Question] = []
-        for q_data in questions_data:
-            question = Question.objects.create(
-                session=self,
-                question_text=q_data.get('question_text', 'Question'),
-                question_type=q_data.get('question_type', 'technical'),
-                order=int(q_data.get('order', 0)),
-            )
-            created_questions.append(question)
+        # Near-duplicates (within the set or of the user's recent questions) are
+        # swapped for unused default questions instead of regenerating
+        questions_data = self.deduplicate_questions(questions_data)
 
-        if created_questions:
-            self.status = 'in_progress'
-            self.save(update_fields=['status'])
+        created_questions: List[Question] = []
+        # Single write transaction: the LLM work above stays outside the lock
+        with transaction.atomic():
+            for q_data in questions_data:
+                question = Question.objects.create(
+                    session=self,
+                    question_text=q_data.get('question_text', 'Question'),
+                    question_type=q_data.get('question_type', 'technical'),
+                    order=int(q_data.get('order', 0)),
+                    rubric=normalize_rubric(q_data.get('rubric')),
+                )
+                created_questions.append(question)
+
+            if created_questions:
+                self.status = 'in_progress'
+                self.save(update_fields=['status'])
 
         return created_questions
 
@@ -190,14 +291,18 @@ class InterviewSession(models.Model):
         answered_ids = Answer.objects.filter(question__session=self).values_list('question_id', flat=True)
         return self.questions.exclude(id__in=answered_ids).order_by('order').first()
 
+    @timed("model")
     def calculate_overall_score(self) -> float:
         """Calculate average score from all answers and mark completed"""
-        answers = Answer.objects.filter(question__session=self)
-        if answers.exists():
-            self.overall_score = sum(a.ai_score for a in answers) / answers.count()
-            self.status = 'completed'
-            self.completed_at = timezone.now()
-            self.save(update_fields=['overall_score', 'status', 'completed_at'])
+        # Read-then-write: run it as one transaction so SQLite takes the write
+        # lock up front (IMMEDIATE mode) instead of failing on lock upgrade
+        with transaction.atomic():
+            answers = Answer.objects.filter(question__session=self)
+            if answers.exists():
+                self.overall_score = sum(a.ai_score for a in answers) / answers.count()
+                self.status = 'completed'
+                self.completed_at = timezone.now()
+                self.save(update_fields=['overall_score', 'status', 'completed_at'])
         return float(self.overall_score)
 
 
@@ -211,19 +316,40 @@ class Question(models.Model):
     question_text = models.TextField()
     question_type = models.CharField(max_length=20, choices=TYPE_CHOICES)
     order = models.IntegerField(default=0)
+    # {"key_points": [...], "topics": [...]} generated with the question (see services.rubrics)
+    rubric = models.JSONField(default=dict, blank=True)
 
     def __str__(self):
         return self.question_text[:50]
 
 
 class Answer(models.Model):
+    SCORE_SOURCES = [
+        ('local', 'Local (provisional)'),
+        ('llm', 'LLM'),
+        ('cache', 'LLM (cached for a similar answer)'),
+    ]
+
     question = models.OneToOneField(Question, on_delete=models.CASCADE, related_name='answer')
     user_response = models.TextField()
     is_voice = models.BooleanField(default=False)
     ai_score = models.IntegerField(default=0)
+    # ai_score comes from the local scorer until the LLM evaluation replaces it
+    score_source = models.CharField(max_length=10, choices=SCORE_SOURCES, default='llm')
+    provisional_score = models.IntegerField(null=True, blank=True)
     ai_feedback = models.TextField()
     topics_to_cover = models.TextField(blank=True)
     answered_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return f"Answer for {self.question_id}"
+
+
+@receiver(post_delete, sender=ResumeUpload)
+@receiver(post_delete, sender=InterviewSession)
+def release_resume_blob(sender, instance, **kwargs):
+    """Drop the deleted row's blob reference (cascades included)."""
+    blob_id = instance.blob_id if sender is ResumeUpload else instance.resume_blob_id
+    if blob_id is not None:
+        from interviews.services.resume_blobs import release
+        release(blob_id)
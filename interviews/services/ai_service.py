@@ -1,17 +1,90 @@
 """
 AI Service - Provider-agnostic AI interface supporting Groq and Ollama
+
+The provider client is built on first use and only the configured backend
+(``langchain_groq`` or ``langchain_ollama``) is imported, so management
+commands and the test runner never pay for either.
 """
 import os
-import json
 import re
-from typing import Dict, Any, Optional, Union, List
-from langchain_groq import ChatGroq
-from langchain_ollama import ChatOllama
-from langchain_core.messages import HumanMessage, SystemMessage
+import time
+from functools import cached_property
+from typing import Dict, Any, Optional, Union, List, Tuple
+from django.utils.functional import SimpleLazyObject
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 import logging
 
+from core import metrics
+from core.timing import timed
+from interviews.services.cassette import cassette_from_env
+from interviews.services.context_builder import (
+    budget_for,
+    build_generation_context,
+    build_keywords,
+    estimate_tokens,
+    pack,
+)
+from interviews.services.evaluation_context import EvaluationContext
+from interviews.services.generation_profiles import (
+    CONTINUE_PROMPT,
+    GenerationProfile,
+    get_profile,
+    is_truncated,
+)
+from interviews.services.http_client import (
+    get_http_client,
+    get_timeout,
+    groq_http_client,
+    ollama_client_kwargs,
+)
+from interviews.services.json_parser import (
+    IncrementalJSONParser,
+    parse_json_lenient,
+    parse_stats,
+)
+from interviews.services.ollama_residency import OllamaResidency
+from interviews.services.rubrics import format_rubric, normalize_rubric, topics_to_cover
+
 logger = logging.getLogger(__name__)
 
+# Generated questions carry their rubric (see ``rubrics``); 5 of each type
+QUESTION_SHAPE = (
+    '{"technical": [{"q": "question", "points": ["key point"], "topics": ["topic"]}, ...], '
+    '"behavioral": [{"q": "question", "points": ["key point"], "topics": ["topic"]}, ...]}'
+)
+
+
+def _add_usage(usage: Dict[str, int], metadata: Optional[Dict[str, Any]]) -> None:
+    """Accumulate LangChain ``usage_metadata`` token counts into ``usage``."""
+    for key in ("input_tokens", "output_tokens", "total_tokens"):
+        value = (metadata or {}).get(key)
+        if isinstance(value, int):
+            usage[key] = usage.get(key, 0) + value
+
+
+def _add_prompt_eval(usage: Dict[str, Any], response_metadata: Optional[Dict[str, Any]]) -> None:
+    """Accumulate Ollama's prompt-processing time (reported in ns) into ``usage``."""
+    duration = (response_metadata or {}).get("prompt_eval_duration")
+    if isinstance(duration, (int, float)):
+        usage["prompt_eval_seconds"] = usage.get("prompt_eval_seconds", 0.0) + duration / 1e9
+
+
+def _estimate_usage(
+    usage: Dict[str, Any], messages: List[Any], text: str, first_chunk_seconds: Optional[float]
+) -> None:
+    """Fill in usage for a stream closed before its final chunk arrived.
+
+    Token counts come from ``estimate_tokens`` and the prompt-eval time is
+    approximated by the time to the first chunk.
+    """
+    if "input_tokens" not in usage:
+        prompt = sum(estimate_tokens(m.content) for m in messages if isinstance(m.content, str))
+        usage["input_tokens"] = prompt
+        usage["output_tokens"] = estimate_tokens(text)
+        usage["total_tokens"] = prompt + usage["output_tokens"]
+    if "prompt_eval_seconds" not in usage and first_chunk_seconds is not None:
+        usage["prompt_eval_seconds"] = first_chunk_seconds
+
 
 class AIService:
     """
@@ -21,77 +94,247 @@ class AIService:
 
     def __init__(self):
         self.provider = os.getenv("AI_PROVIDER", "groq").lower()
+        self.ollama_host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+        # Construction defaults; each task overrides them via its generation profile
         self.temperature = 0.5
         self.max_tokens = 256
-
+        # Ask the provider for JSON natively (Groq json_object / Ollama format=json)
+        self.json_mode = os.getenv("AI_JSON_MODE", "True").lower() in ("1", "true", "yes")
+        # Stream responses and stop reading once the JSON object is closed
+        self.stream_early_stop = os.getenv("AI_STREAM_EARLY_STOP", "True").lower() in ("1", "true", "yes")
+        # Optional record/replay of every LLM exchange (AI_CASSETTE_MODE)
+        self.cassette = cassette_from_env()
+        self.model_name = os.getenv("OLLAMA_MODEL", "mistral")
+
+        # Read now so the lazily built client sees the configuration at construction time
+        self.groq_api_key = os.getenv("GROQ_API_KEY")
+        self.groq_api_base = os.getenv("GROQ_API_BASE")
         if self.provider == "groq":
-            api_key = os.getenv("GROQ_API_KEY")
-            if not api_key:
+            if not self.groq_api_key:
                 logger.warning("GROQ_API_KEY not set. Falling back to Ollama.")
                 self.provider = "ollama"
             else:
-                self.llm = ChatGroq(
-                    api_key=api_key,
-                    model=os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile"),
-                    temperature=self.temperature,
-                    max_tokens=self.max_tokens,
-                    timeout=90,  # Allow up to 90 seconds
-                )
-                logger.info(f"Initialized ChatGroq with model: {os.getenv('GROQ_MODEL')}")
+                self.model_name = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+        # Keeps the Ollama model loaded and re-warms it after eviction
+        self.residency = OllamaResidency(self.ollama_host, self.model_name) if self.provider == "ollama" else None
 
-        if self.provider == "ollama":
-            self.llm = ChatOllama(
-                base_url=os.getenv("OLLAMA_HOST", "http://localhost:11434"),
-                model=os.getenv("OLLAMA_MODEL", "mistral"),
+    @cached_property
+    def llm(self):
+        """Provider chat model, constructed (and its package imported) on first use."""
+        if self.provider == "groq":
+            from langchain_groq import ChatGroq
+
+            llm = ChatGroq(
+                api_key=self.groq_api_key,
+                base_url=self.groq_api_base,
+                model=self.model_name,
                 temperature=self.temperature,
-                num_predict=256,
-            )
-            logger.info(
-                f"Initialized ChatOllama with model: {os.getenv('OLLAMA_MODEL')}"
+                max_tokens=self.max_tokens,
+                timeout=get_timeout(),  # Allow up to 90 seconds to read
+                http_client=groq_http_client(),
             )
+            logger.info(f"Initialized ChatGroq with model: {self.model_name}")
+            return llm
+
+        from langchain_ollama import ChatOllama
+
+        llm = ChatOllama(
+            base_url=self.ollama_host,
+            model=self.model_name,
+            temperature=self.temperature,
+            num_predict=self.max_tokens,
+            num_ctx=self.residency.num_ctx,
+            keep_alive=self.residency.keep_alive,
+            **ollama_client_kwargs(),
+        )
+        logger.info(f"Initialized ChatOllama with model: {self.model_name}")
+        return llm
+
+    def preload(self) -> None:
+        """Import the provider package without building a client (pre-fork warm-up)."""
+        if self.provider == "groq":
+            import langchain_groq  # noqa: F401
+        else:
+            import langchain_ollama  # noqa: F401
 
+    def reset_client(self) -> None:
+        """Drop the constructed client so the next call builds a fresh one."""
+        self.__dict__.pop("llm", None)
+
+    @property
+    def reuses_prompt_prefix(self) -> bool:
+        """Ollama reuses the KV cache for a repeated prompt prefix; Groq does not."""
+        return self.provider == "ollama"
+
+    @timed("ai_probe")
     def is_available(self) -> bool:
         """Check if AI service is available and responding."""
+        if self.cassette is not None and self.cassette.replaying:
+            return True
         try:
             if self.provider == "groq":
                 # Quick test call to Groq
                 response = self.llm.invoke([HumanMessage(content="hi")])
                 return bool(response and response.content)
             else:  # ollama
-                # Test Ollama health endpoint
-                import requests
-
-                resp = requests.get(
-                    f"{os.getenv('OLLAMA_HOST', 'http://localhost:11434')}/api/tags",
-                    timeout=5,
-                )
+                # Test Ollama health endpoint over the shared pool
+                resp = get_http_client().get(f"{self.ollama_host}/api/tags", timeout=5)
                 return resp.status_code == 200
         except Exception as e:
             logger.error(f"AI service availability check failed: {e}")
             return False
 
-    def _extract_json_from_text(self, text: str) -> Optional[Dict[str, Any]]:
-        """Extract and parse JSON from text response."""
-        if not text:
-            return None
+    def _bound_llm(self, profile: GenerationProfile, json_mode: bool):
+        """Return the LLM bound to ``profile``'s limits and, optionally, the
+        provider's native JSON output mode."""
+        if self.provider == "groq":
+            params: Dict[str, Any] = {
+                "max_tokens": profile.max_tokens,
+                "temperature": profile.temperature,
+            }
+            # Groq's JSON mode rejects stop sequences (and streaming, see ``_streams``)
+            if profile.stop and not json_mode:
+                params["stop"] = list(profile.stop)
+            if json_mode:
+                params["response_format"] = {"type": "json_object"}
+        else:
+            # Ollama replaces the whole options dict when one is passed; num_ctx
+            # stays constant across tasks so the model runner is never reloaded
+            options: Dict[str, Any] = {
+                "num_predict": profile.max_tokens,
+                "temperature": profile.temperature,
+                "num_ctx": self.residency.num_ctx,
+            }
+            if profile.stop:
+                options["stop"] = list(profile.stop)
+            params = {"options": options}
+            if json_mode:
+                params["format"] = "json"
+        return self.llm.bind(**params)
+
+    def _streams(self, json_mode: bool) -> bool:
+        """Whether a call is streamed; never for Groq in JSON mode."""
+        return self.stream_early_stop and not (json_mode and self.provider == "groq")
+
+    @timed("llm")
+    def _invoke(self, task: str, messages: List[Any]) -> str:
+        """Run one JSON-producing LLM call for ``task`` and return the raw text.
+
+        With a cassette configured the exchange is either recorded after the
+        live call or served from the recording without touching the provider.
+        """
+        if self.cassette is not None and self.cassette.replaying:
+            return self.cassette.replay(task, messages)["response"]
+
+        usage: Dict[str, int] = {}
+        started = time.perf_counter()
+        with metrics.track_llm_call(self.provider, task):
+            text = self._call_llm(task, messages, usage)
+        metrics.record_tokens(self.provider, task, usage)
+        metrics.record_prompt_eval(self.provider, task, usage)
+        if self.cassette is not None:
+            self.cassette.record(
+                task, self.provider, self.model_name, messages, text,
+                latency=time.perf_counter() - started, usage=usage,
+            )
+        return text
 
-        # Try to find JSON object
-        obj_start = text.find("{")
-        obj_end = text.rfind("}")
+    def _call_llm(self, task: str, messages: List[Any], usage: Dict[str, int]) -> str:
+        """Live provider call(s) for ``task``; token usage is added to ``usage``.
 
-        if obj_start != -1 and obj_end != -1 and obj_end > obj_start:
-            json_str = text[obj_start : obj_end + 1]
-            # Clean up common issues
-            json_str = re.sub(r",\s*([}\]])", r"\1", json_str)
-            try:
-                return json.loads(json_str)
-            except json.JSONDecodeError:
-                pass
+        Uses the task's generation profile. If the provider cuts the output off
+        at the token limit, the partial reply is sent back with a continuation
+        prompt (JSON mode off, since the rest is not a standalone object) up to
+        ``profile.max_continuations`` times and the pieces are concatenated.
+        """
+        profile = get_profile(task)
+        if self.residency is not None:
+            self.residency.ensure_warm()
+        parser = IncrementalJSONParser()
+        text, truncated = self._generate(
+            self._bound_llm(profile, self.json_mode), messages, parser, usage, self._streams(self.json_mode))
+
+        continuations = 0
+        while truncated and not parser.complete and continuations < profile.max_continuations:
+            continuations += 1
+            logger.info(f"{task} output truncated at {profile.max_tokens} tokens; continuing ({continuations})")
+            follow_up = list(messages) + [AIMessage(content=text), HumanMessage(content=CONTINUE_PROMPT)]
+            more, truncated = self._generate(
+                self._bound_llm(profile, json_mode=False), follow_up, parser, usage, self._streams(False))
+            text += more
+        return text
+
+    def _generate(
+        self, llm, messages: List[Any], parser: IncrementalJSONParser, usage: Dict[str, int], stream: bool
+    ) -> Tuple[str, bool]:
+        """Single provider round-trip; returns ``(text, truncated)``.
+
+        When ``stream`` is set the response is fed through the incremental
+        JSON parser and the stream is closed as soon as the top-level object
+        is complete, so trailing chatter/whitespace is never generated. Usage
+        normally arrives on the final chunk; for a stream closed early it is
+        estimated from the text received (see ``_estimate_usage``).
+        """
+        if not stream:
+            response = llm.invoke(messages)
+            parser.feed(response.content)
+            _add_usage(usage, response.usage_metadata)
+            _add_prompt_eval(usage, response.response_metadata)
+            return response.content, is_truncated(response.response_metadata)
+
+        parts: List[str] = []
+        metadata: Dict[str, Any] = {}
+        received: Dict[str, Any] = {}
+        first_chunk: Optional[float] = None
+        complete = False
+        started = time.perf_counter()
+        stream = llm.stream(messages)
+        try:
+            for chunk in stream:
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - started
+                metadata.update(chunk.response_metadata or {})
+                _add_usage(received, chunk.usage_metadata)
+                text = chunk.content if isinstance(chunk.content, str) else ""
+                parts.append(text)
+                if parser.feed(text):
+                    complete = True
+                    break
+        finally:
+            stream.close()
+        text = "".join(parts)
+        _add_prompt_eval(received, metadata)
+        if complete:
+            _estimate_usage(received, messages, text, first_chunk)
+        for key, value in received.items():
+            usage[key] = usage.get(key, 0) + value
+        return text, not complete and is_truncated(metadata)
+
+    def _parse_json(self, task: str, text: str) -> Optional[Dict[str, Any]]:
+        """Leniently parse the model output for ``task`` and record the outcome."""
+        data, repaired = parse_json_lenient(text)
+        if not isinstance(data, dict):
+            parse_stats.record(task, "failed")
+            metrics.JSON_PARSE.labels(task=task, outcome="failed").inc()
+            logger.warning(f"Unparseable JSON from LLM for {task}: {(text or '')[:200]!r}")
+            return None
+        outcome = "repaired" if repaired else "ok"
+        parse_stats.record(task, outcome)
+        metrics.JSON_PARSE.labels(task=task, outcome=outcome).inc()
+        return data
 
-        return None
+    def _extract_json_from_text(self, text: str) -> Optional[Dict[str, Any]]:
+        """Extract and parse JSON from text response."""
+        data, _ = parse_json_lenient(text)
+        return data if isinstance(data, dict) else None
 
     def evaluate_answer(
-        self, question: str, answer: str, role: str
+        self,
+        question: str,
+        answer: str,
+        role: str,
+        context: Optional[EvaluationContext] = None,
+        rubric: Optional[Dict[str, List[str]]] = None,
     ) -> Dict[str, Any]:
         """
         Evaluate an interview answer and return score, feedback, and topics.
@@ -100,30 +343,62 @@ class AIService:
             question: The interview question
             answer: The candidate's answer
             role: The role being interviewed for
+            context: Session prefix (role + job summary) shared by all of the
+                session's evaluations; used where the provider reuses prompt prefixes
+            rubric: The question's rubric (see ``rubrics``); the model then only
+                grades against it and topics_to_cover is computed locally
 
         Returns:
-            Dict with keys: score (0-10), feedback (str), topics_to_cover (str)
+            Dict with keys: score (0-10), feedback (str), topics_to_cover (str),
+            source ("llm", or "local" when the local scorer stood in)
         """
-        # Simplified prompt for faster generation
-        prompt = f"""Evaluate this interview answer. Return ONLY JSON:
-{{"score": 7, "feedback": "Brief feedback", "topics_to_cover": ["topic1"]}}
+        # Keep the answer sentences that actually address the question
+        original_question, original_answer = question, answer
+        keywords = build_keywords(role, extra=question)
+        question = pack(question, budget_for("evaluate_answer", "question"), keywords)
+        answer = pack(answer, budget_for("evaluate_answer", "answer"), keywords)
+        rubric_line = format_rubric(rubric)
+
+        if context is not None and self.reuses_prompt_prefix:
+            # Identical leading system message for the whole session; only Q/A varies
+            turn = f"Q: {question}\nA: {answer}"
+            messages = [
+                SystemMessage(content=context.system_prompt),
+                HumanMessage(content=f"Rubric: {rubric_line}\n{turn}" if rubric_line else turn),
+            ]
+        elif rubric_line:
+            # The rubric says what a good answer contains; only score + feedback come back
+            prompt = f"""Evaluate this interview answer against the rubric. Return ONLY JSON:
+{{"score": 7, "feedback": "One sentence"}}
 
 Role: {role}
+Rubric: {rubric_line}
 Q: {question}
 A: {answer}"""
+            messages = [
+                SystemMessage(
+                    content="You are an expert interviewer. Return only valid JSON, no extra text."
+                ),
+                HumanMessage(content=prompt),
+            ]
+        else:
+            # Simplified prompt for faster generation
+            prompt = f"""Evaluate this interview answer. Return ONLY JSON:
+{{"score": 7, "feedback": "Brief feedback", "topics_to_cover": ["topic1"]}}
 
-        try:
+Role: {role}
+Q: {question}
+A: {answer}"""
             messages = [
                 SystemMessage(
                     content="You are an expert interviewer. Return only valid JSON, no extra text."
                 ),
                 HumanMessage(content=prompt),
             ]
-            response = self.llm.invoke(messages)
-            response_text = response.content
 
-            # Extract JSON from response
-            data = self._extract_json_from_text(response_text)
+        try:
+            response_text = self._invoke("evaluate_answer", messages)
+            data = self._parse_json("evaluate_answer", response_text)
 
             if isinstance(data, dict):
                 # Normalize score
@@ -136,7 +411,10 @@ A: {answer}"""
                 feedback = str(data.get("feedback", "Good effort. Keep practicing."))
                 topics = data.get("topics_to_cover", [])
 
-                if isinstance(topics, list):
+                local_topics = topics_to_cover(rubric, original_answer)
+                if local_topics is not None:
+                    topics_str = local_topics
+                elif isinstance(topics, list):
                     topics_str = ", ".join(str(t) for t in topics)
                 elif isinstance(topics, str):
                     topics_str = topics
@@ -147,16 +425,17 @@ A: {answer}"""
                     "score": score,
                     "feedback": feedback,
                     "topics_to_cover": topics_str,
+                    "source": "llm",
                 }
         except Exception as e:
             logger.error(f"Error evaluating answer: {e}")
 
-        # Fallback response if evaluation fails
-        return {
-            "score": 6,
-            "feedback": "Recorded your answer. Try again for evaluation.",
-            "topics_to_cover": "Continue with the next question.",
-        }
+        # Fallback if evaluation fails: local provisional score instead of a fixed one
+        metrics.record_fallback("local_score")
+        from interviews.services.local_scorer import score_answer
+
+        local = score_answer(original_question, original_answer, role=role, rubric=rubric)
+        return {**local.as_evaluation(), "source": "local"}
 
     def generate_questions(
         self, job_description: str, role: str, skills: List[str]
@@ -170,17 +449,23 @@ A: {answer}"""
             skills: List of candidate skills
 
         Returns:
-            List of dicts with keys: question_text, question_type, order
+            List of dicts with keys: question_text, question_type, order, rubric
         """
         skills_str = ", ".join(skills[:5]) if skills else "general"
-        job_desc_short = job_description[:300] if job_description else ""
+        job_desc_short = pack(
+            job_description,
+            budget_for("generate_questions", "job_description"),
+            build_keywords(role, skills),
+        )
 
-        prompt = f"""Generate 10 interview questions as JSON (ONLY JSON):
-{{"technical": ["q1","q2","q3","q4","q5"], "behavioral": ["q1","q2","q3","q4","q5"]}}
+        prompt = f"""Generate 10 interview questions as JSON (ONLY JSON), each with a short rubric:
+{QUESTION_SHAPE}
 
 Role: {role}
 Skills: {skills_str}
-Job: {job_desc_short}"""
+Job: {job_desc_short}
+
+Rubric: "points" are 2-4 key points a strong answer makes, "topics" 1-3 expected topics; a few words each."""
 
         try:
             messages = [
@@ -189,43 +474,17 @@ Job: {job_desc_short}"""
                 ),
                 HumanMessage(content=prompt),
             ]
-            response = self.llm.invoke(messages)
-            response_text = response.content
-
-            # Extract JSON from response
-            data = self._extract_json_from_text(response_text)
+            response_text = self._invoke("generate_questions", messages)
+            data = self._parse_json("generate_questions", response_text)
 
-            if isinstance(data, dict):
-                technical = data.get("technical", [])
-                behavioral = data.get("behavioral", [])
-
-                if isinstance(technical, list) and isinstance(behavioral, list):
-                    if len(technical) >= 5 and len(behavioral) >= 5:
-                        questions = []
-                        order = 1
-                        for q in technical[:5]:
-                            questions.append(
-                                {
-                                    "question_text": str(q),
-                                    "question_type": "technical",
-                                    "order": order,
-                                }
-                            )
-                            order += 1
-                        for q in behavioral[:5]:
-                            questions.append(
-                                {
-                                    "question_text": str(q),
-                                    "question_type": "behavioral",
-                                    "order": order,
-                                }
-                            )
-                            order += 1
-                        return questions
+            questions = self._questions_from_payload(data)
+            if questions:
+                return questions
         except Exception as e:
             logger.error(f"Error generating questions: {e}")
 
         # Return default questions if AI fails
+        metrics.record_fallback("default_questions")
         return self._get_default_questions(role)
 
     def parse_resume(self, resume_text: str) -> Dict[str, Any]:
@@ -250,7 +509,14 @@ Job: {job_desc_short}"""
         if not resume_text:
             return base
 
-        resume_short = resume_text[:400]
+        # Header (name/contact) plus the sentences that look like skills/experience
+        resume_short = pack(
+            resume_text,
+            budget_for("parse_resume", "resume"),
+            build_keywords(extra="skills experience education technologies languages frameworks"),
+            keep_head=1,
+            prefer_contact=True,
+        )
         prompt = f"""Extract resume info as JSON (ONLY JSON):
 {{"name":"","email":"","phone":"","skills":[],"experience":[],"education":[]}}
 
@@ -263,11 +529,8 @@ Resume: {resume_short}"""
                 ),
                 HumanMessage(content=prompt),
             ]
-            response = self.llm.invoke(messages)
-            response_text = response.content
-
-            # Extract JSON from response
-            data = self._extract_json_from_text(response_text)
+            response_text = self._invoke("parse_resume", messages)
+            data = self._parse_json("parse_resume", response_text)
 
             if isinstance(data, dict):
                 # Normalize skills
@@ -310,15 +573,16 @@ Resume: {resume_short}"""
             parsed_skills: Optional pre-extracted skills list
 
         Returns:
-            List of 10 questions (5 technical, 5 behavioral) with context
+            List of 10 questions (5 technical, 5 behavioral) with their rubrics
         """
-        # Limit context to avoid token overload
-        jd_context = job_description[:500] if job_description else ""
-        resume_context = resume_text[:500] if resume_text else ""
+        # Pack the most relevant JD/resume sentences into the token budget
+        context = build_generation_context(job_description, resume_text, role, parsed_skills or [])
+        jd_context = context["job_description"]
+        resume_context = context["resume"]
         skills_str = ", ".join(parsed_skills[:8]) if parsed_skills else "various technologies"
 
-        prompt = f"""Generate 10 interview questions for this candidate as pure JSON (ONLY):
-{{"technical": ["q1","q2","q3","q4","q5"], "behavioral": ["q1","q2","q3","q4","q5"]}}
+        prompt = f"""Generate 10 interview questions for this candidate as pure JSON (ONLY), each with a short rubric:
+{QUESTION_SHAPE}
 
 JOB DESCRIPTION: {jd_context}
 
@@ -332,7 +596,9 @@ Create SPECIFIC questions based on:
 1. Required skills from the job description
 2. The candidate's experience from resume
 3. The role requirements
-4. Potential gaps or skill matches"""
+4. Potential gaps or skill matches
+
+Rubric: "points" are 2-4 key points a strong answer makes, "topics" 1-3 expected topics; a few words each."""
 
         try:
             messages = [
@@ -341,45 +607,61 @@ Create SPECIFIC questions based on:
                 ),
                 HumanMessage(content=prompt),
             ]
-            response = self.llm.invoke(messages)
-            response_text = response.content
-
-            # Extract JSON from response
-            data = self._extract_json_from_text(response_text)
+            response_text = self._invoke("generate_questions_from_context", messages)
+            data = self._parse_json("generate_questions_from_context", response_text)
 
-            if isinstance(data, dict):
-                technical = data.get("technical", [])
-                behavioral = data.get("behavioral", [])
-
-                if isinstance(technical, list) and isinstance(behavioral, list):
-                    if len(technical) >= 5 and len(behavioral) >= 5:
-                        questions = []
-                        order = 1
-                        for q in technical[:5]:
-                            questions.append(
-                                {
-                                    "question_text": str(q),
-                                    "question_type": "technical",
-                                    "order": order,
-                                }
-                            )
-                            order += 1
-                        for q in behavioral[:5]:
-                            questions.append(
-                                {
-                                    "question_text": str(q),
-                                    "question_type": "behavioral",
-                                    "order": order,
-                                }
-                            )
-                            order += 1
-                        return questions
+            questions = self._questions_from_payload(data)
+            if questions:
+                return questions
         except Exception as e:
             logger.error(f"Error generating questions from context: {e}")
 
         # Return default questions if AI fails
+        metrics.record_fallback("default_questions")
         return self._get_default_questions(role)
 
+    @staticmethod
+    def _questions_from_payload(data: Any) -> Optional[List[Dict[str, Any]]]:
+        """Five technical then five behavioral questions from the model's JSON, or ``None``.
+
+        Items are ``{"q": ..., "points": [...], "topics": [...]}`` objects; plain
+        strings (older prompts, recorded cassettes) give questions without a rubric.
+        Items without question text are dropped; ``None`` if fewer than five of a
+        type remain.
+        """
+        if not isinstance(data, dict):
+            return None
+        parsed: Dict[str, List[Tuple[str, Dict[str, List[str]]]]] = {}
+        for question_type in ("technical", "behavioral"):
+            items = data.get(question_type, [])
+            if not isinstance(items, list):
+                return None
+            valid = []
+            for item in items:
+                if isinstance(item, dict):
+                    text = item.get("q") or item.get("question") or item.get("question_text") or ""
+                    rubric = normalize_rubric(item)
+                else:
+                    text, rubric = item, {}
+                text = str(text).strip() if text is not None else ""
+                if text:
+                    valid.append((text, rubric))
+            if len(valid) < 5:
+                return None
+            parsed[question_type] = valid[:5]
+        questions = []
+        items = [("technical", q) for q in parsed["technical"]] + [("behavioral", q) for q in parsed["behavioral"]]
+        for order, (question_type, (text, rubric)) in enumerate(items, start=1):
+            questions.append(
+                {
+                    "question_text": text,
+                    "question_type": question_type,
+                    "order": order,
+                    "rubric": rubric,
+                }
+            )
+        return questions
+
     @staticmethod
     def _get_default_questions(role: str) -> List[Dict[str, Any]]:
         """Return default questions when AI fails."""
@@ -438,5 +720,5 @@ Create SPECIFIC questions based on:
         return questions
 
 
-# Global singleton instance
-ai_service = AIService()
+# Global singleton instance, constructed on first attribute access
+ai_service = SimpleLazyObject(AIService)
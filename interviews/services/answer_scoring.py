@@ -0,0 +1,175 @@
+"""
+Answer scoring: instant local score, LLM refinement
+
+``submit_answer`` stores the local provisional score (``local_scorer``) and
+responds at once. How the LLM evaluation fits in depends on
+``EVALUATION_MODE``:
+
+    async   LLM evaluation runs on a background thread after commit and
+            replaces the provisional score when it arrives (default)
+    sync    wait for the LLM evaluation as before; the local score is only
+            the fallback when the AI service is unavailable or fails
+    local   never call the LLM
+
+In every mode, an answer close enough to one the LLM already evaluated for
+the same question and role takes that evaluation from the semantic cache
+(``evaluation_cache``, score source ``cache``) without any LLM call.
+
+Under load (more than ``EVALUATION_MAX_PENDING`` refinements queued in this
+process) new answers keep their local score instead of queueing more LLM
+work. The room page polls ``answer_status`` to pick up refined scores.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from core.metrics import record_fallback
+from interviews.services.evaluation_cache import get_cache
+from interviews.services.local_scorer import LocalScore, score_answer
+from interviews.services.resume_text import detect_skills
+from interviews.services.rubrics import topics_to_cover
+
+logger = logging.getLogger(__name__)
+
+EVALUATION_MODES = ('async', 'sync', 'local')
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+def evaluation_mode() -> str:
+    mode = settings.EVALUATION_MODE
+    return mode if mode in EVALUATION_MODES else 'async'
+
+
+def session_skills(session) -> list:
+    """Skills from the processed resume upload, else those named in the job description (never waits)."""
+    upload = session.resume_upload if session.resume_upload_id else None
+    if upload is not None and upload.status == 'ready' and upload.skills:
+        return list(upload.skills)
+    return detect_skills(session.job_description)
+
+
+def provisional_score(question, answer_text: str, skills: Optional[Iterable[str]] = None) -> LocalScore:
+    """Local score for an answer to ``question`` in the context of its session."""
+    session = question.session
+    return score_answer(
+        question.question_text, answer_text, session.job_description,
+        session_skills(session) if skills is None else skills,
+        question.question_type, session.role_title, question.rubric,
+    )
+
+
+def cached_evaluation(question, answer_text: str) -> Optional[Dict[str, Any]]:
+    """LLM evaluation of a near-identical earlier answer to ``question``, if cached."""
+    hit = get_cache().get(question.question_text, question.session.role_title, answer_text)
+    if hit is None:
+        return None
+    evaluation, _ = hit
+    # Topics are about this answer, not the cached one
+    topics = topics_to_cover(question.rubric, answer_text)
+    if topics is not None:
+        evaluation['topics_to_cover'] = topics
+    return evaluation
+
+
+def remember_evaluation(question, answer_text: str, evaluation: Dict[str, Any]) -> None:
+    """Cache an LLM evaluation (local fallbacks are not cached)."""
+    if evaluation.get('source') == 'llm':
+        get_cache().put(question.question_text, question.session.role_title, answer_text,
+                        {key: evaluation[key] for key in ('score', 'feedback', 'topics_to_cover')})
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.EVALUATION_WORKERS), thread_name_prefix='answer-eval'
+            )
+        return _executor
+
+
+def refine_answer(answer_id: int) -> bool:
+    """Replace a provisional score with the LLM evaluation; ``False`` if it kept the local score."""
+    from interviews.models import Answer
+    from interviews.services.ai_service import ai_service
+    from interviews.services.evaluation_context import context_for_session
+
+    answer = Answer.objects.select_related('question__session').filter(pk=answer_id, score_source='local').first()
+    if answer is None:
+        return False
+    question = answer.question
+    session = question.session
+    # A similar answer may have been evaluated since this one was submitted
+    evaluation, source = cached_evaluation(question, answer.user_response), 'cache'
+    if evaluation is None:
+        evaluation, source = ai_service.evaluate_answer(
+            question.question_text, answer.user_response, session.role_title,
+            context=context_for_session(session), rubric=question.rubric,
+        ), 'llm'
+        if evaluation.get('source') != 'llm':
+            return False
+        remember_evaluation(question, answer.user_response, evaluation)
+    updated = Answer.objects.filter(pk=answer_id, score_source='local').update(
+        ai_score=evaluation['score'],
+        ai_feedback=evaluation['feedback'],
+        topics_to_cover=evaluation['topics_to_cover'],
+        score_source=source,
+    )
+    if updated:
+        session.refresh_from_db(fields=['status'])
+        if session.status == 'completed':
+            # The overall score was computed from provisional scores
+            session.calculate_overall_score()
+    return bool(updated)
+
+
+def _run_in_background(answer_id: int) -> None:
+    global _pending
+    try:
+        refine_answer(answer_id)
+    except Exception as e:
+        logger.error(f"Refining answer {answer_id} failed: {e}")
+    finally:
+        with _pending_lock:
+            _pending -= 1
+        close_old_connections()
+
+
+def _submit_after_commit(answer_id: int) -> None:
+    # Counted only once the answer is committed: a rolled-back transaction
+    # never runs this, so it cannot leave _pending raised
+    global _pending
+    with _pending_lock:
+        _pending += 1
+    try:
+        _get_executor().submit(_run_in_background, answer_id)
+    except Exception:
+        with _pending_lock:
+            _pending -= 1
+        raise
+
+
+def schedule_refinement(answer) -> str:
+    """Queue the LLM evaluation of ``answer`` after commit.
+
+    Returns ``'queued'``, ``'shed'`` (too much pending work; the local score
+    stays) or ``'done'`` when EVALUATION_WORKERS is 0 and it ran inline
+    (tests, single-threaded setups).
+    """
+    if settings.EVALUATION_WORKERS <= 0:
+        transaction.on_commit(lambda: refine_answer(answer.pk))
+        return 'done'
+    with _pending_lock:
+        if _pending >= settings.EVALUATION_MAX_PENDING:
+            record_fallback('evaluation_shed')
+            return 'shed'
+    transaction.on_commit(lambda: _submit_after_commit(answer.pk))
+    return 'queued'
@@ -0,0 +1,154 @@
+"""
+Record/replay cassettes for AIService LLM exchanges
+
+In ``record`` mode every LLM call is appended as one JSON line (prompt
+messages, provider, model, task, response text, token usage, latency). In
+``replay`` mode those responses are served back without touching a provider,
+keyed by task + prompt, with the original, scaled or no latency. Captured
+production traffic can then drive deterministic benchmarks and regression
+tests of the JSON parsing and scoring paths.
+
+Configured through AIService env vars:
+    AI_CASSETTE_MODE=record|replay   (unset = off)
+    AI_CASSETTE_PATH=cassettes/ai.jsonl
+    AI_CASSETTE_TIMING=original|none|<scale factor, e.g. 0.1>
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import logging
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when no recorded exchange matches the prompt."""
+
+
+def serialize_messages(messages: List[Any]) -> List[Dict[str, str]]:
+    """LangChain messages -> ``[{"role", "content"}]``."""
+    out = []
+    for m in messages:
+        role = getattr(m, "type", None) or m.__class__.__name__.lower()
+        content = m.content if isinstance(m.content, str) else json.dumps(m.content)
+        out.append({"role": role, "content": content})
+    return out
+
+
+def exchange_key(task: str, messages: List[Dict[str, str]]) -> str:
+    payload = json.dumps([task, messages], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class Cassette:
+    """Append-only JSONL recorder / replayer for LLM exchanges."""
+
+    def __init__(self, path: str, mode: str = "record", timing: str = "original"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.timing = timing
+        self._lock = threading.Lock()
+        self._index: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        if mode == "replay":
+            self._load()
+        else:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    # ------------------------ recording ------------------------
+    def record(
+        self,
+        task: str,
+        provider: str,
+        model: str,
+        messages: List[Any],
+        response: str,
+        latency: float,
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        serialized = serialize_messages(messages)
+        entry = {
+            "v": CASSETTE_VERSION,
+            "key": exchange_key(task, serialized),
+            "ts": round(time.time(), 3),
+            "task": task,
+            "provider": provider,
+            "model": model,
+            "messages": serialized,
+            "response": response,
+            "usage": usage or {},
+            "latency_ms": round(latency * 1000, 1),
+        }
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        # One write per line on an O_APPEND handle keeps concurrent workers' lines intact
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    # ------------------------ replay ------------------------
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            logger.warning(f"Cassette {self.path} does not exist; every replay will miss")
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt cassette line {line_no} in {self.path}")
+                    continue
+                self._index[entry["key"]].append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._index.values())
+
+    def delay_for(self, entry: Dict[str, Any]) -> float:
+        if self.timing == "none":
+            return 0.0
+        seconds = float(entry.get("latency_ms", 0)) / 1000.0
+        if self.timing == "original":
+            return seconds
+        try:
+            return seconds * float(self.timing)
+        except ValueError:
+            return seconds
+
+    def replay(self, task: str, messages: List[Any]) -> Dict[str, Any]:
+        """Return the next recorded exchange for this prompt, sleeping per ``timing``.
+
+        Identical prompts recorded several times are served in recorded order
+        and then cycled, so repeated calls stay deterministic.
+        """
+        key = exchange_key(task, serialize_messages(messages))
+        with self._lock:
+            entries = self._index.get(key)
+            if not entries:
+                raise CassetteMiss(f"No recorded {task} exchange for key {key}")
+            entry = entries.popleft()
+            entries.append(entry)
+        delay = self.delay_for(entry)
+        if delay > 0:
+            time.sleep(delay)
+        return entry
+
+
+def cassette_from_env() -> Optional[Cassette]:
+    mode = os.getenv("AI_CASSETTE_MODE", "").lower()
+    if mode not in ("record", "replay"):
+        return None
+    path = os.getenv("AI_CASSETTE_PATH", os.path.join("cassettes", "ai.jsonl"))
+    return Cassette(path, mode=mode, timing=os.getenv("AI_CASSETTE_TIMING", "original"))
@@ -0,0 +1,175 @@
+"""
+Token-budgeted prompt context builder
+
+Replaces blunt ``text[:N]`` slicing of job descriptions, resumes and answers.
+Text is split into sentences, each sentence is ranked by how much it says
+about the target role and skills, and the highest-value sentences are packed
+into a per-task token budget, then re-emitted in their original order.
+"""
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+# Rough heuristic for English prose with Llama/Mistral style tokenizers
+CHARS_PER_TOKEN = 4
+MAX_SENTENCE_WORDS = 40
+
+# Token budgets per task and prompt part
+TASK_BUDGETS: Dict[str, Dict[str, int]] = {
+    "parse_resume": {"resume": 300},
+    "generate_questions": {"job_description": 120},
+    "generate_questions_from_context": {"job_description": 200, "resume": 250},
+    "evaluate_answer": {"question": 80, "answer": 350, "job_description": 150},
+}
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?;])\s+|\s*[\n\r]+\s*|\s+[•▪●◦]\s*|\s+[-*]\s+(?=[A-Z])")
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+_DIGIT = re.compile(r"\d")
+_CONTACT = re.compile(r"@|\+?\d[\d\s().-]{7,}\d|linkedin|github")
+
+_STOPWORDS: Set[str] = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in",
+    "is", "it", "of", "on", "or", "our", "that", "the", "their", "this", "to", "was",
+    "we", "were", "will", "with", "you", "your", "i", "my", "me", "role", "job",
+}
+
+# Words that frame a question rather than say what it is about
+QUESTION_WORDS = {
+    "describe", "explain", "tell", "how", "what", "why", "when", "which", "who", "would", "could",
+    "do", "does", "did", "can", "time", "about", "us", "walk", "through", "give", "example",
+    "approach", "experience", "situation", "handle", "handled", "share", "your", "you",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate; good enough for budgeting, never exact."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def budget_for(task: str, part: str, default: int = 250) -> int:
+    return TASK_BUDGETS.get(task, {}).get(part, default)
+
+
+def tokenize(text: str) -> List[str]:
+    return [w for w in _WORD.findall((text or "").lower()) if w not in _STOPWORDS]
+
+
+def stem(term: str) -> str:
+    for suffix in ("ing", "ies", "es", "ed", "s"):
+        if term.endswith(suffix) and len(term) - len(suffix) >= 4:
+            return term[:-len(suffix)]
+    return term
+
+
+def stem_terms(text: str, surface: Optional[Dict[str, str]] = None) -> List[str]:
+    """``tokenize`` plus light suffix stripping, so "queries"/"query" and "caching"/"cache" match.
+
+    ``surface`` collects the first original word seen for each stem.
+    """
+    out = []
+    for word in tokenize(text):
+        term = stem(word)
+        if surface is not None:
+            surface.setdefault(term, word)
+        out.append(term)
+    return out
+
+
+def split_sentences(text: str, max_words: int = MAX_SENTENCE_WORDS) -> List[str]:
+    """Split into sentences/bullets; run-on text (common in PDF extraction)
+    is further cut into ``max_words`` windows so it can still be ranked."""
+    if not text:
+        return []
+    out: List[str] = []
+    for sentence in _SENTENCE_SPLIT.split(text):
+        words = (sentence or "").split()
+        for start in range(0, len(words), max_words):
+            out.append(" ".join(words[start:start + max_words]))
+    return out
+
+
+def build_keywords(role: str = "", skills: Optional[Iterable[str]] = None, extra: str = "") -> Set[str]:
+    """Keyword set used for relevance ranking (role words, skills, extra text)."""
+    keywords = set(tokenize(role)) | set(tokenize(extra))
+    for skill in skills or []:
+        keywords.update(tokenize(str(skill)))
+    return keywords
+
+
+def _score_sentence(sentence: str, keywords: Set[str], position: int, total: int, contact_bonus: bool) -> float:
+    words = tokenize(sentence)
+    if not words:
+        return 0.0
+    hits = sum(1 for w in words if w in keywords)
+    unique_hits = len(keywords.intersection(words))
+    # Density over raw length so one long paragraph cannot crowd out the rest
+    score = (unique_hits * 2.0 + hits) / math.sqrt(len(words))
+    if _DIGIT.search(sentence):
+        score += 0.3  # quantified achievements, years of experience
+    if contact_bonus and _CONTACT.search(sentence):
+        score += 5.0
+    # Mild preference for earlier sentences (summary / requirements first)
+    score += 0.2 * (1 - position / max(total, 1))
+    return score
+
+
+def pack(
+    text: str,
+    budget_tokens: int,
+    keywords: Optional[Set[str]] = None,
+    keep_head: int = 0,
+    prefer_contact: bool = False,
+) -> str:
+    """Fit ``text`` into ``budget_tokens`` keeping the most relevant sentences.
+
+    Args:
+        text: Source text (JD, resume, answer)
+        budget_tokens: Maximum estimated tokens for the packed output
+        keywords: Relevance keywords (see ``build_keywords``)
+        keep_head: Number of leading sentences always kept (e.g. resume header)
+        prefer_contact: Boost sentences with emails/phones/profile links
+
+    Returns:
+        The original text if it already fits, otherwise the selected sentences
+        joined in their original order.
+    """
+    flat = " ".join((text or "").split())
+    if estimate_tokens(flat) <= budget_tokens:
+        return flat
+
+    sentences = split_sentences(text)
+    keywords = keywords or set()
+    total = len(sentences)
+    ranked = sorted(
+        range(total),
+        key=lambda i: (i >= keep_head, -_score_sentence(sentences[i], keywords, i, total, prefer_contact)),
+    )
+
+    chosen: List[int] = []
+    used = 0
+    for i in ranked:
+        cost = estimate_tokens(sentences[i]) + 1
+        if used + cost > budget_tokens:
+            continue
+        chosen.append(i)
+        used += cost
+
+    if not chosen:
+        # Budget smaller than any sentence: hard-cut the best one
+        return sentences[ranked[0]][: budget_tokens * CHARS_PER_TOKEN]
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+def build_generation_context(
+    job_description: str, resume_text: str, role: str, skills: Sequence[str]
+) -> Dict[str, str]:
+    """Packed JD and resume for ``generate_questions_from_context``."""
+    task = "generate_questions_from_context"
+    keywords = build_keywords(role, skills)
+    jd = pack(job_description, budget_for(task, "job_description"), keywords)
+    # Resume sentences that overlap the JD are the interesting ones to probe
+    resume_keywords = keywords | set(tokenize(jd))
+    resume = pack(resume_text, budget_for(task, "resume"), resume_keywords, keep_head=1)
+    return {"job_description": jd, "resume": resume}
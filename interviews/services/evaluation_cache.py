@@ -0,0 +1,175 @@
+"""
+Approximate (semantic) cache of LLM answer evaluations
+
+Candidates often give near-identical short answers to the same question,
+e.g. the default "How do you handle tight deadlines and pressure?". An
+exact-match cache misses answers that differ only in casing, punctuation,
+a filler word or a plural, so answers are embedded with a hashing vectorizer
+(stemmed unigrams and bigrams, signed feature hashing into ``DIMENSIONS``
+buckets, sublinear TF, L2-normalised; no vocabulary to fit or store) and
+looked up by cosine similarity among the cached answers to the same
+question for the same role. One NumPy matrix-vector product per lookup.
+
+A hit returns the earlier LLM evaluation; ``answer_scoring`` recomputes
+``topics_to_cover`` from the question's rubric for the new answer. Entries
+expire after ``EVALUATION_CACHE_TTL`` seconds and the least recently used
+question's oldest entries go first beyond ``EVALUATION_CACHE_MAX_ENTRIES``.
+The cache is per process.
+
+    EVALUATION_CACHE_THRESHOLD=0.9     # cosine similarity for a hit (reworded answers score ~0.7)
+    EVALUATION_CACHE_TTL=21600         # seconds
+    EVALUATION_CACHE_MAX_ENTRIES=4096  # 0 disables the cache
+"""
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from core.metrics import EVALUATION_CACHE
+from interviews.services.context_builder import stem_terms
+
+DIMENSIONS = 2048
+_SPACE = re.compile(r'\s+')
+
+
+def cache_key(question: str, role: str) -> Tuple[str, str]:
+    return _SPACE.sub(' ', (question or '').strip().lower()), _SPACE.sub(' ', (role or '').strip().lower())
+
+
+def vectorize(text: str) -> Optional[np.ndarray]:
+    """Unit-length hashed term vector of ``text``; ``None`` if it has no content terms."""
+    terms = stem_terms(text)
+    features = terms + [f'{a} {b}' for a, b in zip(terms, terms[1:])]
+    if not features:
+        return None
+    vector = np.zeros(DIMENSIONS, dtype=np.float32)
+    for feature in features:
+        h = zlib.crc32(feature.encode())
+        # The top bit picks the sign so collisions tend to cancel out
+        vector[h % DIMENSIONS] += -1.0 if h & 0x80000000 else 1.0
+    vector = np.sign(vector) * np.log1p(np.abs(vector))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else None
+
+
+class _Group:
+    """Cached answers to one (question, role): row i of ``vectors`` belongs to ``evaluations[i]``."""
+
+    def __init__(self):
+        self.vectors = np.empty((0, DIMENSIONS), dtype=np.float32)
+        self.evaluations: List[Dict[str, Any]] = []
+        self.expires: List[float] = []
+
+    def expire(self, now: float) -> int:
+        keep = [i for i, expires in enumerate(self.expires) if expires > now]
+        dropped = len(self.expires) - len(keep)
+        if dropped:
+            self.vectors = self.vectors[keep]
+            self.evaluations = [self.evaluations[i] for i in keep]
+            self.expires = [self.expires[i] for i in keep]
+        return dropped
+
+    def drop_oldest(self) -> None:
+        self.vectors = self.vectors[1:]
+        del self.evaluations[0], self.expires[0]
+
+
+class SemanticEvaluationCache:
+
+    def __init__(self, threshold: float, ttl: float, capacity: int, clock: Callable[[], float] = time.monotonic):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.capacity = capacity
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._groups: 'OrderedDict[Tuple[str, str], _Group]' = OrderedDict()
+        self._size = 0
+
+    def _expire(self, key: Tuple[str, str], group: '_Group', now: float) -> None:
+        """Drop ``group``'s expired entries, and the group itself once it is empty."""
+        self._size -= group.expire(now)
+        if not group.evaluations:
+            del self._groups[key]
+
+    def _expire_all(self, now: float) -> None:
+        for key, group in list(self._groups.items()):
+            self._expire(key, group, now)
+
+    def get(self, question: str, role: str, answer: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Cached evaluation of the most similar earlier answer and its similarity, if above the threshold."""
+        if self.capacity <= 0:
+            return None
+        vector = vectorize(answer)
+        key = cache_key(question, role)
+        with self._lock:
+            group = self._groups.get(key)
+            if group is not None:
+                self._expire(key, group, self.clock())
+            if vector is None or group is None or not group.evaluations:
+                EVALUATION_CACHE.labels(result='miss').inc()
+                return None
+            self._groups.move_to_end(key)
+            similarities = group.vectors @ vector
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < self.threshold:
+                EVALUATION_CACHE.labels(result='miss').inc()
+                return None
+            EVALUATION_CACHE.labels(result='hit').inc()
+            return dict(group.evaluations[best]), similarity
+
+    def put(self, question: str, role: str, answer: str, evaluation: Dict[str, Any]) -> None:
+        if self.capacity <= 0:
+            return
+        vector = vectorize(answer)
+        if vector is None:
+            return
+        key = cache_key(question, role)
+        with self._lock:
+            now = self.clock()
+            # Dead entries must not count against the capacity (or be evicted instead of live ones)
+            self._expire_all(now)
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = _Group()
+            self._groups.move_to_end(key)
+            group.vectors = np.vstack([group.vectors, vector[None, :]])
+            group.evaluations.append(dict(evaluation))
+            group.expires.append(now + self.ttl)
+            self._size += 1
+            while self._size > self.capacity and self._groups:
+                oldest_key, oldest = next(iter(self._groups.items()))
+                if oldest.evaluations:
+                    oldest.drop_oldest()
+                    self._size -= 1
+                if not oldest.evaluations:
+                    del self._groups[oldest_key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._groups.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+
+_cache: Optional[SemanticEvaluationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> SemanticEvaluationCache:
+    """The process-wide cache, following the current settings (entries survive a change)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SemanticEvaluationCache(0.0, 0.0, 0)
+        _cache.threshold = settings.EVALUATION_CACHE_THRESHOLD
+        _cache.ttl = settings.EVALUATION_CACHE_TTL
+        _cache.capacity = settings.EVALUATION_CACHE_MAX_ENTRIES
+        return _cache
@@ -0,0 +1,90 @@
+"""
+Session-scoped evaluation prefix
+
+All evaluations in one interview share the same system prompt, role and job
+description. ``EvaluationContext`` renders that shared part once per session
+as a byte-identical leading system message; only the question/answer turn
+differs between calls. Ollama keeps the KV cache of the last prompt in the
+loaded model runner and only evaluates the tokens after the longest common
+prefix, so from the second answer on the prefix costs (almost) nothing.
+This relies on the model staying loaded with a constant ``num_ctx`` (see
+``ollama_residency``).
+
+Providers without prefix reuse keep the original compact evaluation prompt;
+sending the job description with every call would only add input tokens.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from interviews.services.context_builder import budget_for, build_keywords, pack
+
+# Sessions whose rendered prefix is kept per process
+MAX_CONTEXTS = 256
+
+EVALUATION_SYSTEM_PROMPT = (
+    "You are an expert interviewer evaluating a candidate's answers, one at a time. "
+    "Return only valid JSON, no extra text, in this shape:\n"
+    '{{"score": 7, "feedback": "Brief feedback", "topics_to_cover": ["topic1"]}}\n'
+    "When a turn starts with a rubric, grade against it and leave out topics_to_cover.\n\n"
+    "Role: {role}\n"
+    "Job summary: {job_summary}"
+)
+
+
+@dataclass(frozen=True)
+class EvaluationContext:
+    session_id: Any
+    role: str
+    system_prompt: str
+
+    @classmethod
+    def build(cls, session_id: Any, role: str, job_description: str = "") -> "EvaluationContext":
+        job_summary = pack(
+            job_description or "",
+            budget_for("evaluate_answer", "job_description"),
+            build_keywords(role),
+        ) or "Not provided."
+        return cls(session_id, role, EVALUATION_SYSTEM_PROMPT.format(role=role, job_summary=job_summary))
+
+
+class EvaluationContextCache:
+    """Small LRU of rendered session prefixes (rendering packs the JD).
+
+    An entry is only reused while the session's role and job description
+    are unchanged; otherwise the prefix is rendered again.
+    """
+
+    def __init__(self, capacity: int = MAX_CONTEXTS):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[Any, Tuple[int, EvaluationContext]]" = OrderedDict()
+
+    def get(self, session_id: Any, role: str, job_description: str = "") -> EvaluationContext:
+        fingerprint = hash((role, job_description or ""))
+        with self._lock:
+            entry = self._items.get(session_id)
+            if entry is not None and entry[0] == fingerprint:
+                self._items.move_to_end(session_id)
+                return entry[1]
+        context = EvaluationContext.build(session_id, role, job_description)
+        with self._lock:
+            self._items[session_id] = (fingerprint, context)
+            self._items.move_to_end(session_id)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+        return context
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+evaluation_contexts = EvaluationContextCache()
+
+
+def context_for_session(session) -> Optional[EvaluationContext]:
+    """Prefix for an ``InterviewSession`` (or anything with id/role_title/job_description)."""
+    if session is None:
+        return None
+    return evaluation_contexts.get(session.id, session.role_title, session.job_description)
@@ -0,0 +1,154 @@
+"""
+Document text extractor registry
+
+Extraction backends are registered per MIME type, and the type of an upload
+is sniffed from its leading bytes (``%PDF-``, a zip containing
+``word/document.xml``), never taken from the file name. Every backend
+streams: ``iter_text`` yields blocks (pages, paragraphs, table rows) and
+``extract`` stops pulling them once the character budget is reached, so a
+long document is only read as far as needed.
+
+The first registered backend for a type is the default; ``RESUME_EXTRACTORS``
+(comma-separated backend names, e.g. ``python-docx,pypdf2``) puts others
+first. ``manage.py bench_extraction`` compares the backends on a corpus.
+New formats only need a ``register(Extractor(...))`` and, if the sniffer
+does not recognise them yet, a rule in ``sniff_mime``.
+"""
+import logging
+import zipfile
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from interviews.services.docx_stream import DOCUMENT_PART, iter_docx_blocks
+
+logger = logging.getLogger(__name__)
+
+PDF_MIME = 'application/pdf'
+DOCX_MIME = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+ZIP_MIME = 'application/zip'
+UNKNOWN_MIME = 'application/octet-stream'
+
+# PDF readers accept the header anywhere in the first KiB
+SNIFF_BYTES = 1024
+
+
+@dataclass(frozen=True)
+class Extractor:
+    name: str
+    mime_types: Tuple[str, ...]
+    # Yields text blocks in document order; may be abandoned part-way
+    iter_text: Callable[[BinaryIO], Iterator[str]]
+    description: str = ''
+
+
+_registry: Dict[str, Extractor] = {}
+
+
+def register(extractor: Extractor) -> Extractor:
+    _registry[extractor.name] = extractor
+    return extractor
+
+
+def get_extractor(name: str) -> Extractor:
+    return _registry[name]
+
+
+def extractors_for(mime: str) -> List[Extractor]:
+    """Backends handling ``mime``, in registration order."""
+    return [e for e in _registry.values() if mime in e.mime_types]
+
+
+def supported_mime_types() -> List[str]:
+    return sorted({mime for e in _registry.values() for mime in e.mime_types})
+
+
+def select(mime: str, preferred: Optional[Sequence[str]] = None) -> Optional[Extractor]:
+    """The backend to use for ``mime``: the first preferred one that handles it, else the default."""
+    candidates = extractors_for(mime)
+    preferred = settings.RESUME_EXTRACTORS if preferred is None else preferred
+    for name in preferred:
+        for extractor in candidates:
+            if extractor.name == name:
+                return extractor
+    return candidates[0] if candidates else None
+
+
+def sniff_mime(fileobj: BinaryIO) -> str:
+    """MIME type from the content's magic bytes; the file is rewound afterwards."""
+    start = fileobj.tell()
+    try:
+        head = fileobj.read(SNIFF_BYTES)
+        if b'%PDF-' in head:
+            return PDF_MIME
+        if head.startswith(b'PK\x03\x04'):
+            fileobj.seek(start)
+            try:
+                with zipfile.ZipFile(fileobj) as package:
+                    names = set(package.namelist())
+            except zipfile.BadZipFile:
+                return UNKNOWN_MIME
+            return DOCX_MIME if DOCUMENT_PART in names else ZIP_MIME
+        return UNKNOWN_MIME
+    finally:
+        fileobj.seek(start)
+
+
+def iter_budgeted(blocks: Iterator[str], max_chars: Optional[int]) -> Iterator[str]:
+    """Pass ``blocks`` through until ``max_chars`` characters were produced, then stop reading."""
+    produced = 0
+    try:
+        for block in blocks:
+            if not block:
+                continue
+            yield block
+            produced += len(block) + 1
+            if max_chars is not None and produced >= max_chars:
+                break
+    finally:
+        close = getattr(blocks, 'close', None)
+        if close is not None:
+            close()
+
+
+def extract(fileobj: BinaryIO, max_chars: Optional[int] = None,
+            extractor: Optional[Extractor] = None) -> Tuple[str, Optional[Extractor]]:
+    """Text of ``fileobj`` (blocks joined by newlines, at most ``max_chars``) and the backend used.
+
+    Unsupported content yields ``('', None)``; backend errors propagate.
+    """
+    if extractor is None:
+        mime = sniff_mime(fileobj)
+        extractor = select(mime)
+        if extractor is None:
+            logger.info(f"No text extractor for {mime}")
+            return '', None
+    text = '\n'.join(iter_budgeted(extractor.iter_text(fileobj), max_chars))
+    return (text[:max_chars] if max_chars is not None else text), extractor
+
+
+def _pypdf2_pages(fileobj: BinaryIO) -> Iterator[str]:
+    import PyPDF2
+
+    for page in PyPDF2.PdfReader(fileobj).pages:
+        yield page.extract_text() or ''
+
+
+def _python_docx_blocks(fileobj: BinaryIO) -> Iterator[str]:
+    from docx import Document
+    from docx.table import Table
+
+    for item in Document(fileobj).iter_inner_content():
+        if isinstance(item, Table):
+            for row in item.rows:
+                yield ' | '.join(cell.text for cell in row.cells if cell.text)
+        else:
+            yield item.text
+
+
+register(Extractor('docx-stream', (DOCX_MIME,), iter_docx_blocks,
+                   'word/document.xml read incrementally from the zip (stdlib only)'))
+register(Extractor('python-docx', (DOCX_MIME,), _python_docx_blocks,
+                   'python-docx object model; paragraphs and tables'))
+register(Extractor('pypdf2', (PDF_MIME,), _pypdf2_pages, 'PyPDF2, page by page'))
@@ -0,0 +1,65 @@
+"""
+Per-task generation profiles for AIService
+
+Each AI task has its own output-token budget, sampling temperature and stop
+sequences instead of one global ``max_tokens``: ten questions in JSON need
+far more room than a score-only evaluation. Budgets can be overridden per
+task with ``AI_MAX_TOKENS_<TASK>`` (e.g. ``AI_MAX_TOKENS_EVALUATE_ANSWER=200``).
+"""
+import os
+from dataclasses import dataclass, replace
+from typing import Dict, Tuple
+
+# Prompt used to resume a generation that hit the output-token limit
+CONTINUE_PROMPT = (
+    "Your previous reply was cut off. Continue exactly where it stopped, "
+    "without repeating anything, and finish the JSON."
+)
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    task: str
+    max_tokens: int
+    temperature: float
+    stop: Tuple[str, ...] = ()
+    # Extra calls allowed when the output is truncated by max_tokens
+    max_continuations: int = 1
+
+
+PROFILES: Dict[str, GenerationProfile] = {
+    "parse_resume": GenerationProfile("parse_resume", max_tokens=450, temperature=0.0, stop=("\n```",)),
+    "generate_questions": GenerationProfile(
+        "generate_questions", max_tokens=1300, temperature=0.7, stop=("\n```",), max_continuations=2
+    ),
+    "generate_questions_from_context": GenerationProfile(
+        "generate_questions_from_context", max_tokens=1300, temperature=0.7, stop=("\n```",), max_continuations=2
+    ),
+    "evaluate_answer": GenerationProfile("evaluate_answer", max_tokens=160, temperature=0.2, stop=("\n```",)),
+}
+
+DEFAULT_PROFILE = GenerationProfile("default", max_tokens=256, temperature=0.5)
+
+
+def get_profile(task: str) -> GenerationProfile:
+    """Return the profile for ``task`` with any env override applied."""
+    profile = PROFILES.get(task, replace(DEFAULT_PROFILE, task=task))
+    override = os.getenv(f"AI_MAX_TOKENS_{task.upper()}")
+    if override:
+        try:
+            profile = replace(profile, max_tokens=int(override))
+        except ValueError:
+            pass
+    return profile
+
+
+def is_truncated(response_metadata: Dict) -> bool:
+    """True if the provider stopped because of the output-token limit.
+
+    Groq/OpenAI report ``finish_reason == "length"``, Ollama reports
+    ``done_reason == "length"``.
+    """
+    if not response_metadata:
+        return False
+    reason = response_metadata.get("finish_reason") or response_metadata.get("done_reason")
+    return reason == "length"
@@ -0,0 +1,123 @@
+"""
+Shared HTTP client pool for LLM backends (Groq, Ollama)
+
+Every provider call goes through one keep-alive connection pool per process
+instead of opening a fresh TCP/TLS connection per request. The same
+transport is handed to the LangChain clients (ChatGroq via ``http_client``,
+ChatOllama via ``sync_client_kwargs``) and used directly for raw Ollama calls.
+"""
+import importlib.util
+import os
+import threading
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()
+_transport: Optional[httpx.HTTPTransport] = None
+_client: Optional[httpx.Client] = None
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def http2_enabled() -> bool:
+    """HTTP/2 is opt-in (AI_HTTP2=True) and needs the optional ``h2`` package."""
+    if os.getenv("AI_HTTP2", "False").lower() not in ("1", "true", "yes"):
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("AI_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def get_timeout(read: Optional[float] = None) -> httpx.Timeout:
+    """Connect fast, read slow: LLM generations can legitimately take a while."""
+    return httpx.Timeout(
+        connect=_env_float("AI_HTTP_CONNECT_TIMEOUT", 5.0),
+        read=read if read is not None else _env_float("AI_HTTP_READ_TIMEOUT", 90.0),
+        write=10.0,
+        pool=_env_float("AI_HTTP_POOL_TIMEOUT", 10.0),
+    )
+
+
+def get_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=int(_env_float("AI_HTTP_MAX_CONNECTIONS", 20)),
+        max_keepalive_connections=int(_env_float("AI_HTTP_MAX_KEEPALIVE", 10)),
+        keepalive_expiry=_env_float("AI_HTTP_KEEPALIVE_EXPIRY", 60.0),
+    )
+
+
+def get_transport() -> httpx.HTTPTransport:
+    """Return the process-wide pooled transport, creating it on first use."""
+    global _transport
+    if _transport is None:
+        with _lock:
+            if _transport is None:
+                _transport = httpx.HTTPTransport(
+                    limits=get_limits(),
+                    http2=http2_enabled(),
+                    retries=1,  # retry connect failures only
+                )
+    return _transport
+
+
+def get_http_client() -> httpx.Client:
+    """Return the shared client for raw provider calls (Ollama REST API)."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = httpx.Client(transport=get_transport(), timeout=get_timeout())
+    return _client
+
+
+def ollama_client_kwargs() -> Dict[str, Any]:
+    """Client keyword arguments for ``ChatOllama(**ollama_client_kwargs())``.
+
+    The pooled transport is synchronous, so it only goes to the sync client;
+    ``client_kwargs`` is shared with the async client used by ``ainvoke``/``astream``.
+    """
+    return {
+        "client_kwargs": {"timeout": get_timeout()},
+        "sync_client_kwargs": {"transport": get_transport()},
+    }
+
+
+def groq_http_client() -> httpx.Client:
+    """httpx client for ``ChatGroq(http_client=...)`` sharing the pool."""
+    return httpx.Client(transport=get_transport(), timeout=get_timeout())
+
+
+def reset() -> None:
+    """Close and drop the pooled connections."""
+    global _transport, _client
+    with _lock:
+        client, transport = _client, _transport
+        _client = None
+        _transport = None
+    for closable in (client, transport):
+        if closable is not None:
+            try:
+                closable.close()
+            except Exception:
+                pass
+
+
+def _forget_after_fork() -> None:
+    """Child side of a fork: abandon (don't close) the parent's sockets and lock."""
+    global _lock, _transport, _client
+    _lock = threading.RLock()
+    _transport = None
+    _client = None
+
+
+os.register_at_fork(after_in_child=_forget_after_fork)
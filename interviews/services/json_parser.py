@@ -0,0 +1,168 @@
+"""
+Tolerant, incremental JSON parsing for LLM responses
+
+Models wrap JSON in prose or code fences, leave trailing commas, and get cut
+off mid-object when they hit the output limit. ``IncrementalJSONParser``
+tracks the first top-level JSON value as text streams in, so callers can stop
+generation as soon as the object is closed, and repairs truncated output by
+closing open strings/brackets at the last complete value.
+"""
+import json
+import re
+import threading
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_CLOSERS = {"{": "}", "[": "]"}
+
+# How many cut points to try when repairing a truncated value
+MAX_REPAIR_ATTEMPTS = 12
+
+
+class IncrementalJSONParser:
+    """Track the first top-level JSON object/array in a stream of text chunks.
+
+    Usage:
+        parser = IncrementalJSONParser()
+        for chunk in stream:
+            if parser.feed(chunk):
+                break  # object closed, no need to keep generating
+        data = parser.result()
+    """
+
+    def __init__(self, expect: str = "{"):
+        self.expect = expect
+        self._buffer: List[str] = []
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self.complete = False
+        # (offset just before a structural comma, open brackets at that point)
+        self._cut_points: List[Tuple[int, Tuple[str, ...]]] = []
+        self._length = 0
+
+    @property
+    def text(self) -> str:
+        return "".join(self._buffer)
+
+    def feed(self, chunk: str) -> bool:
+        """Consume ``chunk``; returns True once the top-level value is closed."""
+        if self.complete or not chunk:
+            return self.complete
+
+        if not self._started:
+            start = chunk.find(self.expect)
+            if start == -1:
+                return False
+            chunk = chunk[start:]
+            self._started = True
+
+        for i, ch in enumerate(chunk):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in _CLOSERS:
+                self._stack.append(ch)
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if not self._stack:
+                    self._buffer.append(chunk[: i + 1])
+                    self._length += i + 1
+                    self.complete = True
+                    return True
+            elif ch == ",":
+                self._cut_points.append((self._length + i, tuple(self._stack)))
+
+        self._buffer.append(chunk)
+        self._length += len(chunk)
+        return False
+
+    def result(self) -> Tuple[Optional[Any], bool]:
+        """Return ``(value, repaired)``; value is None if nothing usable was found."""
+        if not self._started:
+            return None, False
+        text = self.text
+        value = _loads(text)
+        if value is not None:
+            return value, False
+        if self.complete:
+            return None, False
+        return self._repair(text), True
+
+    def _repair(self, text: str) -> Optional[Any]:
+        # First try closing everything where the text stopped
+        closing = ('"' if self._in_string else "") + _close(self._stack)
+        value = _loads(text.rstrip().rstrip(",") + closing)
+        if value is not None:
+            return value
+        # Otherwise drop the partial trailing element, cutting at earlier commas
+        for offset, stack in reversed(self._cut_points[-MAX_REPAIR_ATTEMPTS:]):
+            value = _loads(text[:offset] + _close(list(stack)))
+            if value is not None:
+                return value
+        return None
+
+
+def _close(stack: List[str]) -> str:
+    return "".join(_CLOSERS[ch] for ch in reversed(stack))
+
+
+def _loads(text: str) -> Optional[Any]:
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, ValueError):
+        pass
+    cleaned = _TRAILING_COMMA.sub(r"\1", text)
+    if cleaned != text:
+        try:
+            return json.loads(cleaned)
+        except (json.JSONDecodeError, ValueError):
+            pass
+    return None
+
+
+def parse_json_lenient(text: str, expect: str = "{") -> Tuple[Optional[Any], bool]:
+    """Parse the first JSON value in ``text``; returns ``(value, repaired)``."""
+    if not text:
+        return None, False
+    parser = IncrementalJSONParser(expect=expect)
+    parser.feed(text)
+    return parser.result()
+
+
+class ParseStats:
+    """Per-task JSON parse outcome counters (ok / repaired / failed)."""
+
+    OUTCOMES = ("ok", "repaired", "failed")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(self.OUTCOMES, 0))
+
+    def record(self, task: str, outcome: str) -> None:
+        with self._lock:
+            self._counts[task][outcome] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {task: dict(counts) for task, counts in self._counts.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+parse_stats = ParseStats()
@@ -0,0 +1,164 @@
+"""
+Local provisional answer scoring
+
+Scores an answer in a few milliseconds on the CPU, without the LLM, so
+``submit_answer`` can respond immediately and the LLM evaluation can refine
+the score later (or be skipped under load). It is also the fallback whenever
+the LLM evaluation fails.
+
+The question, the answer's sentences and the job description's sentences
+form a small corpus; term frequencies go into a NumPy matrix and BM25
+weights the question terms the answer covers. The score combines:
+
+- ``relevance``: BM25 of the question terms in the answer, normalised
+- ``job_fit``: TF-IDF cosine similarity between answer and job description
+- ``skills``: share of the relevant skills (from resume/JD) the answer names
+- ``length``: saturating word count against a per-question-type target
+- ``specificity``: numbers, examples and reasoning markers
+- ``rubric``: share of the question's rubric items covered (see ``rubrics``),
+  when the question has one
+
+The weights are heuristics, tuned so an on-topic, detailed answer lands
+around 7 and a one-liner around 2; the LLM has the final word.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from interviews.services import rubrics
+from interviews.services.context_builder import QUESTION_WORDS, split_sentences, stem_terms
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+LENGTH_TARGETS = {'technical': 80, 'behavioral': 120}
+WEIGHTS = {'relevance': 0.35, 'job_fit': 0.15, 'skills': 0.15, 'length': 0.25, 'specificity': 0.10,
+           'rubric': 0.30}
+
+_NUMBER = re.compile(r'\d')
+_EXAMPLE = re.compile(r'\b(for example|for instance|e\.g\.|such as|in my last|at my|we built|i built|i led)\b')
+_REASONING = re.compile(r'\b(because|so that|trade-?offs?|instead of|which meant|as a result|therefore)\b')
+
+
+@dataclass(frozen=True)
+class LocalScore:
+    score: int
+    feedback: str
+    topics_to_cover: str
+    features: Dict[str, float] = field(default_factory=dict)
+
+    def as_evaluation(self) -> Dict[str, object]:
+        return {'score': self.score, 'feedback': self.feedback, 'topics_to_cover': self.topics_to_cover}
+
+
+def _term_matrix(docs: Sequence[List[str]]):
+    vocab: Dict[str, int] = {}
+    rows, cols = [], []
+    for i, doc in enumerate(docs):
+        for term in doc:
+            rows.append(i)
+            cols.append(vocab.setdefault(term, len(vocab)))
+    tf = np.zeros((len(docs), max(len(vocab), 1)), dtype=np.float64)
+    np.add.at(tf, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), 1.0)
+    return tf, vocab
+
+
+def _cosine(a: np.ndarray, b: np.ndarray) -> float:
+    norm = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(a @ b / norm) if norm else 0.0
+
+
+def score_answer(question: str, answer: str, job_description: str = '', skills: Iterable[str] = (),
+                 question_type: str = 'technical', role: str = '',
+                 rubric: Optional[Dict[str, List[str]]] = None) -> LocalScore:
+    """Provisional 1-9 score with template feedback; never calls the LLM."""
+    surface: Dict[str, str] = {}
+    answer_terms = stem_terms(answer)
+    question_terms = [t for t in stem_terms(question, surface) if t not in QUESTION_WORDS]
+    jd_terms = stem_terms(job_description, surface)
+    answer_sentences = [stem_terms(s) for s in split_sentences(answer)] or [answer_terms]
+    jd_sentences = [stem_terms(s) for s in split_sentences(job_description)]
+    # Corpus for document frequencies: question, answer sentences, JD sentences
+    docs = [question_terms] + answer_sentences + jd_sentences
+    tf, vocab = _term_matrix(docs + [answer_terms, jd_terms + stem_terms(role)])
+    corpus = tf[:len(docs)]
+    n_docs = len(docs)
+    df = (corpus > 0).sum(axis=0)
+    idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+    answer_tf, jd_tf = tf[-2], tf[-1]
+
+    words = len(answer.split()) if answer else 0
+    target = LENGTH_TARGETS.get(question_type, LENGTH_TARGETS['technical'])
+
+    features: Dict[str, float] = {}
+    query = np.zeros(tf.shape[1], dtype=bool)
+    query[[vocab[t] for t in set(question_terms)]] = True
+    if query.any():
+        # Length normalisation against the expected answer length, not the
+        # sentence-sized corpus documents
+        avgdl = float(target)
+        dl = float(answer_tf.sum())
+        saturation = answer_tf * (BM25_K1 + 1) / (answer_tf + BM25_K1 * (1 - BM25_B + BM25_B * dl / avgdl))
+        bm25 = float((idf * saturation)[query].sum())
+        ideal = float(idf[query].sum() * (BM25_K1 + 1) / (1 + BM25_K1)) or 1.0
+        features['relevance'] = min(1.0, bm25 / ideal)
+    if jd_tf.any():
+        # Answers share only a handful of terms with a whole JD; 0.2 is already a close match
+        features['job_fit'] = min(1.0, 5.0 * _cosine(answer_tf * idf, jd_tf * idf))
+
+    text = (answer or '').lower()
+    skills = [str(s).lower() for s in skills if s]
+    scope = f"{question} {job_description}".lower()
+    relevant = [s for s in skills if s in scope] or skills
+    if relevant:
+        hits = [s for s in relevant if s in text]
+        features['skills'] = min(1.0, len(hits) / min(3, len(relevant)))
+
+    features['length'] = min(1.0, words / target)
+    features['specificity'] = (bool(_NUMBER.search(text)) + bool(_EXAMPLE.search(text))
+                               + bool(_REASONING.search(text))) / 3.0
+    rubric_coverage = rubrics.coverage(rubric, answer)
+    if rubric_coverage is not None:
+        features['rubric'] = rubric_coverage
+
+    total_weight = sum(WEIGHTS[name] for name in features)
+    raw = sum(WEIGHTS[name] * value for name, value in features.items()) / total_weight
+    score = int(round(1 + 8 * raw))
+    if words < 10:
+        score = min(score, 2)
+
+    topics = rubrics.topics_to_cover(rubric, answer)
+    if topics is None:
+        missing = _missing_terms(question_terms + jd_terms, answer_terms, idf, vocab)
+        topics = ', '.join(surface.get(t, t) for t in missing[:3]) or 'Add a concrete example and its outcome.'
+    return LocalScore(max(1, min(9, score)), _feedback(features, relevant, text), topics,
+                      {name: round(value, 3) for name, value in features.items()})
+
+
+def _missing_terms(candidates: List[str], answer_terms: List[str], idf: np.ndarray,
+                   vocab: Dict[str, int]) -> List[str]:
+    present = set(answer_terms)
+    unique = [t for t in dict.fromkeys(candidates) if t not in present and len(t) > 2 and t not in QUESTION_WORDS]
+    return sorted(unique, key=lambda t: -idf[vocab[t]])
+
+
+def _feedback(features: Dict[str, float], skills: List[str], text: str) -> str:
+    tips: List[str] = []
+    if features.get('relevance', 1.0) < 0.4:
+        tips.append('Address the key points of the question more directly.')
+    if features['length'] < 0.5:
+        tips.append('Go into more detail and walk through a concrete example.')
+    if features.get('skills', 1.0) < 0.5:
+        unused = [s for s in skills if s not in text][:3]
+        if unused:
+            tips.append(f"Connect your answer to relevant skills such as {', '.join(unused)}.")
+    if features.get('rubric', 1.0) < 0.5:
+        tips.append('Cover more of the key points the question is looking for.')
+    if features['specificity'] < 0.34:
+        tips.append('Explain your reasoning and quantify the outcome.')
+    if not tips:
+        tips.append('Solid, relevant answer with good detail.')
+    return 'Quick assessment: ' + ' '.join(tips)
+
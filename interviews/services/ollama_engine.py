@@ -12,12 +12,15 @@ Migration notes:
 - With:     from interviews.services.ai_service import ai_service
 - The API is backward compatible but more flexible.
 """
-import requests
+import httpx
 import json
 import re
 from typing import Dict, List, Optional, Any, Union
 from django.conf import settings
 
+from interviews.services.generation_profiles import get_profile
+from interviews.services.http_client import get_http_client, get_timeout
+
 
 class OllamaEngine:
     """AI Engine for Resume Parsing, Question Generation, and Answer Evaluation
@@ -29,35 +32,37 @@ class OllamaEngine:
         self.host = settings.OLLAMA_HOST
         self.model = settings.OLLAMA_MODEL
 
-    def _send_prompt(self, prompt: str, timeout: int = 30) -> str:
+    def _send_prompt(self, prompt: str, timeout: int = 30, task: str = "default") -> str:
         """Send prompt to Ollama and get response body as text. Returns raw text.
         
         Args:
             prompt: The prompt to send
             timeout: Request timeout in seconds (default 30)
+            task: Generation profile name (output budget, temperature, stops)
             
         Returns:
             Response text or error message
         """
+        profile = get_profile(task)
+        options = {"temperature": profile.temperature, "num_predict": profile.max_tokens}
+        if profile.stop:
+            options["stop"] = list(profile.stop)
         try:
-            response = requests.post(
+            response = get_http_client().post(
                 f"{self.host}/api/generate",
                 json={
                     "model": self.model,
                     "prompt": prompt,
                     "stream": False,
-                    "options": {
-                        "temperature": 0.5,  # balanced for fast generation
-                        "num_predict": 256,  # reduced even more for faster inference
-                    },
+                    "options": options,
                 },
-                timeout=timeout,
+                timeout=get_timeout(read=timeout),
             )
             response.raise_for_status()
             return response.json().get("response", "")
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             return f"Error: Ollama service timeout (no response within {timeout}s)"
-        except requests.exceptions.ConnectionError:
+        except httpx.ConnectError:
             return f"Error: Cannot connect to Ollama at {self.host}"
         except Exception as e:
             return f"Error: {str(e)}"
@@ -125,7 +130,7 @@ Resume: {resume_short}
 
 Return ONLY valid JSON."""
         # Use timeout for resume parsing; fallback to defaults if slow
-        response = self._send_prompt(prompt, timeout=40)
+        response = self._send_prompt(prompt, timeout=40, task="parse_resume")
         json_block = self._extract_json_block(response)
         data = self._safe_json_loads(json_block) if json_block else None
 
@@ -174,7 +179,7 @@ Job: {job_desc_short}
 
 Return ONLY valid JSON."""
         # Use timeout for question generation; fallback to defaults if slow  
-        response = self._send_prompt(prompt, timeout=60)
+        response = self._send_prompt(prompt, timeout=60, task="generate_questions")
         json_block = self._extract_json_block(response)
         data = self._safe_json_loads(json_block) if json_block else None
 
@@ -237,7 +242,7 @@ Return ONLY valid JSON."""
         prompt = f"""Rate this: Role: {role}, Q: {question}, A: {answer}
 JSON: {{"score": 7, "feedback": "Good", "topics_to_cover": []}}"""
         # Increased timeout for slow systems (up to 90 seconds)
-        response = self._send_prompt(prompt, timeout=90)
+        response = self._send_prompt(prompt, timeout=90, task="evaluate_answer")
         
         # Check if response is an error message
         if response.startswith("Error:"):
@@ -282,7 +287,7 @@ JSON: {{"score": 7, "feedback": "Good", "topics_to_cover": []}}"""
         """Quick health check for the Ollama host (used by tests/monitoring)."""
         try:
             # Use /api/tags endpoint which returns available models
-            resp = requests.get(f"{self.host}/api/tags", timeout=timeout)
+            resp = get_http_client().get(f"{self.host}/api/tags", timeout=timeout)
             return resp.status_code == 200
         except Exception:
             return False
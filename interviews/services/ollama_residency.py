@@ -0,0 +1,140 @@
+"""
+Ollama model residency
+
+Most of the 50-90s first-response time with Ollama is loading the model into
+memory. ``OllamaResidency`` loads ``OLLAMA_MODEL`` ahead of time (an empty
+``/api/generate`` request), pins it with ``keep_alive`` and, before LLM
+calls, checks ``/api/ps`` at most every ``OLLAMA_RESIDENCY_CHECK`` seconds
+and reloads the model if Ollama evicted it.
+
+Every request carries the same ``num_ctx``: Ollama restarts the model runner
+whenever the context size changes, so per-task values would reload the model
+between tasks. It is one setting, ``OLLAMA_NUM_CTX``, sized for the largest
+task (question generation: packed JD and resume plus its output budget).
+
+    OLLAMA_KEEP_ALIVE=-1          # -1 = keep loaded indefinitely, or "30m", "3600"
+    OLLAMA_NUM_CTX=2048           # context size sent with every request
+    OLLAMA_RESIDENCY_CHECK=30     # seconds between eviction checks; 0 disables them
+    OLLAMA_WARM_ON_START=True     # load the model when gunicorn starts
+"""
+import logging
+import os
+import threading
+import time
+from typing import Optional, Union
+
+import httpx
+
+from core.metrics import OLLAMA_WARMUPS
+from interviews.services.http_client import get_http_client, get_timeout
+
+logger = logging.getLogger(__name__)
+
+# Loading a large model from disk can take over a minute
+WARM_TIMEOUT = 180.0
+
+DEFAULT_NUM_CTX = 2048
+
+
+def parse_keep_alive(value: Optional[str]) -> Union[int, str]:
+    """``"-1"``/``"3600"`` -> int seconds, durations like ``"30m"`` unchanged."""
+    value = (value or "-1").strip()
+    return int(value) if value.lstrip("-").isdigit() else value
+
+
+def shared_num_ctx() -> int:
+    value = os.getenv("OLLAMA_NUM_CTX", "")
+    return int(value) if value.isdigit() else DEFAULT_NUM_CTX
+
+
+def _same_model(name: str, model: str) -> bool:
+    # /api/ps reports "mistral:latest" for OLLAMA_MODEL=mistral
+    return name == model or name == f"{model}:latest" or name.split(":")[0] == model
+
+
+class OllamaResidency:
+    """Keeps one Ollama model loaded; safe to share between threads."""
+
+    def __init__(self, host: str, model: str):
+        self.host = host.rstrip("/")
+        self.model = model
+        self.keep_alive = parse_keep_alive(os.getenv("OLLAMA_KEEP_ALIVE"))
+        self.num_ctx = shared_num_ctx()
+        self.check_interval = float(os.getenv("OLLAMA_RESIDENCY_CHECK", "30"))
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+
+    def is_loaded(self, client: Optional[httpx.Client] = None) -> bool:
+        resp = (client or get_http_client()).get(f"{self.host}/api/ps", timeout=5)
+        resp.raise_for_status()
+        return any(_same_model(m.get("name", ""), self.model) for m in resp.json().get("models", []))
+
+    def warm(self, reason: str = "startup", client: Optional[httpx.Client] = None) -> bool:
+        """Load the model (empty prompt) with the pinned keep_alive and shared num_ctx."""
+        started = time.perf_counter()
+        try:
+            resp = (client or get_http_client()).post(
+                f"{self.host}/api/generate",
+                json={
+                    "model": self.model,
+                    "prompt": "",
+                    "keep_alive": self.keep_alive,
+                    "options": {"num_ctx": self.num_ctx},
+                },
+                timeout=get_timeout(read=WARM_TIMEOUT),
+            )
+            resp.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not warm Ollama model {self.model}: {e}")
+            return False
+        OLLAMA_WARMUPS.labels(reason=reason).inc()
+        logger.info(f"Ollama model {self.model} loaded ({reason}) in {time.perf_counter() - started:.1f}s")
+        return True
+
+    def ensure_warm(self) -> None:
+        """Reload the model if it was evicted; checks at most every ``check_interval``.
+
+        Called before LLM requests. Only one thread checks at a time; the
+        others go straight to the provider, which loads the model itself.
+        """
+        if self.check_interval <= 0 or time.monotonic() - self._last_check < self.check_interval:
+            return
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._last_check = time.monotonic()
+            if not self.is_loaded():
+                logger.info(f"Ollama model {self.model} was evicted; re-warming")
+                self.warm(reason="evicted")
+        except (httpx.HTTPError, ValueError) as e:
+            logger.debug(f"Ollama residency check failed: {e}")
+        finally:
+            self._lock.release()
+
+    def warm_in_background(self) -> threading.Thread:
+        """Warm on a daemon thread with its own client (call only after fork)."""
+        def run():
+            with httpx.Client() as client:
+                self.warm(reason="startup", client=client)
+
+        thread = threading.Thread(target=run, name="ollama-warm", daemon=True)
+        thread.start()
+        return thread
+
+
+def residency_from_env() -> OllamaResidency:
+    return OllamaResidency(
+        os.getenv("OLLAMA_HOST", "http://localhost:11434"),
+        os.getenv("OLLAMA_MODEL", "mistral"),
+    )
+
+
+def warm_on_start() -> Optional[threading.Thread]:
+    """Start a background warm-up when Ollama is the active provider."""
+    if os.getenv("OLLAMA_WARM_ON_START", "True").lower() not in ("1", "true", "yes"):
+        return None
+    # Same resolution as AIService: groq without an API key falls back to Ollama
+    provider = os.getenv("AI_PROVIDER", "groq").lower()
+    if provider == "groq" and os.getenv("GROQ_API_KEY"):
+        return None
+    return residency_from_env().warm_in_background()
@@ -0,0 +1,157 @@
+"""
+Near-duplicate question detection (MinHash + LSH)
+
+The LLM regularly produces two near-identical questions in one set, or asks
+a returning user what their last interview already asked. Each question is
+reduced to word-bigram shingles of its content terms (``stem_terms`` minus
+question framing such as "how would you", so stopwords, phrasing and
+plural/tense endings do not matter) and a ``NUM_PERM``-value MinHash
+signature; the share of equal signature values estimates the Jaccard
+similarity of two questions' shingle sets. Signatures are split into
+``BANDS`` bands and bucketed, so a lookup only compares against questions
+sharing at least one band (locality-sensitive hashing) instead of the whole
+history.
+
+All signatures for a batch are computed in one NumPy pass; checking a
+question set against a user's recent history takes well under a
+millisecond per question. ``deduplicate`` replaces duplicates with unused
+questions from the fallback pool, without another LLM call.
+
+    QUESTION_DEDUP_THRESHOLD=0.5   # estimated Jaccard at or above which questions are duplicates; 0 disables
+    QUESTION_DEDUP_HISTORY=5       # the user's most recent sessions checked for repeats
+"""
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from core.metrics import QUESTION_DEDUP
+from interviews.services.context_builder import QUESTION_WORDS, stem_terms
+
+NUM_PERM = 64
+BANDS = 16  # 4 rows each: candidate pairs from a Jaccard of ~0.5 up
+SHINGLE_SIZE = 2
+
+# Universal hashing modulo a Mersenne prime; a * x stays below 2**62
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240611)
+_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+
+def shingles(text: str) -> Set[str]:
+    """Word ``SHINGLE_SIZE``-grams of the question's content terms."""
+    terms = [t for t in stem_terms(text) if t not in QUESTION_WORDS]
+    if len(terms) < SHINGLE_SIZE:
+        return set(terms) or {(text or '').strip().lower()}
+    return {' '.join(terms[i:i + SHINGLE_SIZE]) for i in range(len(terms) - SHINGLE_SIZE + 1)}
+
+
+def signatures(texts: Sequence[str]) -> np.ndarray:
+    """MinHash signatures, one ``NUM_PERM`` row per text."""
+    if not texts:
+        return np.empty((0, NUM_PERM), dtype=np.uint64)
+    hashes: List[int] = []
+    offsets: List[int] = []
+    for text in texts:
+        offsets.append(len(hashes))
+        # crc32 is stable across processes, unlike hash()
+        hashes.extend(zlib.crc32(s.encode()) % _PRIME for s in shingles(text))
+    values = np.array(hashes, dtype=np.uint64)
+    permuted = (_A[:, None] * values[None, :] + _B[:, None]) % _PRIME
+    return np.minimum.reduceat(permuted, offsets, axis=1).T
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+class MinHashIndex:
+    """Signatures bucketed per band; ``match`` only compares against bucket-mates."""
+
+    def __init__(self, threshold: float, bands: int = BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self._signatures: List[np.ndarray] = []
+        self._labels: List[Any] = []
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+
+    def _keys(self, signature: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, signature: np.ndarray, label: Any) -> None:
+        position = len(self._signatures)
+        self._signatures.append(signature)
+        self._labels.append(label)
+        for key in self._keys(signature):
+            self._buckets.setdefault(key, []).append(position)
+
+    def match(self, signature: np.ndarray) -> Optional[Tuple[Any, float]]:
+        """The most similar indexed label at or above the threshold, with its similarity."""
+        candidates = {i for key in self._keys(signature) for i in self._buckets.get(key, ())}
+        best: Optional[Tuple[Any, float]] = None
+        for i in candidates:
+            score = similarity(signature, self._signatures[i])
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (self._labels[i], score)
+        return best
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+
+def deduplicate(questions: List[Dict[str, Any]], history: Sequence[str] = (),
+                fallback: Optional[Callable[[], Sequence[Dict[str, Any]]]] = None,
+                threshold: Optional[float] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """Replace questions that near-duplicate an earlier one or ``history``.
+
+    A duplicate is swapped for the first unused ``fallback()`` question of the
+    same type that is not itself a duplicate, keeping its slot's ``order``;
+    without one it is kept. ``fallback`` is only
+    called when a duplicate is found. Returns the questions and the number
+    replaced.
+    """
+    threshold = settings.QUESTION_DEDUP_THRESHOLD if threshold is None else threshold
+    if threshold <= 0 or not questions:
+        return questions, 0
+
+    texts = [q.get('question_text', '') for q in questions]
+    sigs = signatures(list(history) + texts)
+    index = MinHashIndex(threshold)
+    for text, signature in zip(history, sigs[:len(history)]):
+        index.add(signature, text)
+
+    pool: Optional[List[Tuple[Dict[str, Any], np.ndarray]]] = None
+    out: List[Dict[str, Any]] = []
+    replaced = 0
+    for question, signature in zip(questions, sigs[len(history):]):
+        if index.match(signature) is None:
+            index.add(signature, question.get('question_text', ''))
+            out.append(question)
+            QUESTION_DEDUP.labels(result='unique').inc()
+            continue
+        if pool is None:
+            candidates = list(fallback()) if fallback is not None else []
+            pool = list(zip(candidates, signatures([c.get('question_text', '') for c in candidates])))
+        pick = next((i for i, (c, candidate_signature) in enumerate(pool)
+                     if c.get('question_type') == question.get('question_type')
+                     and index.match(candidate_signature) is None), None)
+        if pick is None:
+            index.add(signature, question.get('question_text', ''))
+            out.append(question)
+            QUESTION_DEDUP.labels(result='kept').inc()
+            continue
+        candidate, candidate_signature = pool.pop(pick)
+        index.add(candidate_signature, candidate.get('question_text', ''))
+        out.append({
+            **question,
+            'question_text': candidate.get('question_text', ''),
+            'rubric': candidate.get('rubric', {}),
+        })
+        replaced += 1
+        QUESTION_DEDUP.labels(result='replaced').inc()
+    return out, replaced
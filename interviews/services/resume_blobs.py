@@ -0,0 +1,253 @@
+"""
+Content-addressed resume storage
+
+Every distinct resume is stored once, as a ``ResumeBlob`` named after its
+SHA-256 (``resumes/sha256/ab/<hash>.<ext>``). Uploads and sessions point at
+the blob; uploading the same file again only hashes it locally and takes
+another reference, without writing anything to media storage. Everything
+downstream (the local resume cache, extracted text and skills) keys on the
+same hash.
+
+Callers that create the referencing row use ``storing``: media storage is
+not transactional, so if the row fails to commit the file of a blob created
+in the same transaction is deleted again rather than left without a row.
+
+``ref_count`` is the number of ``ResumeUpload`` and ``InterviewSession``
+rows referencing a blob. References are taken in ``store``/``acquire`` and
+dropped by the ``post_delete`` handler in ``interviews.models``.
+``collect_garbage`` (``manage.py gc_resumes``) deletes blobs that have been
+unreferenced for a grace period; the foreign keys are ``PROTECT`` so a blob
+that is still referenced can never be deleted even if a count drifted.
+"""
+import hashlib
+import logging
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple
+
+from django.core.files import File
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _HashingMixin:
+    """Hash an upload's chunks as the handler writes them (sets ``file.sha256``)."""
+
+    def new_file(self, *args, **kwargs):
+        # Before super(): the in-memory handler raises StopFutureHandlers there
+        self.hasher = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        passed_on = super().receive_data_chunk(raw_data, start)
+        if passed_on is None:
+            # This handler kept the chunk, so it is the one building the file
+            self.hasher.update(raw_data)
+        return passed_on
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.sha256 = self.hasher.hexdigest()
+        return file
+
+
+class HashingMemoryFileUploadHandler(_HashingMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(_HashingMixin, TemporaryFileUploadHandler):
+    pass
+
+
+def hash_file(fileobj: BinaryIO) -> Tuple[str, int]:
+    """SHA-256 and size of a seekable file, which is rewound afterwards."""
+    hasher = hashlib.sha256()
+    size = 0
+    fileobj.seek(0)
+    chunks = fileobj.chunks(CHUNK_SIZE) if hasattr(fileobj, 'chunks') else iter(
+        lambda: fileobj.read(CHUNK_SIZE), b'')
+    for chunk in chunks:
+        hasher.update(chunk)
+        size += len(chunk)
+    fileobj.seek(0)
+    return hasher.hexdigest(), size
+
+
+def acquire(blob) -> None:
+    """Take one more reference to ``blob``.
+
+    The row is locked first, so this cannot interleave with
+    ``collect_garbage`` deleting it; raises ``ResumeBlob.DoesNotExist`` if it
+    has already been collected.
+    """
+    from interviews.models import ResumeBlob
+
+    with transaction.atomic():
+        if ResumeBlob.objects.select_for_update().filter(pk=blob.pk).first() is None:
+            raise ResumeBlob.DoesNotExist(f"Resume blob {blob.sha256[:12]} has been collected")
+        ResumeBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1, released_at=None)
+
+
+def release(blob_id: int) -> None:
+    """Drop one reference; the blob becomes collectable when none are left."""
+    from interviews.models import ResumeBlob
+
+    with transaction.atomic():
+        ResumeBlob.objects.filter(pk=blob_id, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+        ResumeBlob.objects.filter(pk=blob_id, ref_count=0, released_at__isnull=True).update(
+            released_at=timezone.now())
+
+
+def store(fileobj: BinaryIO, name: str):
+    """Return the blob for ``fileobj``'s content, holding a new reference to it.
+
+    Only the first upload of some content writes to media storage. Request
+    uploads arrive already hashed by the upload handlers above, so their
+    content is only read once more, to write it; anything else is hashed
+    here first. Returns ``(blob, created)``.
+    """
+    from interviews.models import ResumeBlob
+
+    if getattr(fileobj, 'sha256', None):
+        sha256, size = fileobj.sha256, fileobj.size
+    else:
+        sha256, size = hash_file(fileobj)
+    existing = ResumeBlob.objects.filter(sha256=sha256).first()
+    if existing is not None:
+        try:
+            acquire(existing)
+            return existing, False
+        except ResumeBlob.DoesNotExist:
+            pass  # Collected since the lookup; store the content again
+
+    blob = ResumeBlob(sha256=sha256, size=size, ref_count=1)
+    blob.file.save(name, File(fileobj, name=name), save=False)
+    try:
+        with transaction.atomic():
+            blob.save()
+    except IntegrityError:
+        # Someone stored the same content concurrently; use theirs
+        blob.file.storage.delete(blob.file.name)
+        existing = ResumeBlob.objects.get(sha256=sha256)
+        acquire(existing)
+        return existing, False
+    return blob, True
+
+
+@contextmanager
+def storing(fileobj: BinaryIO, name: str) -> Iterator:
+    """``store`` in a transaction the caller's rows join; yields the blob.
+
+    If the block raises, the transaction rolls back and a blob file written
+    by this call is deleted with it.
+    """
+    with transaction.atomic():
+        blob, created = store(fileobj, name)
+        try:
+            yield blob
+        except BaseException:
+            if created:
+                blob.file.storage.delete(blob.file.name)
+            raise
+
+
+def recount() -> int:
+    """Recompute ``ref_count`` from the actual references; returns blobs corrected."""
+    from interviews.models import ResumeBlob
+
+    fixed = 0
+    blobs = ResumeBlob.objects.annotate(
+        n_uploads=Count('uploads', distinct=True), n_sessions=Count('sessions', distinct=True))
+    for blob in blobs:
+        actual = blob.n_uploads + blob.n_sessions
+        if actual != blob.ref_count:
+            logger.warning(f"Resume blob {blob.sha256[:12]} ref_count {blob.ref_count} -> {actual}")
+            ResumeBlob.objects.filter(pk=blob.pk).update(
+                ref_count=actual, released_at=None if actual else (blob.released_at or timezone.now()))
+            fixed += 1
+    return fixed
+
+
+def collect_garbage(grace: timedelta = timedelta(hours=24), dry_run: bool = False,
+                    sha256s: Optional[Iterable[str]] = None) -> Tuple[int, int]:
+    """Delete blobs unreferenced for longer than ``grace``; returns ``(blobs, bytes)``."""
+    from interviews.models import ResumeBlob
+
+    candidates = ResumeBlob.objects.filter(ref_count=0, released_at__lte=timezone.now() - grace)
+    if sha256s is not None:
+        candidates = candidates.filter(sha256__in=list(sha256s))
+    deleted = freed = 0
+    for pk in candidates.values_list('pk', flat=True):
+        with transaction.atomic():
+            blob = ResumeBlob.objects.select_for_update().filter(pk=pk, ref_count=0).first()
+            if blob is None or blob.uploads.exists() or blob.sessions.exists():
+                continue
+            deleted += 1
+            freed += blob.size
+            if dry_run:
+                continue
+            storage, name = blob.file.storage, blob.file.name
+            blob.delete()
+            transaction.on_commit(lambda storage=storage, name=name: storage.delete(name))
+    return deleted, freed
+
+
+def prune_uploads(older_than: timedelta) -> int:
+    """Delete early uploads that never became a session (releases their blobs)."""
+    from interviews.models import ResumeUpload
+
+    stale = ResumeUpload.objects.filter(created_at__lt=timezone.now() - older_than, sessions__isnull=True)
+    count = 0
+    for upload in stale:
+        upload.delete()
+        count += 1
+    return count
+
+
+def adopt_legacy_sessions() -> Tuple[int, int]:
+    """Move sessions and uploads with a private ``resumes/`` copy onto shared blobs.
+
+    All rows naming the same legacy file move together, and the file is only
+    deleted once nothing names it any more. Returns ``(rows moved, duplicate
+    files removed)``.
+    """
+    from interviews.models import InterviewSession, ResumeBlob, ResumeUpload
+
+    legacy_sessions = InterviewSession.objects.filter(resume_blob__isnull=True).exclude(resume='')
+    legacy_uploads = ResumeUpload.objects.filter(blob__isnull=True).exclude(file='')
+    names = set(legacy_sessions.values_list('resume', flat=True))
+    names.update(legacy_uploads.values_list('file', flat=True))
+    storage = InterviewSession._meta.get_field('resume').storage
+
+    moved = removed = 0
+    for old_name in sorted(names):
+        try:
+            with storage.open(old_name, 'rb') as f:
+                blob, created = store(f, old_name)
+        except Exception as e:
+            logger.warning(f"Could not adopt legacy resume {old_name}: {e}")
+            continue
+        with transaction.atomic():
+            rows = legacy_sessions.filter(resume=old_name).update(
+                resume=blob.file.name, resume_blob=blob, resume_sha256=blob.sha256)
+            rows += legacy_uploads.filter(file=old_name).update(
+                file=blob.file.name, blob=blob, sha256=blob.sha256, size=blob.size)
+            # ``store`` took one reference; the rows just moved hold the rest
+            if rows:
+                ResumeBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + rows - 1)
+            else:
+                release(blob.pk)
+        moved += rows
+        still_named = (InterviewSession.objects.filter(resume=old_name).exists()
+                       or ResumeUpload.objects.filter(file=old_name).exists())
+        if old_name != blob.file.name and not still_named:
+            storage.delete(old_name)
+            removed += 1
+    return moved, removed
@@ -0,0 +1,187 @@
+"""
+Storage-agnostic resume access
+
+Resumes are read through the Django storage API (``storage.open``) and never
+through ``FieldFile.path``, which only exists for local filesystem storage
+and fails with Azure Blob Storage. Web nodes can then share remote media
+without sharing a disk.
+
+Remote reads are expensive, so ``open_resume`` copies each blob into a
+bounded local read-through cache keyed by its SHA-256 the first time it is
+read. Later extractions of the same content, from any session, are served
+from local disk. Entries are written atomically (temp file + rename), so
+several workers can share the directory; the least recently used files are
+evicted once the cache exceeds ``RESUME_CACHE_MAX_BYTES``.
+
+    RESUME_CACHE_DIR=cache/resumes
+    RESUME_CACHE_MAX_BYTES=268435456   # 0 streams into a temp file without caching
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from django.conf import settings
+
+from core.metrics import RESUME_CACHE
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+# Files up to this size stay in memory when caching is disabled
+SPOOL_MAX_SIZE = 1024 * 1024
+
+
+def _copy_hashing(source: BinaryIO, target: BinaryIO) -> str:
+    hasher = hashlib.sha256()
+    while True:
+        chunk = source.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        hasher.update(chunk)
+        target.write(chunk)
+    return hasher.hexdigest()
+
+
+def _is_sha256(value: str) -> bool:
+    return len(value) == 64 and all(c in '0123456789abcdef' for c in value)
+
+
+class ResumeCache:
+    """Content-addressed local file cache with LRU eviction by total size."""
+
+    def __init__(self, directory, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def path_for(self, sha256: str) -> Path:
+        return self.directory / sha256[:2] / sha256
+
+    def open(self, sha256: str) -> Optional[BinaryIO]:
+        """Open the cached copy of ``sha256`` (and mark it recently used), or ``None``."""
+        if not _is_sha256(sha256):
+            return None
+        path = self.path_for(sha256)
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return f
+
+    def fill(self, source: BinaryIO, expected_sha256: str = '') -> str:
+        """Copy ``source`` into the cache; returns the SHA-256 of what was read.
+
+        The entry is stored under the hash of the actual content, so a stale
+        ``expected_sha256`` can never serve the wrong file.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.incoming-')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                digest = _copy_hashing(source, tmp)
+            if expected_sha256 and digest != expected_sha256:
+                logger.warning(f"Resume content hash {digest} does not match recorded {expected_sha256}")
+            path = self.path_for(digest)
+            path.parent.mkdir(exist_ok=True)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self.evict()
+        return digest
+
+    def entries(self):
+        """``(mtime, size, path)`` of every cached file."""
+        found = []
+        for path in self.directory.glob('??/*'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            found.append((stat.st_mtime, stat.st_size, path))
+        return found
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits; returns bytes freed."""
+        with self._lock:
+            entries = sorted(self.entries(), key=lambda entry: entry[0])
+            total = sum(size for _, size, _ in entries)
+            freed = 0
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                freed += size
+            return freed
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+_cache: Optional[ResumeCache] = None
+
+
+def get_cache() -> ResumeCache:
+    global _cache
+    directory, max_bytes = settings.RESUME_CACHE_DIR, settings.RESUME_CACHE_MAX_BYTES
+    if _cache is None or str(_cache.directory) != str(directory) or _cache.max_bytes != max_bytes:
+        _cache = ResumeCache(directory, max_bytes)
+    return _cache
+
+
+@contextmanager
+def open_resume(field_file, sha256: str = '') -> Iterator[Tuple[BinaryIO, str]]:
+    """Open a stored resume as a seekable binary file: ``(file, content_sha256)``.
+
+    ``sha256`` is the known content hash, if any; with a cache hit the
+    storage backend is not contacted at all. Otherwise the file is streamed
+    from storage once, hashed, and cached for the next reader.
+    """
+    cache = get_cache()
+    if cache.enabled:
+        cached = cache.open(sha256) if sha256 else None
+        if cached is not None:
+            RESUME_CACHE.labels(result='hit').inc()
+            with cached:
+                yield cached, sha256
+            return
+        RESUME_CACHE.labels(result='miss').inc()
+        with field_file.storage.open(field_file.name, 'rb') as source:
+            digest = cache.fill(source, sha256)
+        cached = cache.open(digest)
+        if cached is not None:
+            with cached:
+                yield cached, digest
+            return
+        # Evicted straight away (cache smaller than the file): fall through and stream
+
+    RESUME_CACHE.labels(result='bypass').inc()
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+        with field_file.storage.open(field_file.name, 'rb') as source:
+            digest = _copy_hashing(source, spool)
+        spool.seek(0)
+        yield spool, digest
@@ -0,0 +1,50 @@
+"""
+Resume text and skill extraction
+
+Text comes from the backend the ``extractors`` registry selects for the
+sniffed content type; parser libraries are imported on first use (see
+bench_startup). Extraction works on any seekable binary file object, so
+callers can pass a local file, a Django ``File`` or a storage stream.
+"""
+import logging
+from typing import BinaryIO, List
+
+from interviews.services.extractors import extract
+
+logger = logging.getLogger(__name__)
+
+# Hard cap on extracted characters; prompts are packed to per-task token
+# budgets by the context builder, this only bounds pathological documents
+RESUME_TEXT_MAX_CHARS = 20000
+
+COMMON_SKILLS = [
+    'python', 'django', 'flask', 'fastapi', 'javascript', 'typescript', 'react', 'vue', 'angular',
+    'node', 'express', 'postgres', 'mysql', 'sqlite', 'mongodb', 'redis', 'docker', 'kubernetes',
+    'aws', 'azure', 'gcp', 'git', 'linux', 'rest', 'graphql', 'pytest', 'unittest', 'pandas', 'numpy',
+    'ml', 'machine learning', 'nlp', 'data engineering', 'devops', 'terraform', 'ansible',
+]
+
+
+def file_format(name: str) -> str:
+    """``resume.PDF`` -> ``pdf``."""
+    return name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+
+
+def extract_text(fileobj: BinaryIO, name: str) -> str:
+    """Extract and normalize text from a resume file object (any registered format).
+
+    The format is sniffed from the content; ``name`` is only used in logs.
+    Unreadable or unsupported files yield an empty string.
+    """
+    try:
+        text, _ = extract(fileobj, RESUME_TEXT_MAX_CHARS)
+    except Exception as e:
+        logger.warning(f"Could not extract text from {name}: {e}")
+        text = ''
+    return ' '.join(text.split())[:RESUME_TEXT_MAX_CHARS]
+
+
+def detect_skills(text: str, limit: int = 10) -> List[str]:
+    """Deterministic keyword-based skill detection (no LLM)."""
+    text = (text or '').lower()
+    return [skill for skill in COMMON_SKILLS if skill in text][:limit]
@@ -0,0 +1,130 @@
+"""
+Early resume uploads
+
+The setup page posts the resume to ``upload_resume`` as soon as it is
+picked. ``save_upload`` stores it in the content-addressed blob store
+(``resume_blobs``), and ``schedule_processing`` extracts text and skills
+(including the LLM resume parse) on a background thread once the row is
+committed; content that was processed before reuses the earlier result.
+When the setup form is submitted the session references the processed
+upload, so that work is usually done already; if not,
+``wait_for_processing`` waits up to ``RESUME_UPLOAD_WAIT`` seconds and then
+lets the session extract inline.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from core.metrics import track_resume_extraction
+from interviews.services.extractors import DOCX_MIME, PDF_MIME
+from interviews.services.resume_blobs import storing
+from interviews.services.resume_storage import open_resume
+from interviews.services.resume_text import detect_skills, extract_text, file_format
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_MIME_TYPES = (PDF_MIME, DOCX_MIME)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.RESUME_UPLOAD_WORKERS, thread_name_prefix='resume-upload'
+            )
+        return _executor
+
+
+def save_upload(user, uploaded_file):
+    """Record ``uploaded_file`` for ``user``, storing its content only if it is new."""
+    from interviews.models import ResumeUpload
+
+    # The reference and the row holding it commit together
+    with storing(uploaded_file, uploaded_file.name) as blob:
+        return ResumeUpload.objects.create(
+            user=user, file=blob.file.name, blob=blob, original_name=uploaded_file.name[:255],
+            size=blob.size, sha256=blob.sha256,
+        )
+
+
+def process_upload(upload_id: int) -> None:
+    """Extract text and skills for one upload; never raises."""
+    from interviews.models import ResumeUpload
+    from interviews.services.ai_service import ai_service
+
+    updated = ResumeUpload.objects.filter(pk=upload_id, status='pending').update(status='processing')
+    if not updated:
+        return
+    upload = ResumeUpload.objects.get(pk=upload_id)
+    # Same content processed before: reuse its text and skills
+    previous = (ResumeUpload.objects.filter(sha256=upload.sha256, status='ready')
+                .exclude(pk=upload.pk).only('text', 'skills').first())
+    if previous is not None:
+        upload.text, upload.skills, upload.status = previous.text, previous.skills, 'ready'
+        upload.processed_at = timezone.now()
+        upload.save(update_fields=['text', 'skills', 'status', 'processed_at'])
+        return
+    try:
+        with track_resume_extraction(file_format(upload.file.name)):
+            # Also seeds the local resume cache for the session that will use it
+            with open_resume(upload.file, upload.sha256) as (f, _):
+                upload.text = extract_text(f, upload.file.name)
+        skills = []
+        if upload.text:
+            try:
+                parsed = ai_service.parse_resume(upload.text)
+                skills = parsed.get('skills', []) if isinstance(parsed, dict) else []
+            except Exception as e:
+                logger.warning(f"Resume parse failed for upload {upload_id}: {e}")
+        upload.skills = [str(s) for s in skills if s][:15] or detect_skills(upload.text)
+        upload.status = 'ready'
+    except Exception as e:
+        logger.error(f"Processing resume upload {upload_id} failed: {e}")
+        upload.status = 'failed'
+        upload.error = str(e)[:255]
+    upload.processed_at = timezone.now()
+    upload.save(update_fields=['text', 'skills', 'status', 'error', 'processed_at'])
+
+
+def _run_in_background(upload_id: int) -> None:
+    try:
+        process_upload(upload_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_processing(upload) -> None:
+    """Process ``upload`` after the current transaction commits.
+
+    Runs inline when RESUME_UPLOAD_BACKGROUND is off (tests, single-threaded setups).
+    """
+    if not settings.RESUME_UPLOAD_BACKGROUND:
+        transaction.on_commit(lambda: process_upload(upload.pk))
+        return
+    transaction.on_commit(lambda: _get_executor().submit(_run_in_background, upload.pk))
+
+
+def wait_for_processing(upload, timeout: Optional[float] = None, poll: float = 0.2):
+    """Return ``upload`` refreshed once processed, or ``None`` if still running at ``timeout``.
+
+    Polls the database because the upload may be processed by another worker.
+    """
+    timeout = settings.RESUME_UPLOAD_WAIT if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    while not upload.is_processed:
+        if time.monotonic() >= deadline:
+            logger.info(f"Resume upload {upload.pk} still {upload.status}; extracting inline")
+            return None
+        time.sleep(poll)
+        upload.refresh_from_db(fields=['status', 'text', 'skills', 'error', 'processed_at'])
+    return upload
@@ -0,0 +1,101 @@
+"""
+Per-question answer rubrics
+
+Question generation asks the model for a compact rubric with every question:
+a few ``key_points`` a strong answer makes and the ``topics`` it should
+touch. The rubric is stored on ``Question`` and then serves two purposes:
+
+- the evaluation prompt quotes it (``format_rubric``), so the model grades
+  against fixed criteria instead of working out what a good answer contains
+  on every call, and only has to return a score and one line of feedback
+- ``topics_to_cover`` is computed locally: the rubric items the answer does
+  not cover (``missing_items``), with no extra output tokens
+
+Coverage is lexical: an item counts as covered when the answer contains most
+of its content terms (after the same light stemming the local scorer uses).
+"""
+from typing import Any, Dict, List, Optional
+
+from interviews.services.context_builder import QUESTION_WORDS, stem_terms
+
+MAX_KEY_POINTS = 4
+MAX_TOPICS = 4
+MAX_ITEM_WORDS = 12
+# Share of an item's content terms the answer must contain to cover it
+COVERAGE_THRESHOLD = 0.5
+
+
+def _items(value: Any, limit: int) -> List[str]:
+    if isinstance(value, str):
+        value = [part for part in value.replace(';', ',').split(',')]
+    if not isinstance(value, (list, tuple)):
+        return []
+    out: List[str] = []
+    for item in value:
+        words = str(item).split()[:MAX_ITEM_WORDS]
+        text = ' '.join(words).strip(' .')
+        if text and text not in out:
+            out.append(text)
+        if len(out) >= limit:
+            break
+    return out
+
+
+def normalize_rubric(raw: Any) -> Dict[str, List[str]]:
+    """Rubric from model output: ``{"key_points": [...], "topics": [...]}``, trimmed; ``{}`` if none.
+
+    Accepts the ``points``/``key_points`` and ``topics`` spellings, or a bare
+    list of key points.
+    """
+    if isinstance(raw, (list, tuple)):
+        raw = {'key_points': raw}
+    if not isinstance(raw, dict):
+        return {}
+    rubric = {
+        'key_points': _items(raw.get('key_points', raw.get('points')), MAX_KEY_POINTS),
+        'topics': _items(raw.get('topics'), MAX_TOPICS),
+    }
+    return {key: value for key, value in rubric.items() if value}
+
+
+def format_rubric(rubric: Optional[Dict[str, List[str]]]) -> str:
+    """One-line rendering for the evaluation prompt; ``''`` without a rubric."""
+    if not rubric:
+        return ''
+    parts = []
+    if rubric.get('key_points'):
+        parts.append('Key points: ' + '; '.join(rubric['key_points']))
+    if rubric.get('topics'):
+        parts.append('Topics: ' + ', '.join(rubric['topics']))
+    return '. '.join(parts)
+
+
+def _covered(item: str, answer_terms: set) -> bool:
+    terms = {t for t in stem_terms(item) if t not in QUESTION_WORDS}
+    if not terms:
+        return True
+    return len(terms & answer_terms) / len(terms) >= COVERAGE_THRESHOLD
+
+
+def coverage(rubric: Optional[Dict[str, List[str]]], answer: str) -> Optional[float]:
+    """Share of rubric items the answer covers, ``None`` without a rubric."""
+    items = [*(rubric or {}).get('key_points', []), *(rubric or {}).get('topics', [])]
+    if not items:
+        return None
+    answer_terms = set(stem_terms(answer))
+    return sum(_covered(item, answer_terms) for item in items) / len(items)
+
+
+def missing_items(rubric: Optional[Dict[str, List[str]]], answer: str, limit: int = 3) -> List[str]:
+    """Rubric topics, then key points, that the answer does not cover."""
+    answer_terms = set(stem_terms(answer))
+    items = [*(rubric or {}).get('topics', []), *(rubric or {}).get('key_points', [])]
+    return [item for item in items if not _covered(item, answer_terms)][:limit]
+
+
+def topics_to_cover(rubric: Optional[Dict[str, List[str]]], answer: str) -> Optional[str]:
+    """``topics_to_cover`` text from rubric coverage; ``None`` without a rubric."""
+    if not rubric:
+        return None
+    missing = missing_items(rubric, answer)
+    return ', '.join(missing) if missing else 'All key points covered; add depth or a measurable outcome.'
@@ -0,0 +1,382 @@
+"""
+Offline LLM stand-in server emulating the Ollama and Groq (OpenAI) APIs
+
+Lets the whole interview flow run without network access or real models:
+
+- Ollama: ``GET /api/tags``, ``GET /api/ps``, ``POST /api/generate``, ``POST /api/chat``
+- Groq/OpenAI: ``POST /openai/v1/chat/completions`` (also ``/v1/chat/completions``)
+  and ``GET /openai/v1/models``
+
+Responses are canned JSON templated from the prompt (questions, evaluation,
+resume parsing), with configurable latency distributions, error and 429
+injection, streaming (NDJSON for Ollama, SSE for OpenAI) and output-limit
+truncation (``finish_reason``/``done_reason`` = "length").
+
+Point the app at it with ``OLLAMA_HOST=http://127.0.0.1:11435`` or
+``GROQ_API_BASE=http://127.0.0.1:11435`` (any ``GROQ_API_KEY``), and start it
+with ``python manage.py run_llm_stub``.
+"""
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import logging
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\S+\s*|\s+")
+_ROLE = re.compile(r"(?:TARGET ROLE|Role):\s*([^\n]+)")
+_ANSWER = re.compile(r"\nA:\s*(.*)", re.S)
+
+
+@dataclass
+class StubConfig:
+    """Behaviour knobs for the stub server.
+
+    ``latency`` is a distribution spec: ``fixed:0.2``, ``uniform:0.1,0.8``,
+    ``normal:0.5,0.1`` or ``lognormal:-1.0,0.5`` (seconds). ``token_delay`` is
+    the pause between streamed chunks.
+    """
+    latency: str = "fixed:0"
+    token_delay: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: int = 1
+    model: str = "stub-model"
+    seed: Optional[int] = None
+    # Whether ``model`` starts out loaded (reported by /api/ps)
+    preloaded: bool = True
+    # Per-task overrides: {"evaluate_answer": "<json or text with {role}>", ...}
+    responses: Dict[str, str] = field(default_factory=dict)
+
+
+def sample_latency(spec: str, rng: random.Random) -> float:
+    kind, _, args = (spec or "fixed:0").partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()] or [0.0]
+    if kind == "uniform":
+        return rng.uniform(values[0], values[1] if len(values) > 1 else values[0])
+    if kind == "normal":
+        return max(0.0, rng.gauss(values[0], values[1] if len(values) > 1 else 0.0))
+    if kind == "lognormal":
+        return rng.lognormvariate(values[0], values[1] if len(values) > 1 else 0.0)
+    return values[0]
+
+
+def detect_task(prompt: str) -> str:
+    text = prompt.lower()
+    if "was cut off" in text:
+        return "continue"
+    if "evaluate this interview answer" in text or "rate this:" in text or "evaluating a candidate's answers" in text:
+        return "evaluate_answer"
+    if "interview questions" in text:
+        return "generate_questions"
+    if "resume info" in text or "extract information from resume" in text:
+        return "parse_resume"
+    return "chat"
+
+
+def render_response(task: str, prompt: str, config: StubConfig) -> str:
+    """Build a deterministic, plausible reply for ``task``."""
+    role_match = _ROLE.search(prompt)
+    role = role_match.group(1).strip() if role_match else "Software Engineer"
+
+    if task in config.responses:
+        return config.responses[task].replace("{role}", role)
+
+    if task == "generate_questions":
+        technical = [f"Stub technical question {i} for {role}?" for i in range(1, 6)]
+        behavioral = [f"Stub behavioral question {i}?" for i in range(1, 6)]
+        if "rubric" in prompt.lower():
+            rubric = {"points": ["concrete example", "measurable outcome"], "topics": ["trade-offs"]}
+            technical = [{"q": q, **rubric} for q in technical]
+            behavioral = [{"q": q, **rubric} for q in behavioral]
+        return json.dumps({"technical": technical, "behavioral": behavioral})
+    if task == "evaluate_answer":
+        answer_match = _ANSWER.search(prompt)
+        words = len((answer_match.group(1) if answer_match else prompt).split())
+        score = max(2, min(9, 3 + words // 15))
+        evaluation = {"score": score, "feedback": f"Stub evaluation for a {words}-word answer."}
+        if "Rubric:" not in prompt:
+            # With a rubric the app computes topics_to_cover itself
+            evaluation["topics_to_cover"] = ["depth", "examples"]
+        return json.dumps(evaluation)
+    if task == "parse_resume":
+        return json.dumps({
+            "name": "Stub Candidate",
+            "email": "candidate@example.com",
+            "phone": "",
+            "skills": ["python", "django", "sql"],
+            "experience": [],
+            "education": [],
+        })
+    if task == "continue":
+        return "}"
+    return "Hello from the stub LLM."
+
+
+def split_tokens(text: str, limit: Optional[int]) -> Tuple[List[str], bool]:
+    """Whitespace-ish tokens, cut at ``limit``; returns ``(tokens, truncated)``."""
+    tokens = _TOKEN.findall(text)
+    if limit and limit > 0 and len(tokens) > limit:
+        return tokens[:limit], True
+    return tokens, False
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    server_version = "StubLLM/1.0"
+    protocol_version = "HTTP/1.1"
+
+    # ------------------------ plumbing ------------------------
+    @property
+    def config(self) -> StubConfig:
+        return self.server.config
+
+    def log_message(self, fmt, *args):
+        logger.debug("stub-llm: " + fmt, *args)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            return {}
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_stream(self, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_stream(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _client_gone(self):
+        """The client closed a stream early; drop the connection without a traceback."""
+        logger.debug("stub-llm: client closed the stream early")
+        self.close_connection = True
+
+    def _inject_faults(self, openai_style: bool) -> bool:
+        """Sleep for the sampled latency and maybe answer with 429/500."""
+        server = self.server
+        with server.lock:
+            delay = sample_latency(self.config.latency, server.rng)
+            roll = server.rng.random()
+            server.requests_served += 1
+        time.sleep(delay)
+        if roll < self.config.rate_limit_rate:
+            message = "Rate limit reached (stub)"
+            payload = {"error": {"message": message, "type": "rate_limit_exceeded"}} if openai_style else {"error": message}
+            self._send_json(429, payload, {"Retry-After": str(self.config.retry_after)})
+            return True
+        if roll < self.config.rate_limit_rate + self.config.error_rate:
+            payload = {"error": {"message": "Injected failure (stub)", "type": "server_error"}} if openai_style else {"error": "Injected failure (stub)"}
+            self._send_json(500, payload)
+            return True
+        return False
+
+    # ------------------------ routing ------------------------
+    def do_GET(self):
+        path = self.path.split("?")[0].rstrip("/")
+        if path == "/api/tags":
+            self._send_json(200, {"models": [{"name": self.config.model, "model": self.config.model, "size": 0}]})
+        elif path == "/api/ps":
+            with self.server.lock:
+                loaded = sorted(self.server.loaded)
+            self._send_json(200, {"models": [{"name": name, "model": name, "expires_at": "2999-01-01T00:00:00Z"}
+                                             for name in loaded]})
+        elif path in ("/openai/v1/models", "/v1/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": self.config.model, "object": "model"}]})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        path = self.path.split("?")[0].rstrip("/")
+        payload = self._read_json()
+        if path == "/api/generate":
+            self._ollama(payload, chat=False)
+        elif path == "/api/chat":
+            self._ollama(payload, chat=True)
+        elif path in ("/openai/v1/chat/completions", "/v1/chat/completions"):
+            self._openai(payload)
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    # ------------------------ Ollama ------------------------
+    def _ollama(self, payload: Dict[str, Any], chat: bool):
+        if self._inject_faults(openai_style=False):
+            return
+        if chat:
+            prompt = "\n".join(str(m.get("content", "")) for m in payload.get("messages", []))
+        else:
+            prompt = payload.get("prompt", "")
+        model = payload.get("model") or self.config.model
+        limit = (payload.get("options") or {}).get("num_predict")
+        with self.server.lock:
+            if payload.get("keep_alive") in (0, "0", "0s"):
+                self.server.loaded.discard(model)
+            else:
+                self.server.loaded.add(model)
+            self.server.last_options[model] = dict(payload.get("options") or {}, keep_alive=payload.get("keep_alive"))
+        if not prompt and not chat:
+            # Empty prompt = load/keep-alive request
+            self._send_json(200, {"model": model, "response": "", "done": True, "done_reason": "load"})
+            return
+
+        task = detect_task(prompt)
+        tokens, truncated = split_tokens(render_response(task, prompt, self.config), limit)
+        done_reason = "length" if truncated else "stop"
+        # Like Ollama's KV cache: only tokens after the prefix shared with the previous prompt are evaluated
+        prompt_tokens = _TOKEN.findall(prompt)
+        with self.server.lock:
+            cached = 0
+            for previous, current in zip(self.server.last_prompt_tokens.get(model, []), prompt_tokens):
+                if previous != current:
+                    break
+                cached += 1
+            self.server.last_prompt_tokens[model] = prompt_tokens
+        evaluated = len(prompt_tokens) - cached
+        usage = {"prompt_eval_count": evaluated, "prompt_eval_duration": evaluated * 1_000_000,
+                 "eval_count": len(tokens)}
+
+        def frame(text: str, done: bool) -> Dict[str, Any]:
+            body: Dict[str, Any] = {"model": model, "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ"), "done": done}
+            if chat:
+                body["message"] = {"role": "assistant", "content": text}
+            else:
+                body["response"] = text
+            if done:
+                body.update(usage, done_reason=done_reason)
+                if not chat:
+                    body["context"] = [1, 2, 3]
+            return body
+
+        if payload.get("stream", True):
+            self._start_stream("application/x-ndjson")
+            try:
+                for token in tokens:
+                    self._write_chunk((json.dumps(frame(token, False)) + "\n").encode())
+                    if self.config.token_delay:
+                        time.sleep(self.config.token_delay)
+                self._write_chunk((json.dumps(frame("", True)) + "\n").encode())
+                self._end_stream()
+            except (BrokenPipeError, ConnectionResetError):
+                self._client_gone()
+        else:
+            self._send_json(200, frame("".join(tokens), True))
+
+    # ------------------------ OpenAI / Groq ------------------------
+    def _openai(self, payload: Dict[str, Any]):
+        if self._inject_faults(openai_style=True):
+            return
+        with self.server.lock:
+            self.server.last_chat_request = payload
+        messages = payload.get("messages", [])
+        prompt = "\n".join(str(m.get("content", "")) for m in messages)
+        model = payload.get("model") or self.config.model
+        task = detect_task(prompt)
+        tokens, truncated = split_tokens(
+            render_response(task, prompt, self.config),
+            payload.get("max_tokens") or payload.get("max_completion_tokens"),
+        )
+        finish_reason = "length" if truncated else "stop"
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        usage = {
+            "prompt_tokens": len(_TOKEN.findall(prompt)),
+            "completion_tokens": len(tokens),
+            "total_tokens": len(_TOKEN.findall(prompt)) + len(tokens),
+        }
+
+        if payload.get("stream"):
+            self._start_stream("text/event-stream")
+            try:
+                for i, token in enumerate(tokens):
+                    delta = {"content": token} if i else {"role": "assistant", "content": token}
+                    chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                             "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+                    self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+                    if self.config.token_delay:
+                        time.sleep(self.config.token_delay)
+                final = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                         "model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": finish_reason}],
+                         "x_groq": {"id": completion_id, "usage": usage}}
+                self._write_chunk(f"data: {json.dumps(final)}\n\n".encode())
+                self._write_chunk(b"data: [DONE]\n\n")
+                self._end_stream()
+            except (BrokenPipeError, ConnectionResetError):
+                self._client_gone()
+            return
+
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(tokens)},
+                "finish_reason": finish_reason,
+            }],
+            "usage": usage,
+        })
+
+
+class StubLLMServer(ThreadingHTTPServer):
+    """Threaded stub server; use ``start()``/``stop()`` from tests or benchmarks."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: Optional[StubConfig] = None):
+        super().__init__((host, port), StubLLMHandler)
+        self.config = config or StubConfig()
+        self.rng = random.Random(self.config.seed)
+        self.lock = threading.Lock()
+        self.requests_served = 0
+        # Models Ollama would hold in memory, and the last options/keep_alive seen per model
+        self.loaded = {self.config.model} if self.config.preloaded else set()
+        self.last_options: Dict[str, Dict[str, Any]] = {}
+        self.last_prompt_tokens: Dict[str, List[str]] = {}
+        # Body of the last OpenAI-style chat completion request
+        self.last_chat_request: Dict[str, Any] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="stub-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def evict(self, model: Optional[str] = None) -> None:
+        """Simulate Ollama unloading ``model`` (idle timeout or memory pressure)."""
+        with self.lock:
+            self.loaded.discard(model or self.config.model)
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
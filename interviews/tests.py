@@ -1,5 +1,10 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from types import SimpleNamespace
 from unittest.mock import patch, Mock
+
+from django.test import TestCase, TransactionTestCase, override_settings
 from .services.ollama_engine import OllamaEngine
 
 
@@ -11,12 +16,20 @@ def _make_response(text, status=200):
     return m
 
 
+def _ai_service(**env):
+    """A fresh AIService configured from ``env`` (on top of the real environment)."""
+    from .services.ai_service import AIService
+    with patch.dict(os.environ, env):
+        return AIService()
+
+
 class OllamaEngineTests(TestCase):
 
     def test_parse_resume_success(self):
         engine = OllamaEngine()
         sample_json = '{"name":"Alice","email":"alice@example.com","skills":["Python"]}'
-        with patch('requests.post') as post:
+        with patch('interviews.services.ollama_engine.get_http_client') as client:
+            post = client.return_value.post
             post.return_value = _make_response(sample_json)
             parsed = engine.parse_resume('dummy resume')
             self.assertEqual(parsed.get('name'), 'Alice')
@@ -26,7 +39,8 @@ class OllamaEngineTests(TestCase):
     def test_generate_questions_success(self):
         engine = OllamaEngine()
         resp_json = '{"technical": ["t1","t2","t3","t4","t5"], "behavioral": ["b1","b2","b3","b4","b5"]}'
-        with patch('requests.post') as post:
+        with patch('interviews.services.ollama_engine.get_http_client') as client:
+            post = client.return_value.post
             post.return_value = _make_response(resp_json)
             questions = engine.generate_questions('jd', 'role', ['skill1'])
             self.assertEqual(len(questions), 10)
@@ -36,7 +50,8 @@ class OllamaEngineTests(TestCase):
     def test_evaluate_answer_success(self):
         engine = OllamaEngine()
         resp_json = '{"score": 8, "feedback": "Good answer", "topics_to_cover": "topic1"}'
-        with patch('requests.post') as post:
+        with patch('interviews.services.ollama_engine.get_http_client') as client:
+            post = client.return_value.post
             post.return_value = _make_response(resp_json)
             out = engine.evaluate_answer('q','a','role')
             self.assertEqual(out['score'], 8)
@@ -44,13 +59,1149 @@ class OllamaEngineTests(TestCase):
 
     def test_is_available_true(self):
         engine = OllamaEngine()
-        with patch('requests.get') as get:
+        with patch('interviews.services.ollama_engine.get_http_client') as client:
+            get = client.return_value.get
             get.return_value = Mock(status_code=200)
             self.assertTrue(engine.is_available())
 
     def test_is_available_false(self):
         engine = OllamaEngine()
-        with patch('requests.get') as get:
+        with patch('interviews.services.ollama_engine.get_http_client') as client:
+            get = client.return_value.get
             get.side_effect = Exception('no')
             self.assertFalse(engine.is_available())
 
+
+
+class SQLiteConcurrencyBenchTests(TestCase):
+
+    def test_tuned_profile_has_no_lock_errors(self):
+        from django.conf import settings
+        from .management.commands.bench_sqlite_concurrency import run_profile
+
+        result = run_profile(settings.SQLITE_TUNED_OPTIONS, sessions=12, questions=5, workers=6)
+        self.assertEqual(result['completed'], 12)
+        self.assertEqual(result['lock_errors'], 0)
+
+
+class SharedHttpClientTests(TestCase):
+
+    def tearDown(self):
+        from .services import http_client
+        http_client.reset()
+
+    def test_clients_share_one_transport(self):
+        from .services import http_client
+
+        client = http_client.get_http_client()
+        self.assertIs(client, http_client.get_http_client())
+        kwargs = http_client.ollama_client_kwargs()
+        self.assertIs(kwargs['sync_client_kwargs']['transport'], http_client.get_transport())
+        self.assertNotIn('transport', kwargs['client_kwargs'])
+        self.assertIs(http_client.groq_http_client()._transport, http_client.get_transport())
+
+    def test_reset_drops_pool(self):
+        from .services import http_client
+
+        transport = http_client.get_transport()
+        http_client.reset()
+        self.assertIsNot(http_client.get_transport(), transport)
+
+    def test_ai_service_probe_uses_shared_client(self):
+        from .services.ai_service import AIService
+
+        with patch.dict('os.environ', {'AI_PROVIDER': 'ollama'}):
+            service = AIService()
+        with patch('interviews.services.ai_service.get_http_client') as client:
+            client.return_value.get.return_value = Mock(status_code=200)
+            self.assertTrue(service.is_available())
+            self.assertTrue(client.return_value.get.call_args[0][0].endswith('/api/tags'))
+
+
+class ContextBuilderTests(TestCase):
+
+    def test_short_text_is_returned_unchanged(self):
+        from .services.context_builder import pack
+        self.assertEqual(pack('Built   APIs in Django.', 50), 'Built APIs in Django.')
+
+    def test_pack_respects_budget_and_prefers_relevant_sentences(self):
+        from .services.context_builder import build_keywords, estimate_tokens, pack
+
+        filler = ' '.join(f'I enjoy hiking and cooking on weekend number {i}.' for i in range(40))
+        text = f'Jane Doe. {filler} Built Django REST services on PostgreSQL for payments. {filler}'
+        packed = pack(text, 60, build_keywords('Backend Engineer', ['Django', 'PostgreSQL']), keep_head=1)
+
+        self.assertLessEqual(estimate_tokens(packed), 60)
+        self.assertTrue(packed.startswith('Jane Doe.'))
+        self.assertIn('Built Django REST services on PostgreSQL', packed)
+
+    def test_run_on_text_is_windowed(self):
+        from .services.context_builder import split_sentences
+        chunks = split_sentences('word ' * 100, max_words=40)
+        self.assertEqual([len(c.split()) for c in chunks], [40, 40, 20])
+
+    def test_generation_context_fits_task_budgets(self):
+        from .services.context_builder import budget_for, build_generation_context, estimate_tokens
+
+        long_text = 'Python Django developer with Kubernetes experience. ' * 200
+        ctx = build_generation_context(long_text, long_text, 'Python Developer', ['django'])
+        task = 'generate_questions_from_context'
+        self.assertLessEqual(estimate_tokens(ctx['job_description']), budget_for(task, 'job_description'))
+        self.assertLessEqual(estimate_tokens(ctx['resume']), budget_for(task, 'resume'))
+
+
+class JSONParserTests(TestCase):
+
+    def test_prose_and_code_fences_are_skipped(self):
+        from .services.json_parser import parse_json_lenient
+        data, repaired = parse_json_lenient('Sure!\n```json\n{"score": 8, "topics": ["a",]}\n```\nHope this helps {}')
+        self.assertEqual(data, {'score': 8, 'topics': ['a']})
+        self.assertFalse(repaired)
+
+    def test_truncated_object_is_repaired_at_last_complete_value(self):
+        from .services.json_parser import parse_json_lenient
+        data, repaired = parse_json_lenient('{"technical": ["q1", "q2"], "behavioral": ["b1", "b2 is cut of')
+        self.assertTrue(repaired)
+        self.assertEqual(data['technical'], ['q1', 'q2'])
+        self.assertEqual(data['behavioral'][0], 'b1')
+
+    def test_parser_reports_completion_while_streaming(self):
+        from .services.json_parser import IncrementalJSONParser
+        parser = IncrementalJSONParser()
+        self.assertFalse(parser.feed('Here: {"feedback": "use } and { freely'))
+        self.assertTrue(parser.feed('", "score": 7}   trailing'))
+        self.assertEqual(parser.result(), ({'feedback': 'use } and { freely', 'score': 7}, False))
+
+
+class AIServiceStructuredOutputTests(TestCase):
+
+    def _service(self, *replies):
+        from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+        from langchain_core.messages import AIMessage
+
+        service = _ai_service(AI_PROVIDER='ollama')
+        service.llm = GenericFakeChatModel(messages=iter([AIMessage(content=r) for r in replies]))
+        return service
+
+    def setUp(self):
+        from .services.json_parser import parse_stats
+        parse_stats.reset()
+
+    def test_stream_stops_once_object_is_complete(self):
+        from langchain_core.messages import AIMessageChunk
+
+        consumed = []
+
+        def stream(messages):
+            try:
+                for token in ['{"score": 9, ', '"feedback": "Great"}', ' and then', ' more tokens']:
+                    consumed.append(token)
+                    yield AIMessageChunk(content=token)
+            finally:
+                consumed.append('closed')
+
+        service = self._service()
+        with patch.object(service, '_bound_llm', return_value=SimpleNamespace(stream=stream)):
+            text = service._invoke('evaluate_answer', [])
+        self.assertEqual(text, '{"score": 9, "feedback": "Great"}')
+        self.assertEqual(consumed, ['{"score": 9, ', '"feedback": "Great"}', 'closed'])
+
+    def test_truncated_evaluation_is_repaired_and_counted(self):
+        from .services.json_parser import parse_stats
+
+        service = self._service('{"score": 4, "feedback": "Too short", "topics_to_cover": ["de')
+        result = service.evaluate_answer('What is REST?', 'An API.', 'Backend Engineer')
+        self.assertEqual(result['score'], 4)
+        self.assertEqual(parse_stats.snapshot()['evaluate_answer']['repaired'], 1)
+
+    def test_unparseable_output_records_failure(self):
+        from .services.json_parser import parse_stats
+
+        service = self._service('I cannot answer that.')
+        result = service.evaluate_answer('q', 'a', 'role')
+        self.assertEqual((result['source'], result['score']), ('local', 1))
+        self.assertEqual(parse_stats.snapshot()['evaluate_answer']['failed'], 1)
+
+
+class GenerationProfileTests(TestCase):
+
+    def test_profiles_differ_per_task_and_env_overrides(self):
+        from .services.generation_profiles import get_profile
+
+        self.assertGreater(get_profile('generate_questions_from_context').max_tokens,
+                           get_profile('evaluate_answer').max_tokens)
+        with patch.dict('os.environ', {'AI_MAX_TOKENS_EVALUATE_ANSWER': '99'}):
+            self.assertEqual(get_profile('evaluate_answer').max_tokens, 99)
+
+    def test_truncated_generation_is_continued(self):
+        from .services.ai_service import AIService
+        from .services.stub_llm_server import StubConfig, StubLLMServer
+
+        # Four whitespace tokens end after "b2"; the continuation supplies the rest
+        server = StubLLMServer(config=StubConfig(responses={
+            'generate_questions': '{"technical": ["t1","t2","t3","t4","t5"], "behavioral": ["b1","b2", "b3","b4","b5"]}',
+            'continue': '"b3","b4","b5"]}',
+        })).start()
+        self.addCleanup(server.stop)
+        with patch.dict('os.environ', {'AI_PROVIDER': 'ollama', 'OLLAMA_HOST': server.url,
+                                       'AI_MAX_TOKENS_GENERATE_QUESTIONS_FROM_CONTEXT': '4'}):
+            service = AIService()
+            questions = service.generate_questions_from_context('jd', 'Engineer', 'resume', ['python'])
+        self.assertEqual([q['question_text'] for q in questions][5:], ['b1', 'b2', 'b3', 'b4', 'b5'])
+
+    def test_ollama_engine_sends_task_budget(self):
+        from .services.generation_profiles import get_profile
+
+        engine = OllamaEngine()
+        with patch('interviews.services.ollama_engine.get_http_client') as client:
+            client.return_value.post.return_value = _make_response('{"score": 5}')
+            engine.evaluate_answer('q', 'a', 'role')
+            options = client.return_value.post.call_args.kwargs['json']['options']
+        self.assertEqual(options['num_predict'], get_profile('evaluate_answer').max_tokens)
+
+
+class StubLLMServerTests(TestCase):
+
+    def setUp(self):
+        from .services.stub_llm_server import StubLLMServer
+        self.server = StubLLMServer().start()
+        self.addCleanup(self.server.stop)
+
+    def test_ollama_flow_against_stub(self):
+        service = _ai_service(AI_PROVIDER='ollama', OLLAMA_HOST=self.server.url)
+        self.assertTrue(service.is_available())
+        questions = service.generate_questions_from_context('Build APIs', 'Data Engineer', 'Python dev', ['python'])
+        self.assertEqual(len(questions), 10)
+        self.assertIn('Data Engineer', questions[0]['question_text'])
+        result = service.evaluate_answer('What is an index?', 'A B-tree on a column ' * 10, 'Data Engineer')
+        self.assertIn('Stub evaluation', result['feedback'])
+
+    def test_groq_compatible_endpoint(self):
+        service = _ai_service(AI_PROVIDER='groq', GROQ_API_KEY='stub', GROQ_API_BASE=self.server.url)
+        self.assertEqual(service.provider, 'groq')
+        self.assertEqual(service.parse_resume('Jane Doe, jane@example.com. Python, Django.')['name'], 'Stub Candidate')
+
+    def test_groq_json_mode_is_not_streamed_or_stopped(self):
+        service = _ai_service(AI_PROVIDER='groq', GROQ_API_KEY='stub', GROQ_API_BASE=self.server.url)
+        self.assertEqual(service.parse_resume('Jane Doe, Python.')['name'], 'Stub Candidate')
+        sent = self.server.last_chat_request
+        self.assertEqual(sent['response_format'], {'type': 'json_object'})
+        self.assertIsNone(sent.get('stop'))
+        self.assertFalse(sent.get('stream'))
+
+        service = _ai_service(AI_PROVIDER='groq', GROQ_API_KEY='stub', GROQ_API_BASE=self.server.url,
+                              AI_JSON_MODE='False')
+        self.assertEqual(service.parse_resume('Jane Doe, Python.')['name'], 'Stub Candidate')
+        sent = self.server.last_chat_request
+        self.assertNotIn('response_format', sent)
+        self.assertEqual((sent['stop'], sent['stream']), (['\n```'], True))
+
+    def test_client_closing_stream_early_is_quiet(self):
+        import httpx
+        import time
+        self.server.config.token_delay = 0.005
+        with patch.object(self.server, 'handle_error') as handle_error:
+            for path, body in (('/api/chat', {'messages': [{'content': 'Generate 10 interview questions'}]}),
+                               ('/openai/v1/chat/completions',
+                                {'stream': True, 'messages': [{'content': 'Generate 10 interview questions'}]})):
+                with httpx.stream('POST', f'{self.server.url}{path}', json=body) as resp:
+                    next(resp.iter_lines())
+            time.sleep(0.5)  # let the handlers hit the closed sockets
+        handle_error.assert_not_called()
+
+    def test_rate_limit_injection(self):
+        import httpx
+        self.server.config.rate_limit_rate = 1.0
+        resp = httpx.post(f'{self.server.url}/openai/v1/chat/completions', json={'messages': []})
+        self.assertEqual(resp.status_code, 429)
+        self.assertEqual(resp.headers['Retry-After'], '1')
+
+    def test_output_limit_reports_length(self):
+        import httpx
+        resp = httpx.post(f'{self.server.url}/api/generate', json={
+            'prompt': 'Generate 10 interview questions', 'stream': False, 'options': {'num_predict': 5}})
+        self.assertEqual(resp.json()['done_reason'], 'length')
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'], EVALUATION_WORKERS=0,
+                   RESUME_CACHE_DIR=os.path.join(tempfile.gettempdir(), 'careerflow-test-resume-cache'))
+class InterviewBenchmarkTests(TransactionTestCase):
+
+    def test_full_session_is_benchmarked(self):
+        from django.contrib.auth.models import User
+        from .management.commands.bench_interviews import cleanup, run_benchmark
+
+        results = run_benchmark(sessions=1, concurrency=1, answers=3)
+        self.assertEqual(results['totals']['completed'], 1, results['failures'])
+        self.assertEqual(results['endpoints']['submit_answer']['count'], 3)
+        self.assertGreater(results['endpoints']['interview_setup']['db_queries_mean'], 0)
+        self.assertIn('p99_ms', results['endpoints']['interview_feedback'])
+
+        cleanup(results['run_id'])
+        self.assertFalse(User.objects.filter(username__startswith='bench-').exists())
+
+
+class CassetteTests(TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.path = os.path.join(tempfile.mkdtemp(), 'ai.jsonl')
+
+    def _service(self, **env):
+        return _ai_service(AI_PROVIDER='ollama', AI_CASSETTE_PATH=self.path, **env)
+
+    def test_record_then_replay_without_provider(self):
+        from .services.stub_llm_server import StubLLMServer
+
+        server = StubLLMServer().start()
+        try:
+            recorder = self._service(AI_CASSETTE_MODE='record', OLLAMA_HOST=server.url)
+            recorded = recorder.evaluate_answer('What is caching?', 'Keeping hot data in memory.', 'SRE')
+        finally:
+            server.stop()
+
+        with open(self.path) as f:
+            entry = json.loads(f.readline())
+        self.assertEqual(entry['task'], 'evaluate_answer')
+        self.assertEqual(entry['provider'], 'ollama')
+        self.assertIn('latency_ms', entry)
+        self.assertEqual(entry['messages'][0]['role'], 'system')
+
+        player = self._service(AI_CASSETTE_MODE='replay', AI_CASSETTE_TIMING='none', OLLAMA_HOST='http://127.0.0.1:9')
+        self.assertTrue(player.is_available())
+        self.assertEqual(player.evaluate_answer('What is caching?', 'Keeping hot data in memory.', 'SRE'), recorded)
+
+    def test_replay_scales_timing_and_misses_fall_back(self):
+        from .services.cassette import Cassette, exchange_key, serialize_messages
+        from langchain_core.messages import HumanMessage
+
+        messages = [HumanMessage(content='hi')]
+        with open(self.path, 'w') as f:
+            f.write(json.dumps({'key': exchange_key('chat', serialize_messages(messages)),
+                                'response': 'hello', 'latency_ms': 2000}) + '\n')
+        cassette = Cassette(self.path, mode='replay', timing='0.5')
+        with patch('interviews.services.cassette.time.sleep') as sleep:
+            self.assertEqual(cassette.replay('chat', messages)['response'], 'hello')
+        sleep.assert_called_once_with(1.0)
+
+        player = self._service(AI_CASSETTE_MODE='replay')
+        self.assertEqual(player.evaluate_answer('unseen', 'answer', 'role')['source'], 'local')
+
+
+class LazyAIServiceTests(TestCase):
+
+    def test_client_is_built_on_first_use(self):
+        from .services.ai_service import AIService
+        with patch.dict(os.environ, {'AI_PROVIDER': 'ollama'}):
+            service = AIService()
+        self.assertNotIn('llm', service.__dict__)
+        self.assertEqual(type(service.llm).__name__, 'ChatOllama')
+        self.assertIs(service.llm, service.llm)
+
+    def test_startup_does_not_import_provider_packages(self):
+        from .management.commands.bench_startup import measure_setup
+        self.assertEqual(measure_setup()['modules'], [])
+
+
+class PreforkTests(TestCase):
+
+    def test_http_pool_is_abandoned_in_forked_child(self):
+        from .services import http_client
+        parent = http_client.get_http_client()
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0 if http_client.get_http_client() is not parent else 1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        self.assertIs(http_client.get_http_client(), parent)
+
+    def test_warm_imports_backend_without_building_clients(self):
+        from django.utils.functional import SimpleLazyObject
+        from core import prefork
+        from .services.ai_service import AIService
+        with patch.dict(os.environ, {'AI_PROVIDER': 'ollama'}):
+            service = AIService()
+        lazy = SimpleLazyObject(lambda: service)
+        with patch('interviews.services.ai_service.ai_service', lazy), patch('django.db.connections') as connections:
+            connections.all.return_value = []
+            prefork.warm()
+            service.llm
+            prefork.after_fork()
+        connections.close_all.assert_called_once()
+        self.assertNotIn('llm', service.__dict__)
+
+
+class OllamaResidencyTests(TestCase):
+
+    def setUp(self):
+        from .services.stub_llm_server import StubConfig, StubLLMServer
+        self.server = StubLLMServer(config=StubConfig(preloaded=False)).start()
+        self.addCleanup(self.server.stop)
+
+    def _residency(self, **env):
+        from .services.ollama_residency import OllamaResidency
+        with patch.dict(os.environ, env):
+            return OllamaResidency(self.server.url, 'stub-model')
+
+    def test_warm_pins_model_with_shared_context(self):
+        residency = self._residency(OLLAMA_KEEP_ALIVE='-1')
+        self.assertFalse(residency.is_loaded())
+        self.assertTrue(residency.warm())
+        self.assertTrue(residency.is_loaded())
+        self.assertEqual(self.server.last_options['stub-model'], {'num_ctx': 2048, 'keep_alive': -1})
+
+    def test_evicted_model_is_rewarmed_once_per_interval(self):
+        residency = self._residency(OLLAMA_RESIDENCY_CHECK='60')
+        residency.ensure_warm()
+        self.assertTrue(residency.is_loaded())
+        self.server.evict()
+        residency.ensure_warm()
+        self.assertFalse(residency.is_loaded())
+        residency._last_check = 0.0
+        residency.ensure_warm()
+        self.assertTrue(residency.is_loaded())
+
+    def test_ai_service_requests_carry_keep_alive_and_num_ctx(self):
+        from .services.ai_service import AIService
+        with patch.dict(os.environ, {'AI_PROVIDER': 'ollama', 'OLLAMA_HOST': self.server.url,
+                                     'OLLAMA_MODEL': 'stub-model', 'OLLAMA_KEEP_ALIVE': '30m'}):
+            service = AIService()
+        service.evaluate_answer('What is an index?', 'A B-tree.', 'Data Engineer')
+        options = self.server.last_options['stub-model']
+        self.assertEqual(options['num_ctx'], 2048)
+        self.assertEqual(options['keep_alive'], '30m')
+
+    def test_keep_alive_parsing(self):
+        from .services.ollama_residency import parse_keep_alive
+        self.assertEqual(parse_keep_alive(None), -1)
+        self.assertEqual(parse_keep_alive('3600'), 3600)
+        self.assertEqual(parse_keep_alive('30m'), '30m')
+
+
+class EvaluationContextTests(TestCase):
+
+    def setUp(self):
+        from .services.stub_llm_server import StubLLMServer
+        self.server = StubLLMServer().start()
+        self.addCleanup(self.server.stop)
+
+    def _service(self, provider):
+        return _ai_service(AI_PROVIDER=provider, OLLAMA_HOST=self.server.url, OLLAMA_MODEL='stub-model',
+                           GROQ_API_KEY='stub', GROQ_API_BASE=self.server.url)
+
+    def test_session_prefix_is_rendered_once_and_bounded(self):
+        from .services.evaluation_context import EvaluationContextCache
+        cache = EvaluationContextCache(capacity=2)
+        jd = 'Build batch pipelines in Spark. ' * 50
+        first = cache.get(1, 'Data Engineer', jd)
+        self.assertIs(cache.get(1, 'Data Engineer', jd), first)
+        self.assertIn('Role: Data Engineer', first.system_prompt)
+        edited = cache.get(1, 'Data Engineer', 'Build streaming pipelines in Flink.')
+        self.assertIn('Flink', edited.system_prompt)
+        first = cache.get(1, 'Data Engineer', jd)
+        cache.get(2, 'QA'), cache.get(3, 'QA')
+        self.assertEqual(len(cache), 2)
+        self.assertIsNot(cache.get(1, 'Data Engineer'), first)
+
+    def test_ollama_reuses_prefix_across_session_evaluations(self):
+        from .services.evaluation_context import EvaluationContext
+        service = self._service('ollama')
+        context = EvaluationContext.build(7, 'Data Engineer', 'Own ingestion pipelines, Airflow and Spark. ' * 20)
+        evaluated = []
+        with patch('core.metrics.record_prompt_eval') as record:
+            for question in ('What is a DAG?', 'How do you partition data?'):
+                result = service.evaluate_answer(question, 'Directed acyclic graph of tasks.', 'Data Engineer', context)
+                self.assertIn('Stub evaluation', result['feedback'])
+                evaluated.append(record.call_args.args[2]['prompt_eval_seconds'])
+        self.assertLess(evaluated[1], evaluated[0] / 3)
+
+    def test_groq_keeps_compact_prompt(self):
+        from .services.evaluation_context import EvaluationContext
+        service = self._service('groq')
+        self.assertFalse(service.reuses_prompt_prefix)
+        context = EvaluationContext.build(7, 'Data Engineer', 'Own ingestion pipelines.')
+        with patch.object(service, '_invoke', return_value='{"score": 8}') as invoke:
+            service.evaluate_answer('What is a DAG?', 'A graph.', 'Data Engineer', context)
+        messages = invoke.call_args.args[1]
+        self.assertNotIn('Job summary', messages[0].content)
+
+
+@override_settings(RESUME_UPLOAD_BACKGROUND=False, MEDIA_ROOT=os.path.join(tempfile.gettempdir(), 'careerflow-test-media'),
+                   RESUME_CACHE_DIR=os.path.join(tempfile.gettempdir(), 'careerflow-test-resume-cache'))
+class ResumeUploadTests(TestCase):
+
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from .management.commands.bench_interviews import make_resume_docx
+        self.user = User.objects.create_user('candidate', password='pw12345!')
+        self.client.login(username='candidate', password='pw12345!')
+        self.docx = make_resume_docx()
+
+    def _upload(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        resume = SimpleUploadedFile('cv.docx', self.docx)
+        with patch('interviews.services.ai_service.ai_service') as ai, \
+                self.captureOnCommitCallbacks(execute=True):
+            ai.parse_resume.return_value = {'skills': ['Python', 'Django']}
+            return self.client.post('/interview/resume/upload/', {'resume': resume})
+
+    def test_upload_is_hashed_and_processed(self):
+        import hashlib
+        from .models import ResumeUpload
+        resp = self._upload()
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.json()['sha256'], hashlib.sha256(self.docx).hexdigest())
+        upload = ResumeUpload.objects.get(pk=resp.json()['upload_id'])
+        self.assertEqual(upload.status, 'ready')
+        self.assertEqual(upload.size, len(self.docx))
+        self.assertIn('Senior Backend Engineer', upload.text)
+        self.assertEqual(upload.skills, ['Python', 'Django'])
+
+    def test_upload_is_hashed_while_received(self):
+        import hashlib
+        with patch('interviews.services.resume_blobs.hash_file') as hash_file:
+            resp = self._upload()
+        hash_file.assert_not_called()
+        self.assertEqual(resp.json()['sha256'], hashlib.sha256(self.docx).hexdigest())
+
+    def test_rejects_unsupported_files(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        resp = self.client.post('/interview/resume/upload/', {'resume': SimpleUploadedFile('cv.txt', b'hi')})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_setup_reuses_processed_upload(self):
+        from .models import InterviewSession
+        upload_id = self._upload().json()['upload_id']
+        with patch('interviews.services.ai_service.ai_service') as ai, \
+                patch('interviews.models.extract_text') as extract:
+            ai.is_available.return_value = True
+            ai.generate_questions_from_context.return_value = [
+                {'question_text': 'Q1', 'question_type': 'technical', 'order': 1}]
+            resp = self.client.post('/interview/setup/', {
+                'job_description': 'Backend role', 'role_title': 'Backend Engineer', 'resume_upload': upload_id})
+        session = InterviewSession.objects.get(user=self.user)
+        self.assertRedirects(resp, f'/interview/{session.id}/', fetch_redirect_response=False)
+        self.assertEqual(session.resume_upload_id, upload_id)
+        extract.assert_not_called()
+        ai.parse_resume.assert_not_called()
+        kwargs = ai.generate_questions_from_context.call_args.kwargs
+        self.assertIn('Senior Backend Engineer', kwargs['resume_text'])
+        self.assertEqual(kwargs['parsed_skills'], ['Python', 'Django'])
+
+    def test_setup_waits_for_unfinished_upload_once(self):
+        from .models import ResumeUpload
+        upload_id = self._upload().json()['upload_id']
+        ResumeUpload.objects.filter(pk=upload_id).update(status='processing')
+        with patch('interviews.services.ai_service.ai_service') as ai, \
+                patch('interviews.services.resume_uploads.wait_for_processing', return_value=None) as wait:
+            ai.is_available.return_value = True
+            ai.generate_questions_from_context.return_value = [
+                {'question_text': 'Q1', 'question_type': 'technical', 'order': 1}]
+            self.client.post('/interview/setup/', {
+                'job_description': 'Backend role', 'role_title': 'Backend Engineer', 'resume_upload': upload_id})
+        wait.assert_called_once()
+        self.assertIn('Senior Backend Engineer', ai.generate_questions_from_context.call_args.kwargs['resume_text'])
+
+    def test_setup_rejects_other_users_upload(self):
+        from django.contrib.auth.models import User
+        upload_id = self._upload().json()['upload_id']
+        User.objects.create_user('other', password='pw12345!')
+        self.client.login(username='other', password='pw12345!')
+        resp = self.client.post('/interview/setup/', {
+            'job_description': 'x', 'role_title': 'y', 'resume_upload': upload_id})
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, 'could not be found')
+
+
+@override_settings(RESUME_UPLOAD_BACKGROUND=False, MEDIA_ROOT=os.path.join(tempfile.gettempdir(), 'careerflow-test-media'),
+                   RESUME_CACHE_DIR=os.path.join(tempfile.gettempdir(), 'careerflow-test-resume-cache'))
+class ResumeBlobTests(TestCase):
+
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from .management.commands.bench_interviews import make_resume_docx
+        self.user = User.objects.create_user('candidate', password='pw12345!')
+        self.client.login(username='candidate', password='pw12345!')
+        self.docx = make_resume_docx()
+
+    def _setup_session(self, **data):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        data.setdefault('resume', SimpleUploadedFile('cv.docx', self.docx))
+        with patch('interviews.services.ai_service.ai_service') as ai:
+            ai.is_available.return_value = False
+            return self.client.post('/interview/setup/', {
+                'job_description': 'Backend role', 'role_title': 'Backend Engineer', **data})
+
+    def test_same_content_is_stored_once(self):
+        import hashlib
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from .models import InterviewSession, ResumeBlob, ResumeUpload
+        with patch('interviews.services.ai_service.ai_service'), self.captureOnCommitCallbacks(execute=True):
+            upload_id = self.client.post('/interview/resume/upload/', {
+                'resume': SimpleUploadedFile('first.docx', self.docx)}).json()['upload_id']
+        self._setup_session()
+        self._setup_session(resume_upload=upload_id, resume='')
+
+        blob = ResumeBlob.objects.get()
+        self.assertEqual(blob.sha256, hashlib.sha256(self.docx).hexdigest())
+        self.assertEqual(blob.ref_count, 3)  # the upload and both sessions
+        self.assertTrue(blob.file.name.startswith(f'resumes/sha256/{blob.sha256[:2]}/'))
+        for session in InterviewSession.objects.all():
+            self.assertEqual((session.resume.name, session.resume_sha256), (blob.file.name, blob.sha256))
+        self.assertEqual(ResumeUpload.objects.get().file.name, blob.file.name)
+
+    def test_unreferenced_blobs_are_collected(self):
+        from datetime import timedelta
+        from io import StringIO
+        from django.core.management import call_command
+        from .models import InterviewSession, ResumeBlob
+        self._setup_session()
+        blob = ResumeBlob.objects.get()
+        storage, name = blob.file.storage, blob.file.name
+
+        InterviewSession.objects.all().delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 0)
+        self.assertIsNotNone(blob.released_at)
+
+        out = StringIO()
+        call_command('gc_resumes', stdout=out)  # still within the grace period
+        self.assertIn('Deleted 0 resume blobs', out.getvalue())
+        ResumeBlob.objects.update(released_at=blob.released_at - timedelta(days=2))
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('gc_resumes', stdout=out)
+        self.assertFalse(ResumeBlob.objects.exists())
+        self.assertFalse(storage.exists(name))
+
+    def test_recount_repairs_drifted_counts(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .models import ResumeBlob
+        from .services.resume_blobs import collect_garbage, recount
+        self._setup_session()
+        ResumeBlob.objects.update(ref_count=0, released_at=timezone.now() - timedelta(days=2))
+        # A referenced blob survives GC even with a wrong count
+        self.assertEqual(collect_garbage(timedelta(0)), (0, 0))
+        self.assertEqual(recount(), 1)
+        self.assertEqual(ResumeBlob.objects.get().ref_count, 1)
+
+    def test_adopt_legacy_keeps_shared_file_until_every_row_moved(self):
+        from django.core.files.base import ContentFile
+        from django.core.files.storage import default_storage
+        from .models import InterviewSession, ResumeBlob, ResumeUpload
+        from .services.resume_blobs import adopt_legacy_sessions
+        name = default_storage.save('resumes/legacy.docx', ContentFile(self.docx))
+        upload = ResumeUpload.objects.create(user=self.user, file=name, original_name='legacy.docx')
+        for _ in range(2):
+            InterviewSession.objects.create(user=self.user, role_title='Backend Engineer', job_description='APIs',
+                                            resume=name, resume_upload=upload)
+
+        self.assertEqual(adopt_legacy_sessions(), (3, 1))
+        blob = ResumeBlob.objects.get()
+        self.assertEqual(blob.ref_count, 3)
+        self.assertEqual(set(InterviewSession.objects.values_list('resume_blob', 'resume')), {(blob.pk, blob.file.name)})
+        upload.refresh_from_db()
+        self.assertEqual((upload.blob_id, upload.file.name, upload.size), (blob.pk, blob.file.name, blob.size))
+        self.assertFalse(default_storage.exists(name))
+        self.assertTrue(blob.file.storage.exists(blob.file.name))
+
+    def test_setup_failure_does_not_leak_a_reference(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from .models import InterviewSession, ResumeBlob
+        with patch('interviews.services.ai_service.ai_service'), self.captureOnCommitCallbacks(execute=True):
+            upload_id = self.client.post('/interview/resume/upload/', {
+                'resume': SimpleUploadedFile('first.docx', self.docx)}).json()['upload_id']
+        with patch.object(InterviewSession, 'save', side_effect=RuntimeError('db down')):
+            with self.assertRaises(RuntimeError), self.assertLogs('django.request', 'ERROR'):
+                self._setup_session(resume_upload=upload_id, resume='')
+        self.assertEqual(ResumeBlob.objects.get().ref_count, 1)
+
+    def test_failed_upload_does_not_leak_a_reference(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from .models import ResumeBlob, ResumeUpload
+        from .services.resume_uploads import save_upload
+        self._setup_session()
+        with patch.object(ResumeUpload.objects, 'create', side_effect=RuntimeError('db down')):
+            with self.assertRaises(RuntimeError):
+                save_upload(self.user, SimpleUploadedFile('cv.docx', self.docx))
+        self.assertEqual(ResumeBlob.objects.get().ref_count, 1)
+
+    def test_failed_upload_of_new_content_leaves_no_file(self):
+        from django.core.files.storage import default_storage
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from .models import ResumeBlob, ResumeUpload
+        from .services.resume_uploads import save_upload
+        written = []
+
+        def fail(**kwargs):
+            written.append(kwargs['file'])
+            raise RuntimeError('db down')
+
+        with patch.object(ResumeUpload.objects, 'create', side_effect=fail):
+            with self.assertRaises(RuntimeError):
+                save_upload(self.user, SimpleUploadedFile('cv.docx', self.docx))
+        self.assertFalse(ResumeBlob.objects.exists())
+        self.assertFalse(default_storage.exists(written[0]))
+
+    def test_collected_blob_is_not_revived(self):
+        from django.core.files.base import ContentFile
+        from .models import ResumeBlob
+        from .services.resume_blobs import acquire, store
+        blob, _ = store(ContentFile(self.docx, name='cv.docx'), 'cv.docx')
+        ResumeBlob.objects.filter(pk=blob.pk).delete()
+        with self.assertRaises(ResumeBlob.DoesNotExist):
+            acquire(blob)
+        fresh, created = store(ContentFile(self.docx, name='cv.docx'), 'cv.docx')
+        self.assertTrue(created)
+        self.assertEqual(fresh.ref_count, 1)
+
+
+@override_settings(STORAGES={
+    'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+class ResumeStorageTests(TestCase):
+
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from django.core.files.base import ContentFile
+        from .management.commands.bench_interviews import make_resume_docx
+        from .models import InterviewSession
+        self.cache_dir = tempfile.mkdtemp()
+        self.docx = make_resume_docx()
+        user = User.objects.create_user('candidate', password='pw12345!')
+        self.session = InterviewSession(user=user, role_title='Backend Engineer', job_description='APIs')
+        self.session.resume.save('cv.docx', ContentFile(self.docx), save=False)
+        self.session.save()
+
+    def test_extracts_without_local_path_and_caches_by_hash(self):
+        import hashlib
+        from django.core.files.storage import default_storage
+        from .models import InterviewSession
+        # Nothing on local disk: the old open(resume.path) approach would fail
+        self.assertFalse(os.path.exists(self.session.resume.path))
+        with self.settings(RESUME_CACHE_DIR=self.cache_dir, RESUME_CACHE_MAX_BYTES=1024 * 1024):
+            self.assertIn('Senior Backend Engineer', self.session.extract_resume_text())
+            digest = hashlib.sha256(self.docx).hexdigest()
+            self.assertEqual(InterviewSession.objects.get(pk=self.session.pk).resume_sha256, digest)
+            self.assertTrue(os.path.exists(os.path.join(self.cache_dir, digest[:2], digest)))
+
+            with patch.object(type(default_storage._wrapped), 'open') as storage_open:
+                text = InterviewSession.objects.get(pk=self.session.pk).extract_resume_text()
+            storage_open.assert_not_called()
+            self.assertIn('Senior Backend Engineer', text)
+
+    def test_cache_evicts_least_recently_used(self):
+        import io
+        from .services.resume_storage import ResumeCache
+        cache = ResumeCache(self.cache_dir, max_bytes=250)
+        first = cache.fill(io.BytesIO(b'a' * 100))
+        second = cache.fill(io.BytesIO(b'b' * 100))
+        os.utime(cache.path_for(first), (1, 1))
+        os.utime(cache.path_for(second), (2, 2))
+        cache.open(first).close()  # touching the first makes the second the oldest
+        cache.fill(io.BytesIO(b'c' * 100))
+        self.assertIsNotNone(cache.open(first))
+        self.assertIsNone(cache.open(second))
+        self.assertLessEqual(cache.size(), 250)
+
+    def test_streams_without_cache_when_disabled(self):
+        with self.settings(RESUME_CACHE_DIR=self.cache_dir, RESUME_CACHE_MAX_BYTES=0):
+            self.assertIn('Senior Backend Engineer', self.session.extract_resume_text())
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+
+class DocxStreamTests(TestCase):
+
+    def _docx(self):
+        import io
+        from docx import Document
+        doc = Document()
+        doc.add_paragraph('Jordan Bench')
+        doc.add_paragraph('')
+        table = doc.add_table(rows=2, cols=2)
+        table.cell(0, 0).text, table.cell(0, 1).text = 'Skills', 'Python, Terraform'
+        table.cell(1, 0).text, table.cell(1, 1).text = 'Years', '7'
+        doc.add_paragraph('Led the platform team')
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        buffer.seek(0)
+        return buffer
+
+    def test_paragraphs_and_table_rows_in_order(self):
+        from .services.docx_stream import iter_docx_blocks
+        self.assertEqual(list(iter_docx_blocks(self._docx())), [
+            'Jordan Bench', 'Skills | Python, Terraform', 'Years | 7', 'Led the platform team'])
+
+    def test_stops_at_character_budget(self):
+        from .services.extractors import extract
+        text, extractor = extract(self._docx(), 20)
+        self.assertEqual((text, extractor.name), ('Jordan Bench\nSkills ', 'docx-stream'))
+
+    def test_resume_text_includes_tables(self):
+        from .services.resume_text import detect_skills, extract_text
+        text = extract_text(self._docx(), 'cv.docx')
+        self.assertEqual(text, 'Jordan Bench Skills | Python, Terraform Years | 7 Led the platform team')
+        self.assertEqual(detect_skills(text), ['python', 'terraform'])
+
+
+class ExtractorRegistryTests(TestCase):
+
+    def test_format_is_sniffed_not_taken_from_the_name(self):
+        import io
+        from .management.commands.bench_extraction import make_resume_pdf
+        from .management.commands.bench_interviews import make_resume_docx
+        from .services.extractors import DOCX_MIME, PDF_MIME, UNKNOWN_MIME, sniff_mime
+        from .services.resume_text import extract_text
+        docx = io.BytesIO(make_resume_docx())
+        self.assertEqual(sniff_mime(docx), DOCX_MIME)
+        self.assertEqual(docx.tell(), 0)
+        self.assertEqual(sniff_mime(io.BytesIO(make_resume_pdf(['Jordan']))), PDF_MIME)
+        self.assertEqual(sniff_mime(io.BytesIO(b'plain words')), UNKNOWN_MIME)
+        self.assertIn('Senior Backend Engineer', extract_text(docx, 'resume.pdf'))
+        self.assertIn('Data engineer', extract_text(io.BytesIO(make_resume_pdf(['Data engineer'])), 'cv.docx'))
+
+    def test_preferred_backend_is_selected(self):
+        from .services.extractors import DOCX_MIME, PDF_MIME, select
+        self.assertEqual(select(DOCX_MIME, preferred=[]).name, 'docx-stream')
+        self.assertEqual(select(DOCX_MIME, preferred=['python-docx', 'pypdf2']).name, 'python-docx')
+        self.assertEqual(select(PDF_MIME, preferred=['python-docx']).name, 'pypdf2')
+        self.assertIsNone(select('text/plain', preferred=[]))
+
+    def test_upload_rejects_content_that_is_not_a_resume(self):
+        from django.contrib.auth.models import User
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        User.objects.create_user('candidate', password='pw12345!')
+        self.client.login(username='candidate', password='pw12345!')
+        resp = self.client.post('/interview/resume/upload/', {'resume': SimpleUploadedFile('cv.pdf', b'not a pdf')})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_benchmark_compares_backends_per_format(self):
+        from .management.commands.bench_extraction import run_extraction_benchmark, synthetic_corpus
+        result = run_extraction_benchmark(synthetic_corpus(paragraphs=50, table_rows=5), repeat=1)
+        docx = result['formats']['application/vnd.openxmlformats-officedocument.wordprocessingml.document']
+        self.assertEqual(set(docx['backends']), {'docx-stream', 'python-docx'})
+        self.assertEqual(docx['backends']['docx-stream']['recall'], 1.0)
+        self.assertIsNotNone(docx['recommended'])
+        self.assertEqual(result['formats']['application/pdf']['backends']['pypdf2']['recall'], 1.0)
+
+
+class AnswerScoringTests(TestCase):
+    JD = ('Backend engineer with Python, Django, PostgreSQL and Redis experience to build scalable APIs. '
+          'You will own caching and database performance.')
+    QUESTION = 'How would you reduce the latency of a slow Django API endpoint backed by PostgreSQL?'
+    GOOD = ('First I would profile the Django endpoint and log its queries. In my last role we found N+1 '
+            'queries, so I added select_related, which cut queries from 120 to 4. Then I added PostgreSQL '
+            'indexes because sequential scans dominated, and cached the hot path in Redis. As a result p95 '
+            'latency dropped from 900ms to 120ms. I would also paginate large API responses.')
+
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from .models import InterviewSession, Question
+        from .services.evaluation_cache import get_cache
+        get_cache().clear()
+        self.user = User.objects.create_user('candidate', password='pw12345!')
+        self.client.login(username='candidate', password='pw12345!')
+        self.session = InterviewSession.objects.create(
+            user=self.user, role_title='Backend Engineer', job_description=self.JD, resume='resumes/cv.docx',
+            status='in_progress')
+        self.question = Question.objects.create(session=self.session, question_text=self.QUESTION,
+                                                question_type='technical', order=1)
+        Question.objects.create(session=self.session, question_text='Next?', question_type='behavioral', order=2)
+
+    def test_local_scores_rank_answers(self):
+        from .services.local_scorer import score_answer
+        skills = ['python', 'django', 'postgres', 'redis']
+        good = score_answer(self.QUESTION, self.GOOD, self.JD, skills)
+        short = score_answer(self.QUESTION, 'I would add caching and indexes to reduce Django endpoint latency.',
+                             self.JD, skills)
+        off_topic = score_answer(self.QUESTION, 'I enjoy hiking and cooking with friends on weekends, '
+                                 'and I read history novels when I travel around Europe.', self.JD, skills)
+        self.assertGreaterEqual(good.score, 6)
+        self.assertGreater(good.score, short.score)
+        self.assertGreater(short.score, off_topic.score)
+        self.assertIn('more detail', short.feedback)
+        self.assertEqual(set(good.features), {'relevance', 'job_fit', 'skills', 'length', 'specificity'})
+
+    def _submit(self, answer):
+        with patch('interviews.services.ai_service.ai_service') as ai:
+            ai.is_available.return_value = True
+            ai.evaluate_answer.return_value = {'score': 9, 'feedback': 'Thorough', 'topics_to_cover': 'sharding',
+                                               'source': 'llm'}
+            resp = self.client.post(f'/interview/{self.session.id}/submit/{self.question.id}/', {'answer': answer})
+        return resp, ai
+
+    def test_async_mode_responds_with_provisional_score_then_refines(self):
+        from .models import Answer
+        from .services.answer_scoring import refine_answer
+        with self.captureOnCommitCallbacks() as callbacks:
+            resp, ai = self._submit(self.GOOD)
+        data = resp.json()
+        ai.evaluate_answer.assert_not_called()
+        self.assertTrue(data['provisional'])
+        self.assertEqual(len(callbacks), 1)
+        answer = Answer.objects.get(pk=data['answer_id'])
+        self.assertEqual((answer.score_source, answer.ai_score), ('local', answer.provisional_score))
+
+        with patch('interviews.services.ai_service.ai_service') as ai:
+            ai.evaluate_answer.return_value = {'score': 9, 'feedback': 'Thorough', 'topics_to_cover': 'sharding',
+                                               'source': 'llm'}
+            self.assertTrue(refine_answer(answer.pk))
+        status = self.client.get(f'/interview/{self.session.id}/answer/{answer.pk}/').json()
+        self.assertEqual((status['source'], status['score'], status['feedback']), ('llm', 9, 'Thorough'))
+
+    def test_htmx_provisional_score_polls_for_refinement(self):
+        from .models import Answer
+        from .services.answer_scoring import refine_answer
+        with patch('interviews.services.ai_service.ai_service'), self.captureOnCommitCallbacks():
+            resp = self.client.post(f'/interview/{self.session.id}/submit/{self.question.id}/',
+                                    {'answer': self.GOOD}, HTTP_HX_REQUEST='true')
+        answer = Answer.objects.get()
+        status_url = f'/interview/{self.session.id}/answer/{answer.pk}/'
+        self.assertContains(resp, 'quick estimate')
+        self.assertContains(resp, f'hx-get="{status_url}?attempt=1"')
+
+        with patch('interviews.services.ai_service.ai_service') as ai:
+            ai.evaluate_answer.return_value = {'score': 9, 'feedback': 'Use <b>indexes</b>',
+                                               'topics_to_cover': 'sharding', 'source': 'llm'}
+            refine_answer(answer.pk)
+        resp = self.client.get(f'{status_url}?attempt=1', HTTP_HX_REQUEST='true')
+        self.assertContains(resp, 'Score: 9/10')
+        self.assertContains(resp, 'Use &lt;b&gt;indexes&lt;/b&gt;')
+        self.assertNotContains(resp, 'hx-get')
+
+    @override_settings(EVALUATION_MAX_PENDING=0)
+    def test_refinement_is_shed_under_load(self):
+        from .models import Answer
+        resp, _ = self._submit(self.GOOD)
+        self.assertFalse(resp.json()['provisional'])
+        self.assertEqual(Answer.objects.get().score_source, 'local')
+
+    def test_rolled_back_refinement_does_not_stay_pending(self):
+        from django.db import transaction
+        from .models import Answer
+        from .services import answer_scoring
+        before = answer_scoring._pending
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            answer = Answer.objects.create(question=self.question, user_response=self.GOOD, ai_score=5,
+                                           ai_feedback='', topics_to_cover='', score_source='local')
+            self.assertEqual(answer_scoring.schedule_refinement(answer), 'queued')
+            raise RuntimeError('rollback')
+        self.assertEqual(answer_scoring._pending, before)
+
+    @override_settings(EVALUATION_MODE='sync')
+    def test_sync_mode_falls_back_to_local_score(self):
+        from .models import Answer
+        resp, ai = self._submit(self.GOOD)
+        self.assertEqual(resp.json()['score'], 9)
+        self.assertEqual(Answer.objects.get().score_source, 'llm')
+
+        Answer.objects.all().delete()
+        with patch('interviews.services.ai_service.ai_service') as ai:
+            ai.is_available.return_value = False
+            resp = self.client.post(f'/interview/{self.session.id}/submit/{self.question.id}/', {'answer': 'No idea.'})
+        answer = Answer.objects.get()
+        self.assertEqual((answer.score_source, answer.ai_score), ('local', resp.json()['score']))
+        self.assertLessEqual(answer.ai_score, 2)
+
+    def test_similar_answer_reuses_cached_llm_evaluation(self):
+        from .models import Answer
+        from .services.answer_scoring import refine_answer
+        with self.captureOnCommitCallbacks():
+            first = self._submit(self.GOOD)[0].json()
+        with patch('interviews.services.ai_service.ai_service') as ai:
+            ai.evaluate_answer.return_value = {'score': 9, 'feedback': 'Thorough', 'topics_to_cover': 'sharding',
+                                               'source': 'llm'}
+            refine_answer(first['answer_id'])
+        Answer.objects.all().delete()
+
+        resp, ai = self._submit(self.GOOD.replace('I would also', 'I would ALSO') + '!')
+        data = resp.json()
+        ai.evaluate_answer.assert_not_called()
+        self.assertEqual((data['score'], data['provisional']), (9, False))
+        self.assertEqual(Answer.objects.get().score_source, 'cache')
+
+
+class RubricTests(TestCase):
+    RUBRIC = {'key_points': ['profile slow queries first', 'add database indexes'], 'topics': ['caching']}
+
+    def test_generated_questions_carry_normalized_rubrics(self):
+        from .services.ai_service import AIService
+        item = {'q': 'How do you scale reads?', 'points': ['read replicas', 'cache hot keys', 'a', 'b', 'c'],
+                'topics': 'replication lag; consistency'}
+        questions = AIService._questions_from_payload({'technical': [item] * 5, 'behavioral': ['b'] * 5})
+        self.assertEqual(questions[0]['question_text'], 'How do you scale reads?')
+        self.assertEqual(questions[0]['rubric'], {'key_points': ['read replicas', 'cache hot keys', 'a', 'b'],
+                                                  'topics': ['replication lag', 'consistency']})
+        self.assertEqual(questions[5], {'question_text': 'b', 'question_type': 'behavioral', 'order': 6, 'rubric': {}})
+        self.assertIsNone(AIService._questions_from_payload({'technical': [item] * 5, 'behavioral': []}))
+
+        untitled = {'points': ['read replicas'], 'topics': ['consistency']}
+        questions = AIService._questions_from_payload({'technical': [untitled] + [item] * 5, 'behavioral': ['b'] * 5})
+        self.assertEqual([q['question_text'] for q in questions[:5]], ['How do you scale reads?'] * 5)
+        self.assertIsNone(AIService._questions_from_payload({'technical': [untitled] + [item] * 4,
+                                                             'behavioral': ['b'] * 5}))
+
+    def test_topics_come_from_rubric_coverage(self):
+        from .services.rubrics import coverage, topics_to_cover
+        answer = 'I profiled the slow queries with EXPLAIN and then added a database index on user_id.'
+        self.assertEqual(topics_to_cover(self.RUBRIC, answer), 'caching')
+        self.assertAlmostEqual(coverage(self.RUBRIC, answer), 2 / 3)
+        self.assertIsNone(topics_to_cover({}, answer))
+
+    def test_evaluation_prompt_quotes_rubric_and_skips_llm_topics(self):
+        from .services.ai_service import AIService
+        with patch.dict('os.environ', {'AI_PROVIDER': 'ollama'}):
+            service = AIService()
+        with patch.object(service, '_invoke', return_value='{"score": 8, "feedback": "Good"}') as invoke:
+            result = service.evaluate_answer('How do you speed up an API?', 'Profile slow queries, add caching.',
+                                             'Backend Engineer', rubric=self.RUBRIC)
+        prompt = invoke.call_args.args[1][1].content
+        self.assertIn('Rubric: Key points: profile slow queries first; add database indexes. Topics: caching', prompt)
+        self.assertNotIn('topics_to_cover', prompt)
+        self.assertEqual((result['score'], result['topics_to_cover']), (8, 'add database indexes'))
+
+    def test_create_questions_stores_rubric(self):
+        from django.contrib.auth.models import User
+        from .models import InterviewSession
+        user = User.objects.create_user('rubric-user', password='pw12345!')
+        session = InterviewSession.objects.create(user=user, role_title='Backend Engineer',
+                                                  job_description='APIs', resume='resumes/cv.docx')
+        with patch('interviews.services.ai_service.ai_service') as ai, \
+                patch.object(InterviewSession, 'extract_resume_text', return_value='Python developer'):
+            ai.generate_questions_from_context.return_value = [
+                {'question_text': 'Q1', 'question_type': 'technical', 'order': 1,
+                 'rubric': {'points': ['indexes'], 'topics': ['caching']}}]
+            questions = session.generate_interview_questions()
+        self.assertEqual(questions[0].rubric, {'key_points': ['indexes'], 'topics': ['caching']})
+
+
+class QuestionDedupTests(TestCase):
+
+    def test_signatures_estimate_similarity(self):
+        from .services.question_dedup import signatures, similarity
+        sigs = signatures(['How do you ensure code quality and testing?',
+                           'How do you ensure code quality, testing, and maintainability in your projects?',
+                           'How would you design a rate limiter for an API?'])
+        self.assertGreaterEqual(similarity(sigs[0], sigs[1]), 0.5)
+        self.assertLess(similarity(sigs[0], sigs[2]), 0.2)
+        self.assertTrue((signatures(['How do you ensure code quality and testing?'])[0] == sigs[0]).all())
+
+    def test_duplicates_are_replaced_from_fallback_pool(self):
+        from .services.question_dedup import deduplicate
+        questions = [
+            {'question_text': 'How do you design a REST API for payments?', 'question_type': 'technical', 'order': 1},
+            {'question_text': 'How would you design a REST API for payments?', 'question_type': 'technical',
+             'order': 2, 'rubric': {'topics': ['idempotency']}},
+            {'question_text': 'Tell me about a conflict with a colleague.', 'question_type': 'behavioral', 'order': 3},
+        ]
+        pool = [{'question_text': 'Tell me about a conflict with a colleague!', 'question_type': 'technical'},
+                {'question_text': 'How do you handle tight deadlines?', 'question_type': 'behavioral'},
+                {'question_text': 'Explain database indexing trade-offs.', 'question_type': 'technical'}]
+        out, replaced = deduplicate(questions, history=['Tell me about a conflict with a colleague.'],
+                                    fallback=lambda: pool, threshold=0.5)
+        self.assertEqual(replaced, 2)
+        self.assertEqual([q['question_text'] for q in out], [
+            'How do you design a REST API for payments?',
+            'Explain database indexing trade-offs.',
+            'How do you handle tight deadlines?',
+        ])
+        self.assertEqual((out[1]['order'], out[1]['question_type'], out[1]['rubric']), (2, 'technical', {}))
+
+        fallback = Mock()
+        self.assertEqual(deduplicate(questions[:1], fallback=fallback, threshold=0.5), (questions[:1], 0))
+        fallback.assert_not_called()
+
+        # Only a question of the slot's own type may stand in
+        behavioral_only = [{'question_text': 'How do you handle tight deadlines?', 'question_type': 'behavioral'}]
+        out, replaced = deduplicate(questions[:2], fallback=lambda: behavioral_only, threshold=0.5)
+        self.assertEqual((out, replaced), (questions[:2], 0))
+
+    def test_fallback_pool_does_not_read_the_resume(self):
+        from django.contrib.auth.models import User
+        from .models import InterviewSession
+        user = User.objects.create_user('repeat', password='pw12345!')
+        session = InterviewSession.objects.create(user=user, role_title='Backend Engineer', job_description='APIs',
+                                                  resume='resumes/cv.docx')
+        questions = [{'question_text': 'How do you ensure code quality and testing?', 'question_type': 'technical',
+                      'order': n} for n in (1, 2)]
+        with patch.object(InterviewSession, 'extract_resume_text') as extract:
+            out = session.deduplicate_questions(questions)
+        extract.assert_not_called()
+        self.assertEqual(len({q['question_text'] for q in out}), 2)
+        self.assertEqual([q['question_type'] for q in out], ['technical', 'technical'])
+
+    def test_generation_avoids_questions_from_recent_sessions(self):
+        from django.contrib.auth.models import User
+        from .models import InterviewSession, Question
+        user = User.objects.create_user('returning', password='pw12345!')
+        previous = InterviewSession.objects.create(user=user, role_title='Backend Engineer', job_description='APIs',
+                                                   resume='resumes/cv.docx')
+        Question.objects.create(session=previous, question_text='Explain how you would shard a PostgreSQL database.',
+                                question_type='technical', order=1)
+        session = InterviewSession.objects.create(user=user, role_title='Backend Engineer', job_description='APIs',
+                                                  resume='resumes/cv.docx')
+        generated = [{'question_text': 'Explain how you would shard a PostgreSQL database?',
+                      'question_type': 'technical', 'order': 1},
+                     {'question_text': 'Describe your approach to API versioning.', 'question_type': 'technical',
+                      'order': 2}]
+        with patch('interviews.services.ai_service.ai_service') as ai, \
+                patch.object(InterviewSession, 'extract_resume_text', return_value='Python developer'):
+            ai.generate_questions_from_context.return_value = generated
+            questions = session.generate_interview_questions()
+        texts = [q.question_text for q in questions]
+        self.assertNotIn(generated[0]['question_text'], texts)
+        self.assertEqual(texts[1], 'Describe your approach to API versioning.')
+        self.assertEqual([q.order for q in questions], [1, 2])
+
+
+class EvaluationCacheTests(TestCase):
+    ANSWER = 'I make a list of tasks and prioritise the most important ones first.'
+
+    def _cache(self, **kwargs):
+        from .services.evaluation_cache import SemanticEvaluationCache
+        self.now = 0.0
+        return SemanticEvaluationCache(**{'threshold': 0.9, 'ttl': 60, 'capacity': 10,
+                                          'clock': lambda: self.now, **kwargs})
+
+    def test_near_identical_answers_hit_for_the_same_question_and_role(self):
+        cache = self._cache()
+        cache.put('How do you handle tight deadlines?', 'QA', self.ANSWER, {'score': 7})
+        hit, similarity = cache.get(' how do you handle  tight deadlines? ', 'qa',
+                                    'I make a list of my tasks and prioritise the most important ones first')
+        self.assertEqual(hit, {'score': 7})
+        self.assertGreater(similarity, 0.9)
+        self.assertIsNone(cache.get('How do you handle tight deadlines?', 'QA',
+                                    'I stay calm and tell my manager about risks early.'))
+        self.assertIsNone(cache.get('How do you handle tight deadlines?', 'Data Engineer', self.ANSWER))
+
+    def test_entries_expire_and_capacity_evicts_least_recent_question(self):
+        cache = self._cache(capacity=2)
+        cache.put('q1', 'r', self.ANSWER, {'score': 1})
+        cache.put('q2', 'r', self.ANSWER, {'score': 2})
+        cache.get('q1', 'r', self.ANSWER)
+        cache.put('q3', 'r', self.ANSWER, {'score': 3})
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('q2', 'r', self.ANSWER))
+        self.now = 61
+        self.assertIsNone(cache.get('q1', 'r', self.ANSWER))
+        self.assertEqual(len(cache), 1)
+
+    def test_eviction_after_expiry_drops_emptied_groups(self):
+        cache = self._cache(capacity=2)
+        cache.put('q1', 'r', self.ANSWER, {'score': 1})
+        cache.put('q2', 'r', self.ANSWER, {'score': 2})
+        self.now = 61
+        self.assertIsNone(cache.get('q1', 'r', self.ANSWER))
+        cache.put('q3', 'r', self.ANSWER, {'score': 3})
+        cache.put('q4', 'r', self.ANSWER, {'score': 4})
+        cache.put('q5', 'r', self.ANSWER, {'score': 5})
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('q3', 'r', self.ANSWER))
+        self.assertEqual(cache.get('q5', 'r', self.ANSWER)[0], {'score': 5})
+
+    @override_settings(EVALUATION_CACHE_MAX_ENTRIES=0)
+    def test_disabled_cache_stores_nothing(self):
+        from .services.evaluation_cache import get_cache
+        get_cache().put('q', 'r', self.ANSWER, {'score': 5})
+        self.assertIsNone(get_cache().get('q', 'r', self.ANSWER))
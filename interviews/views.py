@@ -1,10 +1,17 @@
+from contextlib import nullcontext
 
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect, get_object_or_404
 from django.http import JsonResponse, HttpResponse
 from django.views.decorators.http import require_POST
 from django.contrib import messages
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.html import escape
+
+from core.metrics import record_fallback, track_view
 
 from .models import InterviewSession, Question, Answer
 from .forms import InterviewSetupForm
@@ -21,15 +28,64 @@ def stop_interview(request, session_id):
     return redirect('interview_feedback', session_id=session.id)
 
 
+# Polls (every 2s) for an LLM refinement of a provisional HTMX score
+REFINE_POLL_ATTEMPTS = 30
+
+
+def _feedback_html(session_id, answer_id, evaluation, refining, attempt=0):
+    """Evaluation card for the HTMX chat; while ``refining`` it polls ``answer_status``."""
+    poll = note = ''
+    if refining:
+        url = reverse('answer_status', args=[session_id, answer_id])
+        poll = f' hx-get="{url}?attempt={attempt + 1}" hx-trigger="every 2s" hx-swap="outerHTML"'
+        note = '<small class="text-muted ms-2">(quick estimate &mdash; detailed AI feedback on the way)</small>'
+    return f"""
+        <div class=\"mt-3\"{poll}>
+          <div class=\"alert alert-info\">
+            <strong>Score: {escape(evaluation.get('score', 5))}/10</strong> {note}
+            <p>{escape(evaluation.get('feedback', ''))}</p>
+            <hr/>
+            <strong>Topics to Cover:</strong>
+            <p>{escape(evaluation.get('topics_to_cover', ''))}</p>
+          </div>
+        </div>
+        """
+
+
+def _save_with_resume(session, blob):
+    """Point ``session`` at the stored resume ``blob`` and save it."""
+    session.resume = blob.file.name
+    session.resume_blob = blob
+    session.resume_sha256 = blob.sha256
+    session.save()
+
+
+@track_view
 @login_required
 def interview_setup(request):
     """Page to setup new interview (JD, Role, Resume Upload)"""
     if request.method == 'POST':
-        form = InterviewSetupForm(request.POST, request.FILES)
+        form = InterviewSetupForm(request.POST, request.FILES, user=request.user)
         if form.is_valid():
             session = form.save(commit=False)
             session.user = request.user
-            session.save()
+            from interviews.services.resume_blobs import acquire, storing
+            upload = form.cleaned_data['upload']
+            if upload is not None:
+                # Reuse the early upload's background extraction
+                session.resume_upload = upload
+            # The reference and the row referencing it commit together
+            if upload is not None and upload.blob is not None:
+                with transaction.atomic():
+                    acquire(upload.blob)
+                    _save_with_resume(session, upload.blob)
+            else:
+                # Identical content (e.g. the same CV for every session) is stored once
+                resume = form.cleaned_data['resume']
+                # An early upload from before blobs is copied from its file, then closed
+                source = nullcontext(resume) if resume is not None else upload.file.open('rb')
+                with source as resume, storing(resume, resume.name) as blob:
+                    _save_with_resume(session, blob)
 
             # Check if AI is available for personalized questions
             from interviews.services.ai_service import ai_service
@@ -51,11 +107,33 @@ def interview_setup(request):
             
             return redirect('interview_room', session_id=session.id)
     else:
-        form = InterviewSetupForm()
+        form = InterviewSetupForm(user=request.user)
 
     return render(request, 'interviews/setup.html', {'form': form})
 
 
+@login_required
+@require_POST
+def upload_resume(request):
+    """Receive the resume as soon as it is picked and start processing it"""
+    from interviews.services.extractors import sniff_mime
+    from interviews.services.resume_uploads import ALLOWED_MIME_TYPES, save_upload, schedule_processing
+
+    uploaded = request.FILES.get('resume')
+    if uploaded is None:
+        return JsonResponse({'error': 'No file provided'}, status=400)
+    if uploaded.size > settings.RESUME_UPLOAD_MAX_BYTES:
+        return JsonResponse({'error': 'File is too large'}, status=400)
+    # Judge the content, not the extension
+    if sniff_mime(uploaded) not in ALLOWED_MIME_TYPES:
+        return JsonResponse({'error': 'Please upload a PDF or DOCX file'}, status=400)
+
+    upload = save_upload(request.user, uploaded)
+    schedule_processing(upload)
+    return JsonResponse({'upload_id': upload.id, 'sha256': upload.sha256, 'status': upload.status}, status=201)
+
+
+@track_view
 @login_required
 def interview_room(request, session_id):
     """Main interview room with one question at a time"""
@@ -86,6 +164,7 @@ def interview_room(request, session_id):
     })
 
 
+@track_view
 @require_POST
 @login_required
 def submit_answer(request, session_id, question_id):
@@ -101,73 +180,64 @@ def submit_answer(request, session_id, question_id):
             return HttpResponse('<div class="alert alert-danger">No answer provided</div>', status=400)
         return JsonResponse({'error': 'No answer provided'}, status=400)
 
-    # Use AIService for intelligent evaluation
     from interviews.services.ai_service import ai_service
-    
-    if not ai_service.is_available():
-        # AI service unavailable - record answer with neutral score
-        Answer.objects.create(
-            question=question,
-            user_response=user_response,
-            is_voice=is_voice,
-            ai_score=6,
-            ai_feedback='AI service is currently unavailable. Your answer has been recorded.',
-            topics_to_cover='Please try again when service is available for detailed feedback.',
-        )
-        next_question = session.get_next_unanswered_question()
-        if next_question:
-            return JsonResponse({
-                'success': True,
-                'score': 6,
-                'feedback': 'Service unavailable. Answer recorded. Moving to next question...',
-                'topics': '',
-                'next_question': next_question.question_text,
-                'next_question_id': next_question.id,
-                'question_type': next_question.question_type,
-                'progress': (Answer.objects.filter(question__session=session).count() / session.questions.count()) * 100 if session.questions.count() else 0
-            })
-        else:
-            session.calculate_overall_score()
-            return JsonResponse({
-                'success': True,
-                'score': 6,
-                'feedback': 'Service unavailable. Interview completed.',
-                'complete': True,
-                'redirect_url': f'/interview/{session.id}/feedback/'
-            })
-
-    # Get AI evaluation
-    evaluation = ai_service.evaluate_answer(
-        question.question_text,
-        user_response,
-        session.role_title
+    from interviews.services.answer_scoring import (
+        cached_evaluation,
+        evaluation_mode,
+        provisional_score,
+        remember_evaluation,
+        schedule_refinement,
     )
+    from interviews.services.evaluation_context import context_for_session
 
-    # Record the answer with AI feedback
-    Answer.objects.create(
+    # Local score in milliseconds; the LLM refines it later (async), is
+    # awaited (sync) or is skipped (local) - see answer_scoring. A cached LLM
+    # evaluation of a near-identical answer beats all three.
+    provisional = provisional_score(question, user_response)
+    mode = evaluation_mode()
+    evaluation = cached_evaluation(question, user_response)
+    source = 'cache' if evaluation is not None else 'local'
+    if evaluation is None and mode == 'sync':
+        if ai_service.is_available():
+            evaluation = ai_service.evaluate_answer(
+                question.question_text,
+                user_response,
+                session.role_title,
+                context=context_for_session(session),
+                rubric=question.rubric,
+            )
+            remember_evaluation(question, user_response, evaluation)
+            if evaluation.get('source') == 'llm':
+                source = 'llm'
+        else:
+            record_fallback("ai_unavailable")
+    if source == 'local':
+        evaluation = provisional.as_evaluation()
+
+    # Record the answer with its (possibly provisional) evaluation
+    answer = Answer.objects.create(
         question=question,
         user_response=user_response,
         is_voice=is_voice,
-        ai_score=evaluation.get('score', 6),
-        ai_feedback=evaluation.get('feedback', 'Good effort. Keep practicing.'),
-        topics_to_cover=evaluation.get('topics_to_cover', ''),
+        ai_score=evaluation['score'],
+        ai_feedback=evaluation['feedback'],
+        topics_to_cover=evaluation['topics_to_cover'],
+        score_source=source,
+        provisional_score=provisional.score,
     )
+    refinement = schedule_refinement(answer) if source == 'local' and mode == 'async' else None
+    if refinement == 'done':
+        # Refined inline (EVALUATION_WORKERS=0): report the stored evaluation
+        answer.refresh_from_db(fields=['ai_score', 'ai_feedback', 'topics_to_cover', 'score_source'])
+        evaluation = {'score': answer.ai_score, 'feedback': answer.ai_feedback,
+                      'topics_to_cover': answer.topics_to_cover}
+    refining = refinement == 'queued'
 
     next_question = session.get_next_unanswered_question()
 
     # HTMX response path: return HTML snippet for chat-like UX
     if request.META.get('HTTP_HX_REQUEST'):
-        feedback_html = f"""
-        <div class=\"mt-3\">
-          <div class=\"alert alert-info\">
-            <strong>Score: {evaluation.get('score', 5)}/10</strong>
-            <p>{evaluation.get('feedback', '')}</p>
-            <hr/>
-            <strong>Topics to Cover:</strong>
-            <p>{evaluation.get('topics_to_cover', '')}</p>
-          </div>
-        </div>
-        """
+        feedback_html = _feedback_html(session.id, answer.id, evaluation, refining)
         if next_question:
             question_html = f"""
             <div class=\"card mt-3\">
@@ -201,6 +271,8 @@ def submit_answer(request, session_id, question_id):
     if next_question:
         return JsonResponse({
             'success': True,
+            'answer_id': answer.id,
+            'provisional': refining,
             'score': evaluation.get('score', 5),
             'feedback': evaluation.get('feedback', ''),
             'topics': evaluation.get('topics_to_cover', ''),
@@ -213,13 +285,38 @@ def submit_answer(request, session_id, question_id):
         session.calculate_overall_score()
         return JsonResponse({
             'success': True,
+            'answer_id': answer.id,
+            'provisional': refining,
             'score': evaluation.get('score', 5),
             'feedback': evaluation.get('feedback', ''),
+            'topics': evaluation.get('topics_to_cover', ''),
             'complete': True,
             'redirect_url': f'/interview/{session.id}/feedback/'
         })
 
 
+@login_required
+def answer_status(request, session_id, answer_id):
+    """Current evaluation of an answer; polled until the LLM refines a provisional score."""
+    answer = get_object_or_404(Answer, id=answer_id, question__session_id=session_id,
+                               question__session__user=request.user)
+    if request.META.get('HTTP_HX_REQUEST'):
+        # Stop polling once refined, or after as many attempts as room.html makes
+        attempt = request.GET.get('attempt', '')
+        attempt = int(attempt) if attempt.isdigit() else 0
+        evaluation = {'score': answer.ai_score, 'feedback': answer.ai_feedback,
+                      'topics_to_cover': answer.topics_to_cover}
+        refining = answer.score_source == 'local' and attempt < REFINE_POLL_ATTEMPTS
+        return HttpResponse(_feedback_html(session_id, answer.id, evaluation, refining, attempt))
+    return JsonResponse({
+        'answer_id': answer.id,
+        'score': answer.ai_score,
+        'feedback': answer.ai_feedback,
+        'topics': answer.topics_to_cover,
+        'source': answer.score_source,
+    })
+
+
 @login_required
 def stop_interview(request, session_id):
     """Stop the interview early, compute overall score, and redirect to feedback."""
@@ -233,6 +330,7 @@ def stop_interview(request, session_id):
     return redirect('interview_feedback', session_id=session.id)
 
 
+@track_view
 @login_required
 def interview_feedback(request, session_id):
     """Show final feedback and scorecard"""